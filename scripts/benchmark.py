@@ -0,0 +1,1002 @@
+"""Performance benchmarks for the Mangetamain pipelines.
+
+Each sub-command builds a synthetic dataset, then times and measures the
+memory of one pipeline component under its alternative implementations.
+Every measurement runs in a fresh child process so peak RSS figures are not
+polluted by previous runs.
+
+Usage (from the project root)::
+
+    PYTHONPATH=src python scripts/benchmark.py processors --rows 1000000
+    PYTHONPATH=src python scripts/benchmark.py cooccurrence --recipes 1000 10000
+    PYTHONPATH=src python scripts/benchmark.py dedup --ingredients 2000 10000
+    PYTHONPATH=src python scripts/benchmark.py ratings --rows 1000000
+    PYTHONPATH=src python scripts/benchmark.py streaming --rows 1000000
+    PYTHONPATH=src python scripts/benchmark.py seasonality --rows 1000000
+    PYTHONPATH=src python scripts/benchmark.py nutrition --recipes 230000
+    PYTHONPATH=src python scripts/benchmark.py schema --recipes 230000
+    PYTHONPATH=src python scripts/benchmark.py clustering --recipes 230000 1000000
+    PYTHONPATH=src python scripts/benchmark.py sweep --recipes 230000 --workers 4
+    PYTHONPATH=src python scripts/benchmark.py similarity --recipes 230000 1000000
+    PYTHONPATH=src python scripts/benchmark.py featurestore --recipes 230000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import multiprocessing as mp
+import resource
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from mangetamain.clustering.pipeline import (  # noqa: E402
+    REQUIRED_FEATURES,
+    RecipeClusteringPipeline,
+)
+from mangetamain.clustering.similarity import RecipeSimilarityIndex  # noqa: E402
+from mangetamain.preprocessing.factories import ProcessorFactory  # noqa: E402
+from mangetamain.preprocessing.feature.ingredients import (  # noqa: E402
+    IngredientsAnalyser,
+)
+from mangetamain.preprocessing.feature.rating import (  # noqa: E402
+    RatingAnalyser,
+    RatingCleaning,
+    RatingPreprocessing,
+)
+from mangetamain.preprocessing.feature.seasonality import (  # noqa: E402
+    SeasonalityAnalyzer,
+)
+from mangetamain.preprocessing.feature_store import FeatureStore  # noqa: E402
+from mangetamain.preprocessing.interfaces import IDataRepository  # noqa: E402
+from mangetamain.preprocessing.processors import BasicDataProcessor  # noqa: E402
+from mangetamain.preprocessing.ragged import (  # noqa: E402
+    RaggedArray,
+    _parse_number_list,
+)
+from mangetamain.preprocessing.repositories import (  # noqa: E402
+    CSVDataRepository,
+    RepositoryPaths,
+)
+from mangetamain.preprocessing.schema import (  # noqa: E402
+    INTERACTIONS_SCHEMA,
+    RECIPES_SCHEMA,
+    compact_frame,
+)
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+
+def _current_rss_kib() -> int | None:
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+    except OSError:
+        return None
+    return pages * resource.getpagesize() // 1024
+
+
+def _reset_peak_rss() -> bool:
+    # Linux >= 4.0 resets VmHWM when "5" is written to clear_refs
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_kib() -> int:
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _child(setup: Callable, run: Callable, args: tuple, queue: mp.Queue) -> None:
+    data = setup(*args)
+    rss_before = _current_rss_kib() if _reset_peak_rss() else None
+    if rss_before is None:
+        rss_before = _peak_rss_kib()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run(data)
+    elapsed = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_peak = _peak_rss_kib()
+    queue.put(
+        {
+            "seconds": elapsed,
+            "peak_rss_mib": rss_peak / 1024,
+            "rss_growth_mib": max(0, rss_peak - rss_before) / 1024,
+            "traced_peak_mib": traced_peak / 2**20,
+            "result": result,
+        }
+    )
+
+
+def measure(setup: Callable, run: Callable, *args: object) -> dict[str, object]:
+    """Run ``run(setup(*args))`` in a child process and return its metrics.
+
+    ``seconds`` includes tracemalloc overhead, which is comparable across
+    implementations but inflates absolute figures.
+    """
+    queue: mp.Queue = mp.Queue()
+    proc = mp.Process(target=_child, args=(setup, run, args, queue))
+    proc.start()
+    metrics = queue.get()
+    proc.join()
+    return metrics
+
+
+def print_table(rows: list[dict[str, object]]) -> None:
+    """Print benchmark rows as an aligned text table."""
+    df = pd.DataFrame(rows)
+    with pd.option_context("display.float_format", "{:,.3f}".format):
+        print(df.to_string(index=False))
+
+
+# ---------------------------------------------------------------------------
+# processors: copy-on-write strategy chain
+# ---------------------------------------------------------------------------
+
+
+class _InMemoryRepository(IDataRepository):
+    def __init__(self, recipes: pd.DataFrame, interactions: pd.DataFrame) -> None:
+        self._recipes = recipes
+        self._interactions = interactions
+
+    def load_recipes(self) -> pd.DataFrame:
+        return self._recipes
+
+    def load_interactions(self) -> pd.DataFrame:
+        return self._interactions
+
+
+def synthetic_interactions(n_rows: int, n_recipes: int, seed: int = 0) -> pd.DataFrame:
+    """Return a Food.com-like interactions table (ratings 0..5, ISO dates)."""
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 365 * 18, size=n_rows)
+    dates = pd.Timestamp("2000-01-01") + pd.to_timedelta(days, unit="D")
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, n_rows // 5 + 1, size=n_rows),
+            "recipe_id": rng.integers(0, n_recipes, size=n_rows),
+            "date": dates.strftime("%Y-%m-%d"),
+            "rating": rng.choice(
+                6, size=n_rows, p=[0.05, 0.01, 0.01, 0.04, 0.16, 0.73]
+            ),
+        }
+    )
+
+
+def _setup_processors(n_rows: int, copy_on_write: bool) -> BasicDataProcessor:
+    n_recipes = max(1, n_rows // 5)
+    recipes = pd.DataFrame(
+        {"id": np.arange(n_recipes), "name": [f"recipe {i}" for i in range(n_recipes)]}
+    )
+    repo = _InMemoryRepository(recipes, synthetic_interactions(n_rows, n_recipes))
+    return BasicDataProcessor(
+        repo,
+        cleaning=RatingCleaning(),
+        preprocessing=RatingPreprocessing(),
+        copy_on_write=copy_on_write,
+    )
+
+
+def _run_processor(processor: BasicDataProcessor) -> int:
+    pair = processor.run()
+    return len(pair.interactions)
+
+
+def bench_processors(args: argparse.Namespace) -> None:
+    rows = []
+    for copy_on_write in (False, True):
+        metrics = measure(_setup_processors, _run_processor, args.rows, copy_on_write)
+        metrics.pop("result")
+        rows.append({"copy_on_write": copy_on_write, **metrics})
+    print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# cooccurrence: ingredient-cluster co-occurrence matrix
+# ---------------------------------------------------------------------------
+
+
+def synthetic_ingredients(
+    n_recipes: int, n_ingredients: int = 5000, n_clusters: int = 2000, seed: int = 0
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return recipes with stringified ingredient lists and their clustering.
+
+    Recipe lengths follow Food.com (about 9 ingredients on average) and
+    ingredient popularity is Zipf-like.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"ingredient {i}" for i in range(n_ingredients)])
+    weights = 1.0 / np.arange(1, n_ingredients + 1)
+    weights /= weights.sum()
+    lengths = rng.poisson(9, size=n_recipes).clip(1)
+    picks = rng.choice(n_ingredients, size=int(lengths.sum()), p=weights)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    recipes = pd.DataFrame(
+        {
+            "id": np.arange(n_recipes),
+            "ingredients": [
+                str(vocabulary[picks[a:b]].tolist())
+                for a, b in zip(offsets[:-1], offsets[1:], strict=True)
+            ],
+        }
+    )
+    ingredients_df = pd.DataFrame(
+        {"name": vocabulary, "cluster": np.arange(n_ingredients) % n_clusters}
+    )
+    ingredients_df["cluster label"] = vocabulary[ingredients_df["cluster"]]
+    return recipes, ingredients_df
+
+
+def _legacy_cooccurrence(recipes, ingredients_df, cluster_labels) -> np.ndarray:
+    # Pre-sparse implementation: one mask scan and a double loop per recipe
+    import ast
+
+    ingredients_by_recipe = pd.DataFrame(
+        recipes["ingredients"].apply(ast.literal_eval).explode()
+    )
+    ingredients_by_recipe["id_recipe"] = ingredients_by_recipe.index.to_list()
+    ingredients_by_recipe = pd.merge(
+        ingredients_by_recipe, ingredients_df, left_on="ingredients", right_on="name"
+    )
+    cooc = np.zeros((len(cluster_labels), len(cluster_labels)), int)
+    index_map = {label: i for i, label in enumerate(cluster_labels["cluster label"])}
+    for recipe in range(len(recipes)):
+        ings_recipe = ingredients_by_recipe.loc[
+            ingredients_by_recipe["id_recipe"] == recipe, "cluster label"
+        ]
+        for h in ings_recipe:
+            for v in ings_recipe:
+                cooc[index_map[h], index_map[v]] += 1
+    return cooc
+
+
+def _setup_cooccurrence(n_recipes: int) -> tuple:
+    recipes, ingredients_df = synthetic_ingredients(n_recipes)
+    cluster_labels = ingredients_df[["cluster", "cluster label"]].drop_duplicates()
+    return recipes, ingredients_df, cluster_labels
+
+
+def _run_legacy_cooccurrence(data: tuple) -> int:
+    return int(_legacy_cooccurrence(*data).sum())
+
+
+def _run_sparse_cooccurrence(data: tuple) -> int:
+    return int(IngredientsAnalyser()._build_cooccurrence(*data).sum())
+
+
+def bench_cooccurrence(args: argparse.Namespace) -> None:
+    rows = []
+    for n_recipes in args.recipes:
+        impls = {"sparse": _run_sparse_cooccurrence}
+        if n_recipes <= args.legacy_max:
+            impls["legacy"] = _run_legacy_cooccurrence
+        for impl, run in impls.items():
+            metrics = measure(_setup_cooccurrence, run, n_recipes)
+            total = metrics.pop("result")
+            rows.append({"recipes": n_recipes, "impl": impl, **metrics, "pairs": total})
+    print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# dedup: ingredient deduplication engines
+# ---------------------------------------------------------------------------
+
+
+def synthetic_embeddings(
+    n_ingredients: int, dim: int = 768, per_concept: int = 4, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return noisy variants of random concepts and their true concept ids.
+
+    Variants of one concept sit at a cosine distance of about 0.1 from each
+    other, distinct concepts near 1 (random directions in high dimension).
+    """
+    rng = np.random.default_rng(seed)
+    concepts = rng.integers(0, max(1, n_ingredients // per_concept), n_ingredients)
+    centers = rng.normal(size=(concepts.max() + 1, dim))
+    noise = rng.normal(scale=0.3, size=(n_ingredients, dim))
+    return (centers[concepts] + noise).astype(np.float32), concepts
+
+
+def _setup_dedup(n_ingredients: int, method: str, threshold: float) -> tuple:
+    embeddings, truth = synthetic_embeddings(n_ingredients)
+    analyser = IngredientsAnalyser(cluster_threshold=threshold, dedup_method=method)
+    return analyser, embeddings, truth
+
+
+def _run_dedup(data: tuple) -> tuple[int, float]:
+    from sklearn.metrics import adjusted_rand_score
+
+    analyser, embeddings, truth = data
+    ingredients = [f"ingredient {i}" for i in range(len(embeddings))]
+    counts = pd.Series(1, index=ingredients)
+    labels = analyser._cluster_ingredients(ingredients, embeddings, counts)
+    clusters = labels["cluster"].to_numpy()
+    return int(labels["cluster"].nunique()), adjusted_rand_score(truth, clusters)
+
+
+def bench_dedup(args: argparse.Namespace) -> None:
+    rows = []
+    for n in args.ingredients:
+        engines = {"knn_graph": args.knn_threshold}
+        if n <= args.agglomerative_max:
+            engines["agglomerative"] = args.threshold
+        for method, threshold in engines.items():
+            metrics = measure(_setup_dedup, _run_dedup, n, method, threshold)
+            n_clusters, ari = metrics.pop("result")
+            rows.append(
+                {
+                    "ingredients": n,
+                    "method": method,
+                    **metrics,
+                    "clusters": n_clusters,
+                    "ari_vs_truth": ari,
+                }
+            )
+    print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# ratings: per-recipe rating aggregates
+# ---------------------------------------------------------------------------
+
+
+def _legacy_rating_aggregate(interactions: pd.DataFrame) -> pd.DataFrame:
+    # Pre-bincount implementation: four groupbys joined with merges
+    is_rated = interactions["rating"].astype(float).fillna(0) > 0
+    grp = interactions.groupby("recipe_id", dropna=False)
+    n_interactions = grp.size().rename("n_interactions").reset_index()
+    n_rated = (
+        grp["rating"]
+        .apply(lambda s: (s.fillna(0).astype(float) > 0).sum())
+        .rename("n_rated")
+        .reset_index()
+    )
+    rated_only = interactions.loc[is_rated].copy()
+    rated_agg = (
+        rated_only.groupby("recipe_id")["rating"]
+        .agg(mean_rating="mean", median_rating="median", rating_std="std")
+        .reset_index()
+        .fillna({"rating_std": 0})
+    )
+    per_recipe = n_interactions.merge(n_rated, on="recipe_id", how="left").merge(
+        rated_agg, on="recipe_id", how="left"
+    )
+    per_recipe["n_rated"] = per_recipe["n_rated"].fillna(0).astype(int)
+    per_recipe["share_rated"] = (
+        per_recipe["n_rated"].divide(per_recipe["n_interactions"]).fillna(0)
+    )
+    sum_ratings = (
+        rated_only.groupby("recipe_id")["rating"]
+        .sum()
+        .rename("sum_ratings")
+        .reset_index()
+    )
+    return per_recipe.merge(sum_ratings, on="recipe_id", how="left").fillna(
+        {"sum_ratings": 0.0}
+    )
+
+
+def _setup_interactions(n_rows: int) -> pd.DataFrame:
+    return synthetic_interactions(n_rows, max(1, n_rows // 5))
+
+
+def _run_legacy_ratings(interactions: pd.DataFrame) -> pd.DataFrame:
+    return _legacy_rating_aggregate(interactions)
+
+
+def _run_single_pass_ratings(interactions: pd.DataFrame) -> pd.DataFrame:
+    return RatingAnalyser._aggregate(interactions)[0]
+
+
+def bench_ratings(args: argparse.Namespace) -> None:
+    rows, tables = [], {}
+    for impl, run in (
+        ("legacy", _run_legacy_ratings),
+        ("single_pass", _run_single_pass_ratings),
+    ):
+        metrics = measure(_setup_interactions, run, args.rows)
+        tables[impl] = metrics.pop("result")
+        rows.append({"rows": args.rows, "impl": impl, **metrics})
+    print_table(rows)
+    pd.testing.assert_frame_equal(
+        tables["single_pass"], tables["legacy"], check_dtype=False, rtol=1e-12
+    )
+    print("Per-recipe tables are identical")
+
+
+# ---------------------------------------------------------------------------
+# streaming: chunked interactions for the rating and seasonality analysers
+# ---------------------------------------------------------------------------
+
+STREAMING_ANALYSERS = {
+    "rating": ("create_rating", RatingAnalyser),
+    "seasonality": ("create_seasonality", SeasonalityAnalyzer),
+}
+
+
+def write_synthetic_csvs(directory: Path, n_rows: int) -> RepositoryPaths:
+    """Write RAW-like recipes/interactions CSVs (with a review column)."""
+    n_recipes = max(1, n_rows // 5)
+    interactions = synthetic_interactions(n_rows, n_recipes)
+    interactions["review"] = "Loved it, will make again with less sugar. " * 6
+    paths = RepositoryPaths(
+        recipes_csv=str(directory / "recipes.csv"),
+        interactions_csv=str(directory / "interactions.csv"),
+    )
+    pd.DataFrame({"name": "recipe", "id": np.arange(n_recipes)}).to_csv(
+        paths.recipes_csv, index=False
+    )
+    interactions.to_csv(paths.interactions_csv, index=False)
+    return paths
+
+
+def _setup_streaming(paths: RepositoryPaths, stage: str, chunksize: int | None):
+    factory, analyser = STREAMING_ANALYSERS[stage]
+    repository = CSVDataRepository(paths=paths)
+    return getattr(ProcessorFactory, factory)(repository), analyser(), chunksize
+
+
+def _run_streaming(data: tuple) -> int:
+    processor, analyser, chunksize = data
+    if chunksize is None:
+        pair = processor.run()
+        return len(analyser.analyze(pair.recipes, pair.interactions).table)
+    pairs = processor.iter_chunks(chunksize, columns=analyser.INTERACTION_COLUMNS)
+    recipes = processor._repository.load_recipes()
+    return len(analyser.analyze_chunks(recipes, (p.interactions for p in pairs)).table)
+
+
+def bench_streaming(args: argparse.Namespace) -> None:
+    import tempfile
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_synthetic_csvs(Path(tmp), args.rows)
+        for stage in STREAMING_ANALYSERS:
+            for chunksize in (None, args.chunksize):
+                metrics = measure(
+                    _setup_streaming, _run_streaming, paths, stage, chunksize
+                )
+                n_recipes = metrics.pop("result")
+                rows.append(
+                    {
+                        "stage": stage,
+                        "chunksize": chunksize or "full",
+                        **metrics,
+                        "recipes": n_recipes,
+                    }
+                )
+    print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# seasonality: date parsing and day-of-year features
+# ---------------------------------------------------------------------------
+
+
+def _legacy_seasonality(interactions: pd.DataFrame) -> pd.DataFrame:
+    # Pre-lookup implementation: format inference, per-row sin/cos, groupby
+    df = interactions.copy()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    if df["date"].isna().any():
+        raise ValueError("Invalid dates found in 'date'")
+    doy = df["date"].dt.dayofyear
+    df["doy_sin"] = np.sin(2 * np.pi * doy / 365)
+    df["doy_cos"] = np.cos(2 * np.pi * doy / 365)
+    sin_global, cos_global = df["doy_sin"].mean(), df["doy_cos"].mean()
+    agg = (
+        df.groupby("recipe_id")
+        .agg(
+            sin_mean=("doy_sin", "mean"),
+            cos_mean=("doy_cos", "mean"),
+            n=("doy_sin", "size"),
+        )
+        .reset_index()
+    )
+    k = 5.0
+    agg["inter_doy_sin_smooth"] = (agg["n"] * agg["sin_mean"] + k * sin_global) / (
+        agg["n"] + k
+    )
+    agg["inter_doy_cos_smooth"] = (agg["n"] * agg["cos_mean"] + k * cos_global) / (
+        agg["n"] + k
+    )
+    agg["inter_strength"] = np.sqrt(
+        agg["inter_doy_sin_smooth"] ** 2 + agg["inter_doy_cos_smooth"] ** 2
+    )
+    return agg[
+        ["recipe_id", "inter_doy_sin_smooth", "inter_doy_cos_smooth", "inter_strength"]
+    ]
+
+
+def _run_legacy_seasonality(interactions: pd.DataFrame) -> pd.DataFrame:
+    return _legacy_seasonality(interactions)
+
+
+def _run_lookup_seasonality(interactions: pd.DataFrame) -> pd.DataFrame:
+    return SeasonalityAnalyzer().analyze(None, interactions).table
+
+
+def bench_seasonality(args: argparse.Namespace) -> None:
+    rows, tables = [], {}
+    for impl, run in (
+        ("legacy", _run_legacy_seasonality),
+        ("lookup", _run_lookup_seasonality),
+    ):
+        metrics = measure(_setup_interactions, run, args.rows)
+        tables[impl] = metrics.pop("result")
+        rows.append({"rows": args.rows, "impl": impl, **metrics})
+    print_table(rows)
+    pd.testing.assert_frame_equal(tables["lookup"], tables["legacy"], rtol=1e-12)
+    print("Per-recipe features are identical")
+
+
+# ---------------------------------------------------------------------------
+# nutrition: parsing the stringified nutrient lists
+# ---------------------------------------------------------------------------
+
+
+def synthetic_nutrition(n_recipes: int, seed: int = 0) -> pd.Series:
+    """RAW-like ``nutrition`` cells: seven one-decimal floats per recipe."""
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.gamma(2.0, 40.0, size=(n_recipes, 7)), 1)
+    return pd.Series(["[" + ", ".join(map(str, row)) + "]" for row in values.tolist()])
+
+
+def _setup_nutrition(n_recipes: int) -> pd.Series:
+    return synthetic_nutrition(n_recipes)
+
+
+def _run_literal_eval_nutrition(cells: pd.Series) -> np.ndarray:
+    # Original NutritionAnalyser path: one literal_eval per cell
+    return pd.DataFrame(cells.apply(ast.literal_eval).tolist()).to_numpy()
+
+
+def _run_rowwise_nutrition(cells: pd.Series) -> np.ndarray:
+    # Previous RaggedArray path: one split + float() list per cell
+    rows = [_parse_number_list(cell) for cell in cells]
+    return np.asarray(rows, dtype=np.float32)
+
+
+def _run_vectorized_nutrition(cells: pd.Series) -> np.ndarray:
+    return RaggedArray.from_number_lists(cells).to_matrix(7)
+
+
+def bench_nutrition(args: argparse.Namespace) -> None:
+    rows = []
+    for n_recipes in args.recipes:
+        matrices = {}
+        for impl, run in (
+            ("literal_eval", _run_literal_eval_nutrition),
+            ("rowwise", _run_rowwise_nutrition),
+            ("vectorized", _run_vectorized_nutrition),
+        ):
+            metrics = measure(_setup_nutrition, run, n_recipes)
+            matrices[impl] = metrics.pop("result")
+            rows.append({"recipes": n_recipes, "impl": impl, **metrics})
+        reference = matrices["literal_eval"].astype(np.float32)
+        for impl in ("rowwise", "vectorized"):
+            np.testing.assert_array_equal(matrices[impl], reference)
+    print_table(rows)
+    print("Nutrient matrices are identical (float32)")
+
+
+# ---------------------------------------------------------------------------
+# schema: dtype compaction of the raw tables
+# ---------------------------------------------------------------------------
+
+
+def synthetic_raw_tables(n_recipes: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """RAW-like recipes and interactions (about 5 interactions per recipe)."""
+    rng = np.random.default_rng(0)
+    recipes, _ = synthetic_ingredients(n_recipes)
+    recipes["name"] = [f"recipe number {i}" for i in range(n_recipes)]
+    recipes["minutes"] = rng.integers(1, 600, n_recipes)
+    recipes["contributor_id"] = rng.integers(0, 30_000, n_recipes)
+    recipes["submitted"] = (
+        pd.Timestamp("2000-01-01")
+        + pd.to_timedelta(rng.integers(0, 365 * 18, n_recipes), unit="D")
+    ).strftime("%Y-%m-%d")
+    recipes["tags"] = str(["60-minutes-or-less", "main-dish", "easy", "dinner"])
+    recipes["nutrition"] = synthetic_nutrition(n_recipes)
+    recipes["n_steps"] = rng.integers(1, 30, n_recipes)
+    recipes["n_ingredients"] = rng.integers(1, 20, n_recipes)
+    interactions = synthetic_interactions(n_recipes * 5, n_recipes)
+    interactions["review"] = [
+        f"Great recipe, made it {i % 7} times" for i in range(len(interactions))
+    ]
+    return recipes, interactions
+
+
+def bench_schema(args: argparse.Namespace) -> None:
+    recipes, interactions = synthetic_raw_tables(args.recipes)
+    for df, schema in ((recipes, RECIPES_SCHEMA), (interactions, INTERACTIONS_SCHEMA)):
+        _, report = compact_frame(df, schema)
+        print(f"\n{schema.name} ({len(df):,} rows)")
+        table = report.to_frame()
+        for column in ("bytes_before", "bytes_after", "bytes_saved"):
+            table[column] = table[column] / 2**20
+        print_table(
+            table.rename(columns=lambda c: c.replace("bytes", "mib")).to_dict("records")
+        )
+        print(
+            f"total: {report.bytes_before / 2**20:,.1f} MiB -> "
+            f"{report.bytes_after / 2**20:,.1f} MiB"
+        )
+
+
+# ---------------------------------------------------------------------------
+# clustering: exact vs mini-batch PCA + KMeans
+# ---------------------------------------------------------------------------
+
+
+SWEEP_K = (3, 4, 5, 6, 8)
+SWEEP_PCS = (6, 12, 19)
+
+
+def synthetic_features(n_recipes: int, seed: int = 0) -> pd.DataFrame:
+    """Merged feature table: overlapping Gaussian blobs over REQUIRED_FEATURES."""
+    from sklearn.datasets import make_blobs
+
+    features, _ = make_blobs(
+        n_samples=n_recipes,
+        n_features=len(REQUIRED_FEATURES),
+        centers=5,
+        cluster_std=4.0,
+        random_state=seed,
+    )
+    return pd.DataFrame(features, columns=REQUIRED_FEATURES)
+
+
+def _setup_clustering(n_recipes: int, mode: str, batch_size: int) -> tuple:
+    pipeline = RecipeClusteringPipeline(mode=mode, batch_size=batch_size)
+    return pipeline, synthetic_features(n_recipes)
+
+
+def _run_clustering(data: tuple) -> np.ndarray:
+    pipeline, recipes = data
+    return pipeline.cluster(recipes)["cluster"].to_numpy()
+
+
+def _setup_sweep(n_recipes: int, workers: int) -> tuple:
+    return synthetic_features(n_recipes), workers
+
+
+def _run_reruns(data: tuple) -> int:
+    # One full pipeline run (scaling, PCA, KMeans) per configuration, scored
+    # on the same silhouette subsample as the sweep
+    from sklearn.metrics import silhouette_score
+
+    recipes, _ = data
+    rng = np.random.default_rng(42)
+    sample = np.sort(rng.choice(len(recipes), size=5_000, replace=False))
+    for k, n_pcs in product(SWEEP_K, SWEEP_PCS):
+        pipeline = RecipeClusteringPipeline(n_clusters=k, n_pcs_for_kmeans=n_pcs)
+        result = pipeline.cluster(recipes)
+        pcs = pipeline.model.transform(recipes.iloc[sample])[:, :n_pcs]
+        silhouette_score(pcs, result["cluster"].to_numpy()[sample])
+    return len(SWEEP_K) * len(SWEEP_PCS)
+
+
+def _run_sweep(data: tuple) -> int:
+    recipes, workers = data
+    table = RecipeClusteringPipeline().sweep(
+        recipes, SWEEP_K, SWEEP_PCS, max_workers=workers
+    )
+    return len(table)
+
+
+def bench_sweep(args: argparse.Namespace) -> None:
+    rows = []
+    for impl, run, workers in (
+        ("sequential reruns", _run_reruns, 1),
+        ("sweep", _run_sweep, 1),
+        (f"sweep x{args.workers}", _run_sweep, args.workers),
+    ):
+        metrics = measure(_setup_sweep, run, args.recipes, workers)
+        rows.append({"impl": impl, "configs": metrics.pop("result"), **metrics})
+    print_table(rows)
+
+
+def _setup_similarity(n_recipes: int, n_queries: int) -> tuple:
+    pipeline = RecipeClusteringPipeline()
+    pipeline.cluster(synthetic_features(n_recipes))
+    pcs = np.asarray(pipeline.similarity_index._tree.data)
+    ids = np.random.default_rng(0).integers(0, n_recipes, n_queries)
+    return pcs, ids
+
+
+def _query_latencies(query: Callable, ids: np.ndarray) -> dict[str, float]:
+    latencies = []
+    for recipe_id in ids:
+        start = time.perf_counter()
+        query(recipe_id)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.asarray(latencies) * 1000
+    return {"mean_ms": latencies.mean(), "p99_ms": np.percentile(latencies, 99)}
+
+
+def _run_brute_similarity(data: tuple) -> dict[str, float]:
+    # Full scan: distances to every recipe, then the k smallest
+    pcs, ids = data
+    squared_norms = (pcs**2).sum(axis=1)
+
+    def query(row: int) -> np.ndarray:
+        distances = squared_norms - 2 * pcs @ pcs[row]
+        nearest = np.argpartition(distances, 11)[:11]
+        return nearest[np.argsort(distances[nearest])]
+
+    return _query_latencies(query, ids)
+
+
+def _run_kdtree_similarity(data: tuple) -> dict[str, float]:
+    pcs, ids = data
+    start = time.perf_counter()
+    index = RecipeSimilarityIndex(np.arange(len(pcs)), pcs)
+    build = time.perf_counter() - start
+    return {"build_s": build, **_query_latencies(index.most_similar, ids)}
+
+
+def bench_similarity(args: argparse.Namespace) -> None:
+    rows = []
+    for n_recipes in args.recipes:
+        for impl, run in (
+            ("brute_force", _run_brute_similarity),
+            ("kdtree", _run_kdtree_similarity),
+        ):
+            metrics = measure(_setup_similarity, run, n_recipes, args.queries)
+            rows.append(
+                {"recipes": n_recipes, "impl": impl, **metrics.pop("result"), **metrics}
+            )
+    print_table(rows)
+
+
+# Feature tables as written by the analysers: index column, then features
+FEATURE_TABLES = {
+    "nutrition": ("id", ["name", *REQUIRED_FEATURES[:4]]),
+    "seasonality": ("recipe_id", REQUIRED_FEATURES[4:7]),
+    "rating": (
+        "recipe_id",
+        ["n_interactions", "n_rated", "mean_rating", "median_rating", "rating_std"]
+        + ["share_rated", "sum_ratings", "bayes_mean", "recipe_name"],
+    ),
+    "complexity": (
+        "id",
+        ["minutes", "n_steps", "n_ingredients", "minutes_z", *REQUIRED_FEATURES[9:12]]
+        + ["cluster_ing_steps", "cluster_label_ing_steps"],
+    ),
+    "ingredients": ("id", REQUIRED_FEATURES[12:]),
+}
+
+
+def write_feature_tables(directory: Path, n_recipes: int) -> dict[str, Path]:
+    """Write analyser-like feature CSVs over the same shuffled recipe ids.
+
+    Nutrition and complexity follow the (unsorted) RAW order, the
+    interaction-based tables are sorted by recipe id.
+    """
+    rng = np.random.default_rng(0)
+    raw_ids = rng.permutation(n_recipes) * 3 + 1
+    paths = {}
+    for group, (index_name, columns) in FEATURE_TABLES.items():
+        ids = np.sort(raw_ids) if index_name == "recipe_id" else raw_ids
+        table = pd.DataFrame(
+            {
+                c: (
+                    np.char.add("recipe ", ids.astype(str))
+                    if "name" in c
+                    else rng.random(n_recipes)
+                )
+                for c in columns
+            },
+            index=pd.Index(ids, name=index_name),
+        )
+        paths[group] = directory / f"{group}_table.csv"
+        table.to_csv(paths[group])
+    return paths
+
+
+def _setup_feature_store(
+    paths: dict[str, Path], store_dir: Path, workers: int = 1
+) -> tuple:
+    return paths, FeatureStore(store_dir, max_workers=workers)
+
+
+def _run_csv_merge(data: tuple) -> tuple[int, int]:
+    paths, _ = data
+    tables = [pd.read_csv(path, index_col=0) for path in paths.values()]
+    merged = tables[0]
+    for table in tables[1:]:
+        merged = merged.merge(table, left_index=True, right_index=True)
+    return merged.shape
+
+
+def _run_parquet_merge(data: tuple) -> tuple[int, int]:
+    # Same chained merges, on groups already decoded from the store
+    paths, store = data
+    tables = [store.read([group]) for group in paths]
+    merged = tables[0]
+    for table in tables[1:]:
+        merged = merged.merge(table, left_index=True, right_index=True)
+    return merged.shape
+
+
+def _run_store_build(data: tuple) -> tuple[int, int]:
+    # Every group stale: one CSV parse and Parquet write per table
+    paths, store = data
+    for path in store.store_dir.glob("*.meta.json"):
+        path.unlink()
+    store.ensure_all(paths, lambda p: pd.read_csv(p, index_col=0))
+    return len(paths), 0
+
+
+def _run_store_read(data: tuple) -> tuple[int, int]:
+    paths, store = data
+    return store.read(list(paths)).shape
+
+
+def _run_store_projected(data: tuple) -> tuple[int, int]:
+    paths, store = data
+    return store.read(list(paths), columns=[*REQUIRED_FEATURES, "name"]).shape
+
+
+def bench_feature_store(args: argparse.Namespace) -> None:
+    import tempfile
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_recipes in args.recipes:
+            directory = Path(tmp) / str(n_recipes)
+            directory.mkdir()
+            paths = write_feature_tables(directory, n_recipes)
+            store_dir = directory / "store"
+            for impl, run, workers in (
+                ("csv + merge", _run_csv_merge, 1),
+                ("store build", _run_store_build, 1),
+                (f"store build x{args.workers}", _run_store_build, args.workers),
+                ("parquet + merge", _run_parquet_merge, 1),
+                ("store, all columns", _run_store_read, 1),
+                (f"store, all columns x{args.workers}", _run_store_read, args.workers),
+                ("store, clustering columns", _run_store_projected, 1),
+            ):
+                metrics = measure(_setup_feature_store, run, paths, store_dir, workers)
+                rows.append(
+                    {
+                        "recipes": n_recipes,
+                        "impl": impl,
+                        "shape": metrics.pop("result"),
+                        **metrics,
+                    }
+                )
+    print_table(rows)
+
+
+def bench_clustering(args: argparse.Namespace) -> None:
+    from sklearn.metrics import adjusted_rand_score
+
+    rows = []
+    for n_recipes in args.recipes:
+        labels = {}
+        for mode in ("exact", "minibatch"):
+            metrics = measure(
+                _setup_clustering, _run_clustering, n_recipes, mode, args.batch_size
+            )
+            labels[mode] = metrics.pop("result")
+            rows.append({"recipes": n_recipes, "mode": mode, **metrics})
+        rows[-1]["ari_vs_exact"] = adjusted_rand_score(
+            labels["exact"], labels["minibatch"]
+        )
+    print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("processors", help="BasicDataProcessor copy semantics")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.set_defaults(func=bench_processors)
+
+    p = sub.add_parser("cooccurrence", help="ingredient co-occurrence matrix")
+    p.add_argument(
+        "--recipes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 230_000]
+    )
+    p.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10_000,
+        help="largest size also run with the legacy loop (it is quadratic)",
+    )
+    p.set_defaults(func=bench_cooccurrence)
+
+    p = sub.add_parser("dedup", help="ingredient deduplication engines")
+    p.add_argument(
+        "--ingredients", type=int, nargs="+", default=[2_000, 5_000, 10_000, 40_000]
+    )
+    p.add_argument("--threshold", type=float, default=0.5)
+    p.add_argument("--knn-threshold", type=float, default=0.3)
+    p.add_argument(
+        "--agglomerative-max",
+        type=int,
+        default=10_000,
+        help="largest size also run with AgglomerativeClustering (O(n²) memory)",
+    )
+    p.set_defaults(func=bench_dedup)
+
+    p = sub.add_parser("ratings", help="per-recipe rating aggregates")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.set_defaults(func=bench_ratings)
+
+    p = sub.add_parser("streaming", help="chunked rating/seasonality analysis")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--chunksize", type=int, default=100_000)
+    p.set_defaults(func=bench_streaming)
+
+    p = sub.add_parser("seasonality", help="day-of-year seasonality features")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.set_defaults(func=bench_seasonality)
+
+    p = sub.add_parser("nutrition", help="nutrition list parsing")
+    p.add_argument("--recipes", type=int, nargs="+", default=[230_000, 1_000_000])
+    p.set_defaults(func=bench_nutrition)
+
+    p = sub.add_parser("schema", help="dtype compaction of the raw tables")
+    p.add_argument("--recipes", type=int, default=230_000)
+    p.set_defaults(func=bench_schema)
+
+    p = sub.add_parser("clustering", help="exact vs mini-batch PCA + KMeans")
+    p.add_argument("--recipes", type=int, nargs="+", default=[230_000, 1_000_000])
+    p.add_argument("--batch-size", type=int, default=10_000)
+    p.set_defaults(func=bench_clustering)
+
+    p = sub.add_parser("sweep", help="KMeans k / n_pcs model-selection sweep")
+    p.add_argument("--recipes", type=int, default=230_000)
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(func=bench_sweep)
+
+    p = sub.add_parser("similarity", help="most_similar recipe queries")
+    p.add_argument("--recipes", type=int, nargs="+", default=[230_000, 1_000_000])
+    p.add_argument("--queries", type=int, default=1_000)
+    p.set_defaults(func=bench_similarity)
+
+    p = sub.add_parser("featurestore", help="merged feature table assembly")
+    p.add_argument("--recipes", type=int, nargs="+", default=[230_000, 1_000_000])
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(func=bench_feature_store)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Assign clusters to new recipes with the persisted clustering model.
+
+Loads the model saved by the clustering stage of ``run_all.py``
+(``data/clustering/recipes_clustering_model.joblib``, see
+:class:`mangetamain.clustering.ClusteringModel`) and labels a CSV of new
+recipe features without refitting on the corpus.
+
+The input CSV has one row per recipe, the recipe id as first column and
+every column of ``REQUIRED_FEATURES``; the output has the layout of
+``recipes_clustering_with_pca.csv`` (``name`` when present, ``cluster``,
+``pc_1``, ``pc_2``).
+
+Typical usage
+-------------
+::
+
+    python src/app/predict_clusters.py data/new_recipe_features.csv \\
+        --out data/clustering/new_recipes_clusters.csv
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    # Ensure `src` is on sys.path when running as `python src/app/...`
+    sys.path.insert(0, str(ROOT))
+
+import argparse  # noqa: E402
+import logging  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+from app.logging_config import configure_logging, get_logger  # noqa: E402
+from mangetamain.clustering import ClusteringModel, ClusteringPaths  # noqa: E402
+
+
+def predict_clusters(
+    features_csv: str | Path,
+    *,
+    model_path: str | Path,
+    out_csv: str | Path,
+    logger: logging.Logger,
+) -> Path:
+    """Label the recipes of ``features_csv`` and write them to ``out_csv``.
+
+    Args:
+        features_csv: CSV of new recipes indexed by recipe id (first column).
+        model_path: Model written by the clustering pipeline.
+        out_csv: Destination CSV.
+        logger: Logger.
+
+    Returns:
+        Path: Path of the written CSV.
+    """
+    model = ClusteringModel.load(model_path, logger=logger)
+    recipes = pd.read_csv(features_csv, index_col=0)
+    labels = model.predict(recipes)
+    if "name" in recipes.columns:
+        labels.insert(0, "name", recipes["name"])
+
+    out_csv = Path(out_csv)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    labels.to_csv(out_csv, index=True)
+    logger.info(
+        "Assigned %d recipes to %d clusters → %s",
+        len(labels),
+        labels["cluster"].nunique(),
+        out_csv,
+    )
+    return out_csv
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Assign clusters to new recipes with the saved model."
+    )
+    parser.add_argument("features", help="CSV of new recipe features")
+    parser.add_argument("--model", default=str(ClusteringPaths().model_path()))
+    parser.add_argument(
+        "--out", default=str(ClusteringPaths().out_dir / "new_recipes_clusters.csv")
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    configure_logging(log_directory=ROOT / "logs", reset_existing=True)
+    logger = get_logger("predict_clusters")
+    predict_clusters(
+        args.features, model_path=args.model, out_csv=args.out, logger=logger
+    )
+
+
+if __name__ == "__main__":
+    main()
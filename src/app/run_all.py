@@ -4,17 +4,28 @@ This module orchestrates the full data workflow used in the project:
 
 - ensures raw datasets are present (downloads them if missing),
 - runs all preprocessing analysers (rating, seasonality, nutrition, steps,
-  ingredients) and writes their feature tables to ``data/preprocessed/``,
-- executes the clustering pipeline (PCA + KMeans) writing to
-  ``data/clustering/recipes_clustering_with_pca.csv``,
+  ingredients) and writes their feature tables to ``data/preprocessed/``;
+  the analysers are independent and run concurrently in a process pool
+  (see :class:`mangetamain.orchestration.DAGExecutor`),
+- executes the clustering pipeline (PCA + KMeans) once every feature table
+  exists, writing to ``data/clustering/recipes_clustering_with_pca.csv``,
 - merges all produced feature tables with clustering results into a single
   gzip-compressed CSV used by notebooks and downstream exploration.
 
+Each feature table is also mirrored, as one column group per analyser, in
+``data/preprocessed/feature_store/`` (see
+:class:`mangetamain.preprocessing.feature_store.FeatureStore`); clustering
+and the final merge assemble their inputs from it by column.
+
+Stages are fingerprinted (RAW file hashes, analyser class and parameters,
+upstream tables) in ``data/preprocessed/.stage_cache.json``; a stage whose
+fingerprint is unchanged reuses its previous output instead of recomputing.
+
 Typical usage
 -------------
 The module is designed to be executed as a script, e.g.::
 
-    python src/app/run_all.py
+    python src/app/run_all.py [--workers N] [--force STAGE ...] [--chunksize ROWS]
 
 It sets up logging via :func:`app.logging_config.configure_logging`, writes
 structured logs to the ``logs/`` directory, and emits progress information
@@ -32,7 +43,10 @@ if str(ROOT) not in sys.path:
     # Ensure `src` is on sys.path when running as `python src/app/run_all.py`
     sys.path.insert(0, str(ROOT))
 
+import argparse  # noqa: E402
+import inspect  # noqa: E402
 import logging  # noqa: E402
+import multiprocessing  # noqa: E402
 
 import pandas as pd  # noqa: E402
 
@@ -42,6 +56,13 @@ from mangetamain.clustering import (  # noqa: E402
     ClusteringPaths,
     RecipeClusteringPipeline,
 )
+from mangetamain.clustering.pipeline import read_feature_table  # noqa: E402
+from mangetamain.orchestration import (  # noqa: E402
+    DAGExecutor,
+    Stage,
+    StageCache,
+    object_params,
+)
 from mangetamain.preprocessing.factories import ProcessorFactory  # noqa: E402
 from mangetamain.preprocessing.feature.ingredients import (  # noqa: E402
     IngredientsAnalyser,
@@ -56,8 +77,14 @@ from mangetamain.preprocessing.feature.seasonality import (  # noqa: E402
     SeasonalityAnalyzer,
 )
 from mangetamain.preprocessing.feature.steps import StepsAnalyser  # noqa: E402
+from mangetamain.preprocessing.feature_store import FeatureStore  # noqa: E402
+from mangetamain.preprocessing.interfaces import (  # noqa: E402
+    Analyser,
+    IDataRepository,
+)
 from mangetamain.preprocessing.repositories import (  # noqa: E402
-    CSVDataRepository,
+    MemoizedDataRepository,
+    ParquetDataRepository,
     RepositoryPaths,
 )
 
@@ -75,117 +102,259 @@ def _safe_log(logger: logging.Logger, level: int, msg: str, *args) -> None:
         pass
 
 
-def run_preprocessing(logger: logging.Logger) -> dict[str, Path]:
-    """Generate and save required preprocessed CSVs via generate_report.
-
-    Returns mapping of logical names to produced file paths.
+# Feature stages in execution order: ProcessorFactory method, analyser class
+# and constructor arguments, and the backup table used when no report path is
+# returned.
+FEATURE_STAGES: dict[str, tuple[str, type[Analyser], dict[str, object], str]] = {
+    "rating": (
+        "create_rating",
+        RatingAnalyser,
+        {},
+        "data/preprocessed/backup/recipes_feature_rating_full.csv",
+    ),
+    "seasonality": (
+        "create_seasonality",
+        SeasonalityAnalyzer,
+        {},
+        "data/preprocessed/backup/recipe_seasonality_features.csv",
+    ),
+    "nutrition": (
+        "create_nutrition",
+        NutritionAnalyser,
+        {},
+        "data/preprocessed/backup/features_nutrition.csv",
+    ),
+    "complexity": (
+        "create_steps",
+        StepsAnalyser,
+        {},
+        "data/preprocessed/backup/recipes_features_complexity.csv",
+    ),
+    "ingredients": (
+        "create_ingredients",
+        IngredientsAnalyser,
+        {"embedding_cache_dir": "data/cache/embeddings"},
+        "data/preprocessed/backup/features_axes_ingredients.csv",
+    ),
+}
+
+
+STAGE_CACHE_MANIFEST = "data/preprocessed/.stage_cache.json"
+
+# Feature tables of the merged output, left to right (notebook merge order)
+MERGE_GROUPS = ("nutrition", "seasonality", "rating", "complexity", "ingredients")
+
+
+def _qualname(obj: object) -> str:
+    cls = type(obj)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def make_analyser(name: str, logger: logging.Logger) -> Analyser:
+    """Build the analyser of feature stage ``name`` with its configured arguments."""
+    _, analyser_cls, kwargs, _ = FEATURE_STAGES[name]
+    if "logger" in inspect.signature(analyser_cls).parameters:
+        kwargs = {**kwargs, "logger": logger}
+    return analyser_cls(**kwargs)
+
+
+def _constructor_defaults(analyser_cls: type[Analyser]) -> dict[str, object]:
+    return {
+        param.name: param.default
+        for param in inspect.signature(analyser_cls).parameters.values()
+        if param.default is not inspect.Parameter.empty and param.name != "logger"
+    }
+
+
+def feature_stage_params(name: str) -> dict[str, object]:
+    """Describe the configuration of a feature stage for fingerprinting.
+
+    Covers the processor, the analyser class, its constructor arguments
+    (signature defaults overridden by the configured ones, e.g.
+    ``embedding_cache_dir``), its ``DEFAULT_*`` class constants, which
+    replace ``None`` arguments (e.g. ``DEFAULT_CLUSTER_THRESHOLD``), and the
+    keyword-only defaults of ``analyze`` (e.g. ``c``, ``mu_percentile``).
+    The analyser itself is not built.
     """
-    repo = CSVDataRepository(paths=RepositoryPaths())
-    outputs: dict[str, Path] = {}
-
-    # Rating
-    _safe_log(logger, logging.INFO, "Preprocessing: rating …")
-    proc_rating = ProcessorFactory.create_rating(repo, logger=logger)
-    pair_rating = proc_rating.run()
-    rating_an = RatingAnalyser(logger=logger)
-    rating_result = rating_an.analyze(
-        pair_rating.recipes,
-        pair_rating.interactions,
-    )
-    rating_paths = rating_an.generate_report(
-        rating_result,
-        Path("data/preprocessed"),
+    factory_name, analyser_cls, kwargs, _ = FEATURE_STAGES[name]
+    constants = {
+        attr: getattr(analyser_cls, attr)
+        for attr in sorted(dir(analyser_cls))
+        if attr.startswith("DEFAULT_")
+    }
+    analyze_params = {
+        param.name: param.default
+        for param in inspect.signature(analyser_cls.analyze).parameters.values()
+        if param.kind is inspect.Parameter.KEYWORD_ONLY
+        and param.default is not inspect.Parameter.empty
+    }
+    return {
+        "processor": factory_name,
+        "analyser": f"{analyser_cls.__module__}.{analyser_cls.__qualname__}",
+        "analyser_params": {**_constructor_defaults(analyser_cls), **kwargs},
+        "analyser_defaults": constants,
+        "analyze_params": analyze_params,
+    }
+
+
+def make_repository(logger: logging.Logger) -> MemoizedDataRepository:
+    """Return the repository shared by all preprocessing stages."""
+    # RAW CSVs are parsed once into data/cache and read back as Parquet with
+    # compact dtypes; the memoized wrapper then shares the loaded tables
+    # across processors
+    return MemoizedDataRepository(
+        ParquetDataRepository(
+            paths=RepositoryPaths(), cache_dir="data/cache", compact=True
+        ),
+        logger=logger,
     )
-    if isinstance(rating_paths, dict):
-        outputs["rating"] = Path(rating_paths["table_path"])
-    else:
-        outputs["rating"] = Path(
-            "data/preprocessed/backup/recipes_feature_rating_full.csv"
-        )
 
-    # Seasonality
-    _safe_log(logger, logging.INFO, "Preprocessing: seasonality …")
-    proc_season = ProcessorFactory.create_seasonality(repo, logger=logger)
-    pair_season = proc_season.run()
-    season_an = SeasonalityAnalyzer(logger=logger)
-    season_result = season_an.analyze(
-        pair_season.recipes,
-        pair_season.interactions,
-    )
-    season_paths = season_an.generate_report(
-        season_result,
-        Path("data/preprocessed"),
-    )
-    if isinstance(season_paths, dict):
-        outputs["seasonality"] = Path(season_paths["table_path"])
+
+def load_raw_tables(repository: IDataRepository, chunksize: int | None = None) -> None:
+    """Load both raw tables once, warming the Parquet cache and memo.
+
+    With ``chunksize``, interactions are only streamed by the stages, so they
+    are not memoized: only their Parquet cache is built. In a pool worker the
+    memo is discarded with the worker's copy of the repository, so only the
+    Parquet caches of both tables are built and nothing is loaded.
+    """
+    if multiprocessing.parent_process() is not None:
+        repository.prepare_recipes()
+        repository.prepare_interactions()
+        return
+    repository.load_recipes()
+    if chunksize is None:
+        repository.load_interactions()
     else:
-        outputs["seasonality"] = Path(
-            "data/preprocessed/backup/recipe_seasonality_features.csv"
-        )
+        repository.prepare_interactions()
 
-    # Nutrition
-    _safe_log(logger, logging.INFO, "Preprocessing: nutrition …")
-    proc_nutri = ProcessorFactory.create_nutrition(repo, logger=logger)
-    pair_nutri = proc_nutri.run()
-    nutri_an = NutritionAnalyser()
-    nutri_result = nutri_an.analyze(
-        pair_nutri.recipes,
-        pair_nutri.interactions,
-    )
-    nutri_paths = nutri_an.generate_report(
-        nutri_result,
-        Path("data/preprocessed"),
-    )
-    if isinstance(nutri_paths, dict):
-        outputs["nutrition"] = Path(nutri_paths["table_path"])
+
+def run_feature_stage(
+    name: str,
+    repository: IDataRepository,
+    logger: logging.Logger,
+    out_dir: str = "data/preprocessed",
+    chunksize: int | None = None,
+) -> Path:
+    """Run one analyser end to end and return the path of its feature table.
+
+    With ``chunksize``, analysers providing ``analyze_chunks`` (rating,
+    seasonality) stream their interaction columns in chunks of that many rows
+    instead of loading the whole table. Analysers declaring no
+    ``INTERACTION_COLUMNS`` (nutrition, steps, ingredients) never load the
+    interactions. The table is then mirrored in the feature store under
+    ``out_dir``.
+    """
+    factory_name, _, _, fallback = FEATURE_STAGES[name]
+    _safe_log(logger, logging.INFO, "Preprocessing: %s …", name)
+    processor = getattr(ProcessorFactory, factory_name)(repository, logger=logger)
+    analyser = make_analyser(name, logger)
+    if chunksize is not None and hasattr(analyser, "analyze_chunks"):
+        pairs = processor.iter_chunks(chunksize, columns=analyser.INTERACTION_COLUMNS)
+        result = analyser.analyze_chunks(
+            repository.load_recipes(), (pair.interactions for pair in pairs)
+        )
     else:
-        outputs["nutrition"] = Path("data/preprocessed/backup/features_nutrition.csv")
-
-    # Complexity (steps)
-    _safe_log(logger, logging.INFO, "Preprocessing: complexity …")
-    proc_steps = ProcessorFactory.create_steps(repo, logger=logger)
-    pair_steps = proc_steps.run()
-    steps_an = StepsAnalyser()
-    steps_result = steps_an.analyze(
-        pair_steps.recipes,
-        pair_steps.interactions,
-    )
-    steps_paths = steps_an.generate_report(
-        steps_result,
-        Path("data/preprocessed"),
-    )
-    if isinstance(steps_paths, dict):
-        outputs["complexity"] = Path(steps_paths["table_path"])
+        columns = getattr(analyser, "INTERACTION_COLUMNS", None)
+        pair = processor.run(load_interactions=columns != ())
+        result = analyser.analyze(pair.recipes, pair.interactions)
+    paths = analyser.generate_report(result, Path(out_dir))
+    if isinstance(paths, dict):
+        table_path = Path(paths["table_path"])
     else:
-        outputs["complexity"] = Path(
-            "data/preprocessed/backup/recipes_features_complexity.csv"
+        table_path = Path(fallback)
+    if table_path.exists():
+        store = FeatureStore(
+            Path(out_dir) / ClusteringPaths.feature_store, logger=logger
         )
+        store.ensure(name, table_path, read_feature_table)
+    return table_path
 
-    # Ingredients axes
-    _safe_log(
-        logger,
-        logging.INFO,
-        "Preprocessing: ingredients axes …",
-    )
-    proc_ing = ProcessorFactory.create_ingredients(repo, logger=logger)
-    pair_ing = proc_ing.run()
-    ing_an = IngredientsAnalyser()
-    ing_result = ing_an.analyze(
-        pair_ing.recipes,
-        pair_ing.interactions,
-    )
-    ing_paths = ing_an.generate_report(
-        ing_result,
-        Path("data/preprocessed"),
+
+def build_preprocessing_stages(
+    repository: IDataRepository,
+    logger: logging.Logger,
+    chunksize: int | None = None,
+) -> list[Stage]:
+    """Declare the raw-loading stage and one independent stage per analyser."""
+    paths = RepositoryPaths()
+    sources = (paths.recipes_csv, paths.interactions_csv)
+    stages = [
+        Stage(
+            "raw_tables",
+            load_raw_tables,
+            kwargs={"repository": repository, "chunksize": chunksize},
+            outputs=("raw_recipes", "raw_interactions"),
+            params={},
+            sources=sources,
+        )
+    ]
+    for name in FEATURE_STAGES:
+        stages.append(
+            Stage(
+                name,
+                run_feature_stage,
+                kwargs={
+                    "name": name,
+                    "repository": repository,
+                    "logger": logger,
+                    "chunksize": chunksize,
+                },
+                inputs=("raw_recipes", "raw_interactions"),
+                outputs=(f"{name}_table",),
+                params=feature_stage_params(name),
+                sources=sources,
+            )
+        )
+    return stages
+
+
+def run_preprocessing(
+    logger: logging.Logger,
+    *,
+    max_workers: int | None = None,
+    cache: StageCache | None = None,
+    force: tuple[str, ...] = (),
+    chunksize: int | None = None,
+) -> dict[str, Path]:
+    """Generate and save required preprocessed CSVs via generate_report.
+
+    ``max_workers`` is the process pool size for the analysers, as in
+    :func:`run_pipeline`: ``None`` (default) uses one worker per CPU and
+    ``1`` runs them sequentially in-process. With a ``cache``, analysers
+    whose fingerprint is unchanged are skipped unless listed in ``force``.
+    ``chunksize`` streams the interactions of the rating and seasonality
+    analysers (see :func:`run_feature_stage`).
+
+    Returns mapping of logical names to produced file paths.
+    """
+    repo = make_repository(logger)
+    executor = DAGExecutor(
+        build_preprocessing_stages(repo, logger, chunksize),
+        max_workers=max_workers,
+        cache=cache,
+        force=force,
+        logger=logger,
     )
-    if isinstance(ing_paths, dict):
-        outputs["ingredients"] = Path(ing_paths["table_path"])
+    results = executor.run()
+    outputs: dict[str, Path] = {name: results[name] for name in FEATURE_STAGES}
+
+    if executor.workers <= 1:
+        _safe_log(
+            logger,
+            logging.INFO,
+            "Preprocessing done (repository hits=%s, misses=%s)",
+            repo.hits,
+            repo.misses,
+        )
     else:
-        outputs["ingredients"] = Path(
-            "data/preprocessed/backup/features_axes_ingredients.csv"
+        # Each worker process loads through its own copy of the repository
+        _safe_log(
+            logger,
+            logging.INFO,
+            "Preprocessing done with %d worker processes",
+            executor.workers,
         )
-
-    _safe_log(logger, logging.INFO, "Preprocessing done")
     return outputs
 
 
@@ -212,7 +381,16 @@ def merge_all_tables(
     logger: logging.Logger,
     preprocessed_paths: dict[str, Path] | None = None,
     clustering_path: Path | None = None,
+    store_dir: Path | None = None,
 ) -> pd.DataFrame:
+    """Join the feature tables and the clustering output on recipe id.
+
+    Tables are mirrored in the feature store at ``store_dir`` (default
+    ``data/preprocessed/feature_store``) if not already there, then assembled
+    by column: recipes present in every table, in nutrition table order.
+    Tables are converted and read concurrently; the time spent on each one
+    is logged.
+    """
     _safe_log(
         logger,
         logging.INFO,
@@ -259,33 +437,20 @@ def merge_all_tables(
     if clustering_path is None:
         clustering_path = Path("data/clustering/recipes_clustering_with_pca.csv")
 
-    # Read tables exactly as in notebook
-    nutrition = pd.read_csv(
-        preprocessed_paths["nutrition"],
-        delimiter=(
-            ";"
-            if preprocessed_paths["nutrition"]
-            == Path("data/preprocessed/backup/features_nutrition.csv")
-            else None
-        ),
-        index_col=0,
+    store = FeatureStore(
+        store_dir or ClusteringPaths().feature_store_dir(), logger=logger
     )
-    seasonal = pd.read_csv(preprocessed_paths["seasonality"], index_col=0)
-    rating = pd.read_csv(preprocessed_paths["rating"], index_col=0)
-    complexity = pd.read_csv(preprocessed_paths["complexity"], index_col=0)
-    ingredients = pd.read_csv(preprocessed_paths["ingredients"], index_col=0)
-    clusters = pd.read_csv(clustering_path, index_col=0)
-
-    df = (
-        nutrition.merge(seasonal, left_index=True, right_index=True)
-        .merge(rating, left_index=True, right_index=True)
-        .merge(complexity, left_index=True, right_index=True)
-        .merge(ingredients, left_index=True, right_index=True)
-        .merge(
-            clusters[["cluster", "pc_1", "pc_2"]],
-            left_index=True,
-            right_index=True,
-        )
+    store.ensure_all(
+        {
+            **{group: preprocessed_paths[group] for group in MERGE_GROUPS},
+            "clustering": clustering_path,
+        },
+        read_feature_table,
+    )
+    features = [c for group in MERGE_GROUPS for c in store.columns(group)]
+    df = store.read(
+        [*MERGE_GROUPS, "clustering"],
+        columns=[*features, "cluster", "pc_1", "pc_2"],
     )
 
     # Normalise id for downstream uses
@@ -307,7 +472,24 @@ def save_merged_gzip(df: pd.DataFrame, logger: logging.Logger) -> Path:
     return out_path
 
 
-def run_pipeline() -> Path:
+def run_pipeline(
+    max_workers: int | None = None,
+    force: tuple[str, ...] = (),
+    use_cache: bool = True,
+    chunksize: int | None = None,
+) -> Path:
+    """Run preprocessing, clustering and merge; return the merged gzip path.
+
+    Args:
+        max_workers: Process pool size for the independent analyser stages.
+            ``1`` runs everything sequentially in-process; ``None`` uses one
+            worker per CPU (capped at the number of stages).
+        force: Stages to recompute even if their fingerprint is unchanged;
+            ``"all"`` forces every stage.
+        use_cache: Whether to skip stages whose fingerprint is unchanged.
+        chunksize: Stream interactions to the rating and seasonality
+            analysers in chunks of this many rows (bounded memory).
+    """
     ensure_dirs()
     configure_logging(log_directory=ROOT / "logs", reset_existing=True)
     logger = get_logger("runner")
@@ -317,12 +499,32 @@ def run_pipeline() -> Path:
         raw_interactions = Path("data/RAW_interactions.csv")
         if not (raw_recipes.exists() and raw_interactions.exists()):
             run_downloading_datasets(logger)
-        # Run preprocessing
-        _safe_log(logger, logging.INFO, "Running preprocessing …")
-        preprocessed_paths = run_preprocessing(logger)
-        # Run clustering
-        _safe_log(logger, logging.INFO, "Running clustering …")
-        clustering_path = run_clustering(logger)
+        # Run preprocessing, then clustering once every feature table exists
+        _safe_log(logger, logging.INFO, "Running preprocessing and clustering …")
+        stages = build_preprocessing_stages(make_repository(logger), logger, chunksize)
+        stages.append(
+            Stage(
+                "clustering",
+                run_clustering,
+                kwargs={"logger": logger},
+                inputs=tuple(f"{name}_table" for name in FEATURE_STAGES),
+                outputs=("clustering_table",),
+                params={
+                    "pipeline": _qualname(RecipeClusteringPipeline()),
+                    **object_params(RecipeClusteringPipeline()),
+                },
+            )
+        )
+        cache = StageCache(STAGE_CACHE_MANIFEST, logger=logger) if use_cache else None
+        results = DAGExecutor(
+            stages,
+            max_workers=max_workers,
+            cache=cache,
+            force=force,
+            logger=logger,
+        ).run()
+        preprocessed_paths = {name: results[name] for name in FEATURE_STAGES}
+        clustering_path = results["clustering"]
         # Merge all tables
         _safe_log(logger, logging.INFO, "Merging all tables …")
         merged = merge_all_tables(
@@ -339,8 +541,47 @@ def run_pipeline() -> Path:
         raise
 
 
-def main() -> None:
-    run_pipeline()
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Mangetamain pipeline.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="process pool size for analyser stages (1 = sequential; "
+        "default: one per CPU)",
+    )
+    parser.add_argument(
+        "--force",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="recompute STAGE even if its inputs are unchanged (repeatable; "
+        f"one of: raw_tables, {', '.join(FEATURE_STAGES)}, clustering, all)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the stage cache and recompute every stage",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        metavar="ROWS",
+        help="stream interactions to the rating and seasonality analysers in "
+        "chunks of ROWS rows instead of loading them at once",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    run_pipeline(
+        max_workers=args.workers,
+        force=tuple(args.force),
+        use_cache=not args.no_cache,
+        chunksize=args.chunksize,
+    )
 
 
 if __name__ == "__main__":
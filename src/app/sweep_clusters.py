@@ -0,0 +1,70 @@
+"""Compare KMeans cluster counts and numbers of principal components.
+
+Scales and projects the merged feature tables once, fits KMeans for every
+pair of ``--k`` and ``--pcs`` values in a process pool and writes inertia and
+a subsampled silhouette per configuration to
+``data/clustering/clustering_sweep.csv`` (see
+:meth:`mangetamain.clustering.RecipeClusteringPipeline.run_sweep`).
+
+Typical usage
+-------------
+::
+
+    python src/app/sweep_clusters.py --k 3 4 5 6 8 --pcs 6 9 12 19 --workers 4
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    # Ensure `src` is on sys.path when running as `python src/app/...`
+    sys.path.insert(0, str(ROOT))
+
+import argparse  # noqa: E402
+
+from app.logging_config import configure_logging, get_logger  # noqa: E402
+from mangetamain.clustering import (  # noqa: E402
+    CLUSTERING_MODES,
+    ClusteringPaths,
+    RecipeClusteringPipeline,
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Score KMeans over a grid of cluster and component counts."
+    )
+    parser.add_argument("--k", type=int, nargs="+", default=[3, 4, 5, 6, 7, 8])
+    parser.add_argument("--pcs", type=int, nargs="+", default=[6, 9, 12, 15, 19])
+    parser.add_argument("--mode", choices=CLUSTERING_MODES, default="exact")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="process pool size (default: one per CPU, 1 runs in-process)",
+    )
+    parser.add_argument("--silhouette-sample", type=int, default=5_000)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    configure_logging(log_directory=ROOT / "logs", reset_existing=True)
+    logger = get_logger("sweep_clusters")
+    pipeline = RecipeClusteringPipeline(
+        paths=ClusteringPaths(), logger=logger, mode=args.mode
+    )
+    table = pipeline.run_sweep(
+        args.k,
+        args.pcs,
+        max_workers=args.workers,
+        silhouette_sample=args.silhouette_sample,
+    )
+    print(table.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
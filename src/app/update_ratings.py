@@ -0,0 +1,124 @@
+"""Incremental refresh of the rating feature table.
+
+Keeps per-recipe rating statistics in ``data/preprocessed/rating_stats.parquet``
+(see :class:`mangetamain.preprocessing.feature.rating.RatingStatsStore`) and
+re-emits ``rating_table.csv`` / ``rating_summary.csv`` after folding in a
+batch of new interactions, without re-reading the interaction history.
+
+The first run seeds the statistics from ``data/RAW_interactions.csv``; later
+runs only read the new batch. Batches are append-only: pass each one once.
+
+Typical usage
+-------------
+::
+
+    python src/app/update_ratings.py data/new_interactions.csv
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    # Ensure `src` is on sys.path when running as `python src/app/...`
+    sys.path.insert(0, str(ROOT))
+
+import argparse  # noqa: E402
+import logging  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+from app.logging_config import configure_logging, get_logger  # noqa: E402
+from mangetamain.preprocessing.factories import ProcessorFactory  # noqa: E402
+from mangetamain.preprocessing.feature.rating import (  # noqa: E402
+    RatingAnalyser,
+    RatingStatsStore,
+)
+from mangetamain.preprocessing.interfaces import IDataRepository  # noqa: E402
+from mangetamain.preprocessing.repositories import (  # noqa: E402
+    ParquetDataRepository,
+    RepositoryPaths,
+)
+
+RATING_STATS_PATH = "data/preprocessed/rating_stats.parquet"
+
+
+def update_rating_table(
+    new_interactions: str | Path | None,
+    *,
+    repository: IDataRepository,
+    logger: logging.Logger,
+    store_path: str | Path = RATING_STATS_PATH,
+    out_dir: str | Path = "data/preprocessed",
+) -> Path:
+    """Fold a batch into the rating statistics and rewrite the rating table.
+
+    Args:
+        new_interactions: CSV of new interactions (``recipe_id``, ``rating``),
+            or ``None`` to only re-emit the table.
+        repository: Source of the recipes and, when the store is empty, of
+            the interaction history used to seed it.
+        logger: Logger.
+        store_path: Parquet file of the statistics.
+        out_dir: Directory receiving ``rating_table.csv``.
+
+    Returns:
+        Path: Path of the written ``rating_table.csv``.
+    """
+    store = RatingStatsStore(store_path, logger=logger)
+    if not len(store):
+        logger.info("Seeding rating statistics from the interaction history")
+        pair = ProcessorFactory.create_rating(repository, logger=logger).run()
+        store.update(pair.interactions)
+        recipes = pair.recipes
+    else:
+        recipes = repository.load_recipes()
+    if new_interactions is not None:
+        store.update(pd.read_csv(new_interactions))
+    store.save()
+
+    analyser = RatingAnalyser(logger=logger)
+    paths = analyser.generate_report(store.analyze(recipes, analyser=analyser), out_dir)
+    return Path(paths["table_path"])
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Update rating statistics with new interactions."
+    )
+    parser.add_argument(
+        "interactions",
+        nargs="?",
+        default=None,
+        help="CSV of new interactions (omit to only re-emit the table)",
+    )
+    parser.add_argument("--store", default=RATING_STATS_PATH)
+    parser.add_argument("--out-dir", default="data/preprocessed")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    configure_logging(log_directory=ROOT / "logs", reset_existing=True)
+    logger = get_logger("update_ratings")
+    repository = ParquetDataRepository(
+        paths=RepositoryPaths(),
+        cache_dir="data/cache",
+        recipe_usecols=["id", "name"],
+        # Seeding only aggregates ratings: skip the free-text reviews
+        interaction_usecols=["recipe_id", "rating"],
+    )
+    table = update_rating_table(
+        args.interactions,
+        repository=repository,
+        logger=logger,
+        store_path=args.store,
+        out_dir=args.out_dir,
+    )
+    logger.info("Rating table written to %s", table)
+
+
+if __name__ == "__main__":
+    main()
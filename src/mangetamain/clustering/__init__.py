@@ -5,14 +5,22 @@ This submodule mirrors the structure and conventions used in
 ``notebooks/EDA_recipes_clustering.ipynb`` notebook.
 """
 
+from .kmeans import sweep_kmeans
+from .model import ClusteringModel
 from .pipeline import (
+    CLUSTERING_MODES,
     REQUIRED_FEATURES,
     ClusteringPaths,
     RecipeClusteringPipeline,
 )
+from .similarity import RecipeSimilarityIndex
 
 __all__ = [
     "RecipeClusteringPipeline",
     "ClusteringPaths",
     "REQUIRED_FEATURES",
+    "CLUSTERING_MODES",
+    "ClusteringModel",
+    "sweep_kmeans",
+    "RecipeSimilarityIndex",
 ]
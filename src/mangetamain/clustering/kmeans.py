@@ -0,0 +1,217 @@
+"""KMeans fitting and model-selection sweep on projected recipe features.
+
+:func:`fit_kmeans` fits the full-batch or mini-batch KMeans used by
+:class:`~mangetamain.clustering.pipeline.RecipeClusteringPipeline`.
+
+:func:`sweep_kmeans` scores a grid of cluster counts and numbers of leading
+principal components on one already projected matrix, so the features are
+scaled and projected once rather than once per configuration. Every
+configuration is fitted in a process pool; the matrix and the silhouette
+subsample are sent to each worker once, through the pool initializer, and
+every task only receives its ``(n_clusters, n_pcs)`` pair.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from sklearn import config_context
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from threadpoolctl import threadpool_limits
+
+#: Columns of the table returned by :func:`sweep_kmeans`
+SWEEP_COLUMNS = ["n_clusters", "n_pcs", "inertia", "silhouette", "seconds"]
+
+#: Memory (MiB) of the distance blocks computed at once by the silhouette
+SILHOUETTE_WORKING_MEMORY = 64
+
+# Per-process data of the sweep workers, set by _init_sweep_worker
+_SWEEP_DATA: dict[str, np.ndarray] = {}
+
+
+def row_chunks(n_rows: int, size: int) -> list[slice]:
+    """Split ``n_rows`` into contiguous chunks of at least ``size`` rows.
+
+    Rows are spread evenly, so there is no short trailing chunk; a table
+    smaller than ``size`` is a single chunk.
+    """
+    n_chunks = max(1, n_rows // max(1, size))
+    bounds = np.linspace(0, n_rows, n_chunks + 1).astype(int)
+    return [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:], strict=True)]
+
+
+def fit_kmeans(
+    pcs: np.ndarray,
+    n_clusters: int,
+    *,
+    random_state: int = 42,
+    batch_size: int | None = None,
+    passes: int = 1,
+) -> tuple[KMeans | MiniBatchKMeans, np.ndarray]:
+    """Fit KMeans on ``pcs`` and return the model and the row labels.
+
+    Args:
+        pcs: Projected features, one row per recipe.
+        n_clusters: Number of clusters.
+        random_state: Seed of the initialisation.
+        batch_size: ``None`` for full-batch ``KMeans``; otherwise rows per
+            chunk of a ``MiniBatchKMeans``.
+        passes: ``MiniBatchKMeans.partial_fit`` passes over the chunks.
+
+    Returns:
+        tuple[KMeans | MiniBatchKMeans, np.ndarray]: Fitted model and int32
+        labels.
+    """
+    if batch_size is None:
+        model = KMeans(n_clusters=n_clusters, random_state=random_state)
+        return model, model.fit_predict(pcs).astype(np.int32)
+
+    chunks = row_chunks(len(pcs), batch_size)
+    model = MiniBatchKMeans(
+        n_clusters=n_clusters, random_state=random_state, batch_size=batch_size
+    )
+    # partial_fit alone seeds from a single k-means++ draw; fit() on the
+    # first chunk keeps the best of several initialisations
+    model.fit(pcs[chunks[0]])
+    for _ in range(passes):
+        for rows in chunks:
+            model.partial_fit(pcs[rows])
+    labels = np.empty(len(pcs), dtype=np.int32)
+    for rows in chunks:
+        labels[rows] = model.predict(pcs[rows])
+    return model, labels
+
+
+def _init_sweep_worker(
+    pcs: np.ndarray, sample: np.ndarray, threads: int | None
+) -> None:
+    _SWEEP_DATA["pcs"] = pcs
+    _SWEEP_DATA["sample"] = sample
+    if threads is not None:
+        # Workers share the cores: no nested BLAS/OpenMP oversubscription
+        threadpool_limits(limits=threads)
+
+
+def _score_config(
+    n_clusters: int,
+    n_pcs: int,
+    random_state: int,
+    batch_size: int | None,
+    passes: int,
+) -> dict[str, float]:
+    start = time.perf_counter()
+    pcs = _SWEEP_DATA["pcs"][:, :n_pcs]
+    sample = _SWEEP_DATA["sample"]
+    model, labels = fit_kmeans(
+        pcs,
+        n_clusters,
+        random_state=random_state,
+        batch_size=batch_size,
+        passes=passes,
+    )
+    # Mini-batch inertia_ only covers the last batch; score() is exact
+    inertia = model.inertia_ if batch_size is None else -model.score(pcs)
+    sample_labels = labels[sample]
+    if 1 < len(np.unique(sample_labels)) < len(sample):
+        with config_context(working_memory=SILHOUETTE_WORKING_MEMORY):
+            silhouette = silhouette_score(pcs[sample], sample_labels)
+    else:
+        silhouette = np.nan
+    return {
+        "n_clusters": n_clusters,
+        "n_pcs": n_pcs,
+        "inertia": float(inertia),
+        "silhouette": float(silhouette),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def sweep_kmeans(
+    pcs: np.ndarray,
+    n_clusters_grid: Iterable[int],
+    n_pcs_grid: Iterable[int],
+    *,
+    random_state: int = 42,
+    batch_size: int | None = None,
+    passes: int = 1,
+    silhouette_sample: int = 5_000,
+    max_workers: int | None = None,
+    logger: logging.Logger | None = None,
+) -> pd.DataFrame:
+    """Fit and score KMeans for every pair of the two grids.
+
+    Every configuration is scored on the same rows: inertia over all of
+    them and the silhouette over one random subsample shared by all
+    configurations (silhouette is quadratic in the number of rows).
+
+    Args:
+        pcs: Projected features with at least ``max(n_pcs_grid)`` columns,
+            in decreasing order of explained variance.
+        n_clusters_grid: Cluster counts to try (each >= 2).
+        n_pcs_grid: Numbers of leading components to cluster on.
+        random_state: Seed of KMeans and of the silhouette subsample.
+        batch_size: ``None`` for full-batch ``KMeans``, otherwise the chunk
+            size of a ``MiniBatchKMeans`` (see :func:`fit_kmeans`).
+        passes: ``MiniBatchKMeans`` passes over the chunks.
+        silhouette_sample: Rows used for the silhouette score.
+        max_workers: Size of the process pool; ``None`` uses one worker per
+            CPU (at most one per configuration) and ``1`` runs in-process.
+        logger: Optional logger.
+
+    Returns:
+        pd.DataFrame: One row per configuration with :data:`SWEEP_COLUMNS`,
+        sorted by ``n_pcs`` then ``n_clusters``.
+
+    Raises:
+        ValueError: If a grid is empty or out of range.
+    """
+    logger = logger or logging.getLogger("mangetamain.clustering")
+    n_clusters_grid = sorted(set(n_clusters_grid))
+    n_pcs_grid = sorted(set(n_pcs_grid))
+    if not n_clusters_grid or not n_pcs_grid:
+        raise ValueError("Both sweep grids need at least one value")
+    if n_clusters_grid[0] < 2 or n_clusters_grid[-1] > len(pcs):
+        raise ValueError(f"n_clusters must lie in [2, {len(pcs)}]")
+    if n_pcs_grid[0] < 1 or n_pcs_grid[-1] > pcs.shape[1]:
+        raise ValueError(f"n_pcs must lie in [1, {pcs.shape[1]}]")
+
+    rng = np.random.default_rng(random_state)
+    sample = np.sort(
+        rng.choice(len(pcs), size=min(silhouette_sample, len(pcs)), replace=False)
+    )
+    pcs = np.ascontiguousarray(pcs[:, : n_pcs_grid[-1]])
+    configs = list(product(n_clusters_grid, n_pcs_grid))
+    args = [(k, n_pcs, random_state, batch_size, passes) for k, n_pcs in configs]
+
+    cpus = os.cpu_count() or 1
+    workers = max_workers or min(cpus, len(configs))
+    logger.info(
+        "Sweeping %d KMeans configurations on %d rows with %d worker(s)",
+        len(configs),
+        len(pcs),
+        workers,
+    )
+    if workers <= 1:
+        _init_sweep_worker(pcs, sample, None)
+        try:
+            rows = [_score_config(*a) for a in args]
+        finally:
+            _SWEEP_DATA.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_sweep_worker,
+            initargs=(pcs, sample, max(1, cpus // workers)),
+        ) as pool:
+            rows = list(pool.map(_score_config, *zip(*args, strict=True)))
+
+    table = pd.DataFrame(rows, columns=SWEEP_COLUMNS)
+    return table.sort_values(["n_pcs", "n_clusters"], ignore_index=True)
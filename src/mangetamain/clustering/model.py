@@ -0,0 +1,185 @@
+"""Persisted clustering model for labelling new recipes.
+
+:class:`ClusteringModel` bundles the ``StandardScaler``, PCA and KMeans
+fitted by :class:`~mangetamain.clustering.pipeline.RecipeClusteringPipeline`
+with the feature order and clustering parameters. It is saved with
+``joblib`` as a versioned artefact next to the clustering CSV, so new
+recipes are projected and labelled without refitting on the corpus.
+
+Scaling followed by PCA is affine, so :meth:`ClusteringModel.transform`
+applies it as one matrix product and :meth:`ClusteringModel.predict` picks
+the nearest KMeans centre in numpy; a single recipe is labelled in well
+under a millisecond instead of going through three scikit-learn estimators.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+#: Bumped whenever the layout of the saved payload changes
+MODEL_FORMAT_VERSION = 1
+
+
+@dataclass
+class ClusteringModel:
+    """Fitted scaler, PCA and KMeans of one clustering run.
+
+    Attributes:
+        scaler: Fitted ``StandardScaler`` (or any estimator exposing
+            ``mean_`` and ``scale_``).
+        pca: Fitted ``PCA`` or ``IncrementalPCA`` (not whitened).
+        kmeans: Fitted ``KMeans`` or ``MiniBatchKMeans``.
+        features: Feature columns, in the order the estimators were fitted on.
+        n_pcs_for_kmeans: Number of leading components KMeans was fitted on.
+        metadata: Free-form provenance (mode, row count, seed...).
+    """
+
+    scaler: Any
+    pca: Any
+    kmeans: Any
+    features: Sequence[str]
+    n_pcs_for_kmeans: int
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.features = tuple(self.features)
+        # Scaling + PCA as one affine map: pcs = x @ weights - offset
+        components = np.asarray(self.pca.components_, dtype=float)
+        scale = np.asarray(self.scaler.scale_, dtype=float)
+        centre = np.asarray(self.scaler.mean_, dtype=float) / scale + self.pca.mean_
+        self._weights = (components / scale).T
+        self._offset = centre @ components.T
+        self._centres = np.asarray(self.kmeans.cluster_centers_, dtype=float)
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self._centres)
+
+    def _matrix(self, features_df: pd.DataFrame) -> np.ndarray:
+        missing = [c for c in self.features if c not in features_df.columns]
+        if missing:
+            raise ValueError(f"Missing required variables: {missing}")
+        matrix = features_df[list(self.features)].to_numpy(dtype=float)
+        if np.isnan(matrix).any():
+            raise ValueError("Features contain missing values")
+        return matrix
+
+    def transform(self, features_df: pd.DataFrame) -> np.ndarray:
+        """Project recipes onto the fitted principal components.
+
+        Args:
+            features_df: One row per recipe holding every column of
+                :attr:`features`; extra columns are ignored.
+
+        Returns:
+            np.ndarray: Principal components, one row per recipe.
+
+        Raises:
+            ValueError: If a feature is missing or has missing values.
+        """
+        return self._matrix(features_df) @ self._weights - self._offset
+
+    def predict(self, features_df: pd.DataFrame) -> pd.DataFrame:
+        """Assign clusters and the first two components to new recipes.
+
+        Args:
+            features_df: One row per recipe holding every column of
+                :attr:`features`; extra columns are ignored.
+
+        Returns:
+            pd.DataFrame: Indexed like ``features_df`` with ``cluster``,
+            ``pc_1`` and ``pc_2`` (the layout of the clustering CSV).
+
+        Raises:
+            ValueError: If a feature is missing or has missing values.
+        """
+        pcs = self.transform(features_df)
+        subset = pcs[:, : self.n_pcs_for_kmeans]
+        # Squared distances without the per-row constant ||x||²
+        distances = (self._centres**2).sum(axis=1) - 2 * subset @ self._centres.T
+        return pd.DataFrame(
+            {
+                "cluster": distances.argmin(axis=1).astype(np.int32),
+                "pc_1": pcs[:, 0],
+                "pc_2": pcs[:, 1],
+            },
+            index=features_df.index,
+        )
+
+    def save(self, path: str | Path) -> Path:
+        """Write the model to ``path`` (atomic replace) and return it."""
+        path = Path(path)
+        payload = {
+            "format_version": MODEL_FORMAT_VERSION,
+            "sklearn_version": sklearn.__version__,
+            "saved_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "features": list(self.features),
+            "n_pcs_for_kmeans": self.n_pcs_for_kmeans,
+            "metadata": self.metadata,
+            "scaler": self.scaler,
+            "pca": self.pca,
+            "kmeans": self.kmeans,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        joblib.dump(payload, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(
+        cls, path: str | Path, *, logger: logging.Logger | None = None
+    ) -> ClusteringModel:
+        """Load a model written by :meth:`save`.
+
+        Args:
+            path: Model file.
+            logger: Optional logger, warned when the model was saved with
+                another scikit-learn version.
+
+        Returns:
+            ClusteringModel: The persisted model.
+
+        Raises:
+            FileNotFoundError: If ``path`` does not exist.
+            ValueError: If the file is not a clustering model of the current
+                format version.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Clustering model not found: {path}")
+        payload = joblib.load(path)
+        if (
+            not isinstance(payload, dict)
+            or payload.get("format_version") != MODEL_FORMAT_VERSION
+        ):
+            raise ValueError(
+                f"{path} is not a clustering model of format version "
+                f"{MODEL_FORMAT_VERSION}; re-run the clustering pipeline"
+            )
+        if payload["sklearn_version"] != sklearn.__version__:
+            (logger or logging.getLogger(__name__)).warning(
+                "Clustering model %s was saved with scikit-learn %s (running %s)",
+                path,
+                payload["sklearn_version"],
+                sklearn.__version__,
+            )
+        return cls(
+            scaler=payload["scaler"],
+            pca=payload["pca"],
+            kmeans=payload["kmeans"],
+            features=payload["features"],
+            n_pcs_for_kmeans=payload["n_pcs_for_kmeans"],
+            metadata={**payload["metadata"], "saved_at": payload["saved_at"]},
+        )
@@ -5,11 +5,32 @@ analysers (nutrition, seasonality, rating, steps/complexity, ingredients),
 validates the presence of required columns, and runs a dimensionality
 reduction and clustering workflow that mirrors the team notebooks:
 
-- merges inputs on recipe index,
+- aligns inputs on recipe index through the
+  :class:`~mangetamain.preprocessing.feature_store.FeatureStore`, reading
+  only the clustered columns,
 - standardizes selected variables,
 - computes PCA with as many components as features,
 - applies KMeans to the first N principal components,
-- exports a compact CSV with ``cluster``, ``pc_1`` and ``pc_2`` per recipe.
+- exports a compact CSV with ``cluster``, ``pc_1`` and ``pc_2`` per recipe,
+  and the fitted models as a :class:`~mangetamain.clustering.model.ClusteringModel`
+  so new recipes can be labelled without refitting,
+- indexes the first principal components in a
+  :class:`~mangetamain.clustering.similarity.RecipeSimilarityIndex` for
+  "recipes similar to X" queries.
+
+:meth:`RecipeClusteringPipeline.run_sweep` compares other cluster counts and
+numbers of components (see :func:`~mangetamain.clustering.kmeans.sweep_kmeans`).
+
+The default ``"exact"`` mode fits ``PCA`` and ``KMeans`` on the whole table.
+The ``"minibatch"`` mode feeds row chunks of the merged table through
+``StandardScaler.partial_fit``, ``IncrementalPCA`` and ``MiniBatchKMeans``,
+so the fits only copy one chunk of the features at a time instead of
+building the whole scaled matrix. The merged table itself is still loaded
+in full (only the clustered columns and the name, see
+:class:`~mangetamain.preprocessing.feature_store.FeatureStore`), as is the
+array of kept principal components of every row, which the labels and the
+similarity index need. Its clusters closely agree with the exact ones (see
+``scripts/benchmark.py clustering``).
 
 See :class:`RecipeClusteringPipeline` for the public API.
 """
@@ -21,11 +42,17 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 from sklearn.preprocessing import StandardScaler
 
+from ..preprocessing.feature_store import FeatureStore
+from .kmeans import fit_kmeans, row_chunks, sweep_kmeans
+from .model import ClusteringModel
+from .similarity import RecipeSimilarityIndex
+
 # Variables to use, strictly matching the notebook selection order
 REQUIRED_FEATURES: list[str] = [
     "energy_density",
@@ -49,6 +76,20 @@ REQUIRED_FEATURES: list[str] = [
     "score_western_exotic",
 ]
 
+#: Fitting modes of :class:`RecipeClusteringPipeline`
+CLUSTERING_MODES: tuple[str, ...] = ("exact", "minibatch")
+
+BACKUP_NUTRITION = Path("data/preprocessed/backup/features_nutrition.csv")
+
+
+def read_feature_table(path: Path) -> pd.DataFrame:
+    """Read an analyser feature CSV indexed by recipe id (first column).
+
+    The backup nutrition table is ``;``-separated, as in the notebooks.
+    """
+    delimiter = ";" if Path(path) == BACKUP_NUTRITION else None
+    return pd.read_csv(path, delimiter=delimiter, index_col=0)
+
 
 @dataclass(frozen=True)
 class ClusteringPaths:
@@ -62,6 +103,7 @@ class ClusteringPaths:
     rating: str = "rating_table.csv"
     complexity: str = "complexity_table.csv"
     ingredients: str = "ingredients_table.csv"
+    feature_store: str = "feature_store"
 
     def input_paths(self) -> dict[str, Path]:
         if not self.base.exists():
@@ -85,21 +127,49 @@ class ClusteringPaths:
             "ingredients": self.base / self.ingredients,
         }
 
+    def feature_store_dir(self) -> Path:
+        return self.base / self.feature_store
+
     def output_csv(self) -> Path:
         return self.out_dir / "recipes_clustering_with_pca.csv"
 
+    def model_path(self) -> Path:
+        return self.out_dir / "recipes_clustering_model.joblib"
+
+    def similarity_index_path(self) -> Path:
+        return self.out_dir / "recipes_similarity_index.joblib"
+
+    def sweep_csv(self) -> Path:
+        return self.out_dir / "clustering_sweep.csv"
+
 
 class RecipeClusteringPipeline:
     """Compute PCA and KMeans clustering from preprocessed feature CSVs.
 
     This reproduces the notebook logic:
-      - merge inputs on index
+      - merge inputs on index (through the feature store)
       - StandardScaler on REQUIRED_FEATURES
       - PCA with n_components = len(REQUIRED_FEATURES)
       - KMeans(n_clusters=5, random_state=42) on first 12 PCs
       - Output dataframe with per-recipe cluster, pc_1, pc_2
+
+    Args:
+        paths: Input and output locations.
+        logger: Optional logger.
+        n_clusters: Number of KMeans clusters.
+        random_state: Seed of the KMeans initialisation.
+        n_pcs_for_kmeans: Number of leading principal components clustered.
+        mode: ``"exact"`` for full-batch ``PCA`` + ``KMeans`` (notebook
+            behaviour) or ``"minibatch"`` for ``IncrementalPCA`` +
+            ``MiniBatchKMeans`` over row chunks.
+        batch_size: Rows per chunk in ``"minibatch"`` mode.
+        n_pcs_for_similarity: Number of leading principal components indexed
+            for :meth:`most_similar`.
     """
 
+    #: Passes of ``MiniBatchKMeans.partial_fit`` over the chunks
+    MINIBATCH_PASSES: int = 1
+
     def __init__(
         self,
         *,
@@ -108,17 +178,44 @@ class RecipeClusteringPipeline:
         n_clusters: int = 5,
         random_state: int = 42,
         n_pcs_for_kmeans: int = 12,
+        mode: str = "exact",
+        batch_size: int = 10_000,
+        n_pcs_for_similarity: int = 12,
     ) -> None:
+        if mode not in CLUSTERING_MODES:
+            raise ValueError(
+                f"Unknown clustering mode {mode!r}, expected one of {CLUSTERING_MODES}"
+            )
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
         self.paths = paths or ClusteringPaths()
         self.logger = logger or logging.getLogger("mangetamain.clustering")
         self.n_clusters = n_clusters
         self.random_state = random_state
         self.n_pcs_for_kmeans = n_pcs_for_kmeans
+        self.mode = mode
+        self.batch_size = batch_size
+        self.n_pcs_for_similarity = n_pcs_for_similarity
+        self._model: ClusteringModel | None = None
+        self._similarity_index: RecipeSimilarityIndex | None = None
 
     # ---- public API -----------------------------------------------------
+    @property
+    def model(self) -> ClusteringModel | None:
+        """Model fitted by the last :meth:`cluster` / :meth:`run` call."""
+        return self._model
+
+    @property
+    def similarity_index(self) -> RecipeSimilarityIndex | None:
+        """Similarity index built by the last :meth:`cluster` / :meth:`run` call."""
+        return self._similarity_index
+
     def run(self) -> pd.DataFrame:
         """Execute the full clustering pipeline and save the CSV output.
 
+        The fitted models are saved to :meth:`ClusteringPaths.model_path` and
+        the similarity index to :meth:`ClusteringPaths.similarity_index_path`.
+
         Returns:
             pd.DataFrame: DataFrame indexed by recipe id with columns:
                 - name (if available)
@@ -127,16 +224,161 @@ class RecipeClusteringPipeline:
                 - pc_2 (float)
         """
         df = self._load_merge_inputs()
-        self._validate_features(df, REQUIRED_FEATURES)
+        result = self.cluster(df)
+        self._save_output(result)
+        self._model.save(self.paths.model_path())
+        self._similarity_index.save(self.paths.similarity_index_path())
+        return result
 
-        pca_df, pca_model = self._compute_pca(df[REQUIRED_FEATURES])
-        pcs_subset = pca_df.iloc[:, : self.n_pcs_for_kmeans]
-        clusters = self._fit_predict_kmeans(pcs_subset)
+    def cluster(self, recipes: pd.DataFrame) -> pd.DataFrame:
+        """Run PCA and KMeans on an already merged feature table.
 
-        result = self._build_result(df, pca_df, clusters)
-        self._save_output(result)
+        Args:
+            recipes: Merged table holding every column of REQUIRED_FEATURES.
+
+        Returns:
+            pd.DataFrame: Same layout as :meth:`run`, without writing it.
+
+        Raises:
+            ValueError: If a required feature is missing.
+        """
+        self._validate_features(recipes, REQUIRED_FEATURES)
+        if self.mode == "minibatch":
+            pca_df, clusters, estimators = self._fit_predict_minibatch(recipes)
+        else:
+            pca_df, scaler, pca = self._compute_pca(recipes[REQUIRED_FEATURES])
+            pcs_subset = pca_df.iloc[:, : self.n_pcs_for_kmeans]
+            clusters, kmeans = self._fit_predict_kmeans(pcs_subset)
+            estimators = (scaler, pca, kmeans)
+        self._model = ClusteringModel(
+            *estimators,
+            features=REQUIRED_FEATURES,
+            n_pcs_for_kmeans=self.n_pcs_for_kmeans,
+            metadata={
+                "mode": self.mode,
+                "n_recipes": len(recipes),
+                "n_clusters": self.n_clusters,
+                "random_state": self.random_state,
+            },
+        )
+        result = self._build_result(recipes, pca_df, clusters)
+        self._similarity_index = RecipeSimilarityIndex.from_frame(
+            pca_df,
+            self.n_pcs_for_similarity,
+            names=result["name"].to_numpy() if "name" in result else None,
+            clusters=clusters.to_numpy(),
+        )
         return result
 
+    def most_similar(self, recipe_id: object, k: int = 10) -> pd.DataFrame:
+        """Return the ``k`` clustered recipes closest to ``recipe_id``.
+
+        Uses the index of the last :meth:`cluster` / :meth:`run` call, or
+        loads the one saved at :meth:`ClusteringPaths.similarity_index_path`.
+        See :meth:`RecipeSimilarityIndex.most_similar`.
+
+        Raises:
+            FileNotFoundError: If no index was built or saved.
+            KeyError: If ``recipe_id`` is not indexed.
+            ValueError: If ``k`` is not positive.
+        """
+        if self._similarity_index is None:
+            self._similarity_index = RecipeSimilarityIndex.load(
+                self.paths.similarity_index_path()
+            )
+        return self._similarity_index.most_similar(recipe_id, k)
+
+    def predict(self, features_df: pd.DataFrame) -> pd.DataFrame:
+        """Label new recipes with the fitted or persisted clustering model.
+
+        Uses the model of the last :meth:`cluster` / :meth:`run` call, or
+        loads the one saved at :meth:`ClusteringPaths.model_path`.
+
+        Args:
+            features_df: One row per new recipe holding REQUIRED_FEATURES.
+
+        Returns:
+            pd.DataFrame: ``cluster``, ``pc_1`` and ``pc_2`` per recipe.
+
+        Raises:
+            FileNotFoundError: If no model was fitted or saved.
+        """
+        if self._model is None:
+            self._model = ClusteringModel.load(
+                self.paths.model_path(), logger=self.logger
+            )
+        return self._model.predict(features_df)
+
+    def sweep(
+        self,
+        recipes: pd.DataFrame,
+        n_clusters_grid: Iterable[int],
+        n_pcs_grid: Iterable[int],
+        *,
+        max_workers: int | None = None,
+        silhouette_sample: int = 5_000,
+    ) -> pd.DataFrame:
+        """Score KMeans over a grid of cluster counts and component counts.
+
+        The features are scaled and projected once, in the pipeline's mode,
+        then every configuration is fitted in a process pool.
+
+        Args:
+            recipes: Merged table holding every column of REQUIRED_FEATURES.
+            n_clusters_grid: Cluster counts to try.
+            n_pcs_grid: Numbers of leading principal components to try.
+            max_workers: Process pool size (``1`` runs in-process).
+            silhouette_sample: Rows used for the silhouette score.
+
+        Returns:
+            pd.DataFrame: ``n_clusters``, ``n_pcs``, ``inertia``,
+            ``silhouette`` and ``seconds`` per configuration.
+
+        Raises:
+            ValueError: If a required feature is missing or a grid is out of
+                range.
+        """
+        self._validate_features(recipes, REQUIRED_FEATURES)
+        n_pcs_grid = list(n_pcs_grid)
+        n_kept = min(len(REQUIRED_FEATURES), max(n_pcs_grid, default=1))
+        minibatch = self.mode == "minibatch"
+        if minibatch:
+            pcs, _, _ = self._project_minibatch(recipes, n_kept)
+        else:
+            pca_df, _, _ = self._compute_pca(recipes[REQUIRED_FEATURES])
+            pcs = pca_df.to_numpy()
+        return sweep_kmeans(
+            pcs,
+            n_clusters_grid,
+            n_pcs_grid,
+            random_state=self.random_state,
+            batch_size=self.batch_size if minibatch else None,
+            passes=self.MINIBATCH_PASSES,
+            silhouette_sample=silhouette_sample,
+            max_workers=max_workers,
+            logger=self.logger,
+        )
+
+    def run_sweep(
+        self,
+        n_clusters_grid: Iterable[int],
+        n_pcs_grid: Iterable[int],
+        **kwargs: object,
+    ) -> pd.DataFrame:
+        """Run :meth:`sweep` on the feature CSVs and save the comparison table.
+
+        The table is written to :meth:`ClusteringPaths.sweep_csv`; keyword
+        arguments are passed to :meth:`sweep`.
+        """
+        table = self.sweep(
+            self._load_merge_inputs(), n_clusters_grid, n_pcs_grid, **kwargs
+        )
+        out_path = self.paths.sweep_csv()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        table.to_csv(out_path, index=False)
+        self.logger.info("Clustering sweep written to %s", out_path)
+        return table
+
     # ---- steps ----------------------------------------------------------
     def _load_merge_inputs(self) -> pd.DataFrame:
         paths = self.paths.input_paths()
@@ -144,45 +386,13 @@ class RecipeClusteringPipeline:
             if not p.exists():
                 raise FileNotFoundError(f"Missing input file for {key}: {p}")
 
-        # Respect notebook logic: read as CSV, merge by index
-        nutrition = pd.read_csv(
-            paths["nutrition"],
-            delimiter=(
-                ";"
-                if paths["nutrition"]
-                == Path("data/preprocessed/backup/features_nutrition.csv")
-                else None
-            ),
-            index_col=0,
-        )
-        seasonal = pd.read_csv(paths["seasonality"], index_col=0)
-        rating = pd.read_csv(paths["rating"], index_col=0)
-        complexity = pd.read_csv(paths["complexity"], index_col=0)
-        ingredients = pd.read_csv(paths["ingredients"], index_col=0)
-
-        recipes = (
-            nutrition.merge(seasonal, left_index=True, right_index=True)
-            .merge(rating, left_index=True, right_index=True)
-            .merge(complexity, left_index=True, right_index=True)
-            .merge(ingredients, left_index=True, right_index=True)
-        )
-
-        # Normalize name column to a single canonical column if present
-        if "name" in recipes.columns:
-            recipes.rename(columns={"name": "name"}, inplace=True)
-        elif "name_x" in recipes.columns:
-            recipes.rename(columns={"name_x": "name"}, inplace=True)
-
-        self.logger.debug(
-            "Merged input shapes: %s",
-            {
-                "nutrition": nutrition.shape,
-                "seasonal": seasonal.shape,
-                "rating": rating.shape,
-                "complexity": complexity.shape,
-                "ingredients": ingredients.shape,
-            },
-        )
+        # Inner join on the recipe index, rows in nutrition order as in the
+        # notebook; only the clustered columns and the name are decoded
+        store = FeatureStore(self.paths.feature_store_dir(), logger=self.logger)
+        store.ensure_all(paths, read_feature_table)
+        available = {c for group in paths for c in store.columns(group)}
+        columns = [c for c in [*REQUIRED_FEATURES, "name"] if c in available]
+        recipes = store.read(list(paths), columns=columns)
         self.logger.info("Merged recipes shape: %s", recipes.shape)
         return recipes
 
@@ -191,7 +401,9 @@ class RecipeClusteringPipeline:
         if missing:
             raise ValueError(f"Missing required variables: {missing}")
 
-    def _compute_pca(self, features_df: pd.DataFrame) -> tuple[pd.DataFrame, PCA]:
+    def _compute_pca(
+        self, features_df: pd.DataFrame
+    ) -> tuple[pd.DataFrame, StandardScaler, PCA]:
         scaler = StandardScaler()
         features_scaled = scaler.fit_transform(features_df)
         pca = PCA(n_components=features_df.shape[1])
@@ -203,15 +415,71 @@ class RecipeClusteringPipeline:
             columns=pca_cols,
             index=features_df.index,
         )
-        return pca_df, pca
+        return pca_df, scaler, pca
+
+    def _fit_predict_kmeans(self, pca_subset: pd.DataFrame) -> tuple[pd.Series, KMeans]:
+        model, labels = fit_kmeans(
+            pca_subset.to_numpy(),
+            self.n_clusters,
+            random_state=self.random_state,
+        )
+        return pd.Series(labels, index=pca_subset.index, name="cluster"), model
 
-    def _fit_predict_kmeans(self, pca_subset: pd.DataFrame) -> pd.Series:
-        model = KMeans(
-            n_clusters=self.n_clusters,
+    def _project_minibatch(
+        self, recipes: pd.DataFrame, n_kept: int
+    ) -> tuple[np.ndarray, StandardScaler, IncrementalPCA]:
+        """Scale and project ``recipes`` chunk by chunk.
+
+        ``recipes`` is already in memory; only one chunk of its feature
+        columns is copied and scaled at a time. The returned array holds the
+        first ``n_kept`` principal components of every row (allocated up
+        front), with the fitted scaler and ``IncrementalPCA``.
+        """
+        n_rows, n_features = len(recipes), len(REQUIRED_FEATURES)
+        # IncrementalPCA needs as many rows per chunk as components
+        chunks = row_chunks(n_rows, max(self.batch_size, n_features))
+        positions = recipes.columns.get_indexer(REQUIRED_FEATURES)
+
+        def features(rows: slice) -> np.ndarray:
+            return recipes.iloc[rows, positions].to_numpy(dtype=float)
+
+        scaler = StandardScaler()
+        for rows in chunks:
+            scaler.partial_fit(features(rows))
+        pca = IncrementalPCA(n_components=n_features)
+        for rows in chunks:
+            pca.partial_fit(scaler.transform(features(rows)))
+
+        pcs = np.empty((n_rows, n_kept))
+        for rows in chunks:
+            pcs[rows] = pca.transform(scaler.transform(features(rows)))[:, :n_kept]
+        self.logger.info("Incremental PCA: %d rows in %d chunks", n_rows, len(chunks))
+        return pcs, scaler, pca
+
+    def _fit_predict_minibatch(
+        self, recipes: pd.DataFrame
+    ) -> tuple[pd.DataFrame, pd.Series, tuple]:
+        # Keep only the components that are clustered, indexed or exported
+        n_kept = min(
+            len(REQUIRED_FEATURES),
+            max(2, self.n_pcs_for_kmeans, self.n_pcs_for_similarity),
+        )
+        pcs, scaler, pca = self._project_minibatch(recipes, n_kept)
+        kmeans, labels = fit_kmeans(
+            pcs[:, : self.n_pcs_for_kmeans],
+            self.n_clusters,
             random_state=self.random_state,
+            batch_size=self.batch_size,
+            passes=self.MINIBATCH_PASSES,
+        )
+
+        pca_df = pd.DataFrame(
+            pcs,
+            columns=[f"PC{i+1}" for i in range(n_kept)],
+            index=recipes.index,
         )
-        labels = model.fit_predict(pca_subset)
-        return pd.Series(labels, index=pca_subset.index, name="cluster")
+        clusters = pd.Series(labels, index=recipes.index, name="cluster")
+        return pca_df, clusters, (scaler, pca, kmeans)
 
     def _build_result(
         self, recipes: pd.DataFrame, pca_df: pd.DataFrame, clusters: pd.Series
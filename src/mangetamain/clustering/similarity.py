@@ -0,0 +1,203 @@
+"""Nearest-neighbour recipe similarity over the clustering PCA space.
+
+:class:`RecipeSimilarityIndex` holds a ``KDTree`` over the first principal
+components of every recipe, as computed by
+:class:`~mangetamain.clustering.pipeline.RecipeClusteringPipeline`, and
+answers "recipes similar to X" queries with :meth:`most_similar`. Similarity
+is the Euclidean distance between standardized, PCA-projected features.
+
+A KD-tree suits the low-dimensional PCA space: a query on the full corpus
+(about 230k recipes, 12 components) visits a few leaves instead of scanning
+every recipe and answers in about a millisecond. The index is saved with
+``joblib``, tree included, next to ``recipes_clustering_with_pca.csv`` so
+it is built once per clustering run.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Hashable
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+#: Bumped whenever the layout of the saved payload changes
+INDEX_FORMAT_VERSION = 1
+
+
+class RecipeSimilarityIndex:
+    """KD-tree over the principal components of the clustered recipes.
+
+    Args:
+        recipe_ids: Recipe id of every row of ``components``.
+        components: Leading principal components, one row per recipe.
+        names: Optional recipe names, aligned with ``recipe_ids``.
+        clusters: Optional cluster labels, aligned with ``recipe_ids``.
+        leaf_size: ``KDTree`` leaf size.
+        tree: Already built ``KDTree`` over ``components`` (used by
+            :meth:`load`); built here when omitted.
+
+    Raises:
+        ValueError: If the inputs are not aligned or ids are duplicated.
+    """
+
+    def __init__(
+        self,
+        recipe_ids: pd.Index | np.ndarray,
+        components: np.ndarray,
+        *,
+        names: np.ndarray | None = None,
+        clusters: np.ndarray | None = None,
+        leaf_size: int = 40,
+        tree: KDTree | None = None,
+    ) -> None:
+        self.recipe_ids = pd.Index(recipe_ids, name="id")
+        if not self.recipe_ids.is_unique:
+            raise ValueError("Recipe ids of a similarity index must be unique")
+        components = np.ascontiguousarray(components, dtype=float)
+        if components.ndim != 2 or len(components) != len(self.recipe_ids):
+            raise ValueError("components must have one row per recipe id")
+        self.names = None if names is None else np.asarray(names, dtype=object)
+        self.clusters = None if clusters is None else np.asarray(clusters)
+        for values in (self.names, self.clusters):
+            if values is not None and len(values) != len(self.recipe_ids):
+                raise ValueError("names and clusters must have one value per recipe")
+        self.leaf_size = leaf_size
+        if tree is None:
+            tree = KDTree(components, leaf_size=leaf_size)
+        self._tree = tree
+
+    @classmethod
+    def from_frame(
+        cls, pca_df: pd.DataFrame, n_components: int, **kwargs: object
+    ) -> RecipeSimilarityIndex:
+        """Build the index from the first ``n_components`` columns of ``pca_df``.
+
+        Args:
+            pca_df: Principal components indexed by recipe id.
+            n_components: Number of leading components indexed.
+            **kwargs: ``names``, ``clusters`` or ``leaf_size``.
+        """
+        return cls(pca_df.index, pca_df.to_numpy()[:, :n_components], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    @property
+    def n_components(self) -> int:
+        return self._tree.data.shape[1]
+
+    def _rows(self, recipe_id: Hashable) -> int:
+        row = self.recipe_ids.get_indexer([recipe_id])[0]
+        if row < 0:
+            raise KeyError(f"Unknown recipe id: {recipe_id!r}")
+        return row
+
+    def _frame(self, rows: np.ndarray, distances: np.ndarray) -> pd.DataFrame:
+        out = pd.DataFrame({"distance": distances}, index=self.recipe_ids[rows])
+        if self.names is not None:
+            out.insert(0, "name", self.names[rows])
+        if self.clusters is not None:
+            out["cluster"] = self.clusters[rows]
+        return out
+
+    def most_similar(self, recipe_id: Hashable, k: int = 10) -> pd.DataFrame:
+        """Return the ``k`` recipes closest to ``recipe_id``, nearest first.
+
+        Args:
+            recipe_id: Id of an indexed recipe; it is excluded from the
+                results.
+            k: Number of neighbours.
+
+        Returns:
+            pd.DataFrame: Indexed by recipe id with ``distance`` and, when
+            known, ``name`` and ``cluster``.
+
+        Raises:
+            KeyError: If ``recipe_id`` is not indexed.
+            ValueError: If ``k`` is not positive.
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        row = self._rows(recipe_id)
+        k = min(k, len(self) - 1)
+        query = np.asarray(self._tree.data[row : row + 1])
+        distances, rows = self._tree.query(query, k=k + 1)
+        distances, rows = distances[0], rows[0]
+        # The recipe itself, or an exact duplicate in its place, is dropped
+        keep = rows != row
+        if keep.all():
+            keep[-1] = False
+        return self._frame(rows[keep], distances[keep])
+
+    def query(self, components: np.ndarray, k: int = 10) -> list[pd.DataFrame]:
+        """Return the ``k`` indexed recipes closest to each projected vector.
+
+        Args:
+            components: Principal components of recipes that may be absent
+                from the index (e.g. from ``ClusteringModel.transform``); extra
+                trailing components are ignored.
+            k: Number of neighbours per vector.
+
+        Returns:
+            list[pd.DataFrame]: One :meth:`most_similar`-like frame per row.
+
+        Raises:
+            ValueError: If ``k`` is not positive.
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        components = np.atleast_2d(components)[:, : self.n_components]
+        distances, rows = self._tree.query(components, k=min(k, len(self)))
+        return [self._frame(r, d) for r, d in zip(rows, distances, strict=True)]
+
+    def save(self, path: str | Path) -> Path:
+        """Write the index to ``path`` (atomic replace) and return it."""
+        path = Path(path)
+        payload = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "recipe_ids": self.recipe_ids.to_numpy(),
+            "names": self.names,
+            "clusters": self.clusters,
+            "leaf_size": self.leaf_size,
+            "tree": self._tree,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        joblib.dump(payload, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> RecipeSimilarityIndex:
+        """Load an index written by :meth:`save`, without rebuilding the tree.
+
+        Raises:
+            FileNotFoundError: If ``path`` does not exist.
+            ValueError: If the file is not a similarity index of the current
+                format version.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Similarity index not found: {path}")
+        payload = joblib.load(path)
+        if (
+            not isinstance(payload, dict)
+            or payload.get("format_version") != INDEX_FORMAT_VERSION
+        ):
+            raise ValueError(
+                f"{path} is not a similarity index of format version "
+                f"{INDEX_FORMAT_VERSION}; re-run the clustering pipeline"
+            )
+        tree = payload["tree"]
+        return cls(
+            payload["recipe_ids"],
+            np.asarray(tree.data),
+            names=payload["names"],
+            clusters=payload["clusters"],
+            leaf_size=payload["leaf_size"],
+            tree=tree,
+        )
@@ -0,0 +1,17 @@
+"""Orchestration helpers for the end-to-end pipeline.
+
+Provides a small dependency-aware executor used by ``app/run_all.py`` to run
+independent preprocessing stages concurrently before clustering, and a
+content-hash cache letting unchanged stages be skipped on re-runs.
+"""
+
+from .cache import StageCache, object_params
+from .executor import DAGExecutor, Stage, StageExecutionError
+
+__all__ = [
+    "DAGExecutor",
+    "StageCache",
+    "object_params",
+    "Stage",
+    "StageExecutionError",
+]
@@ -0,0 +1,175 @@
+"""Content-hash cache deciding whether a pipeline stage can be skipped.
+
+A stage fingerprint combines:
+
+- the stage name, its declared parameters and the package version,
+- the SHA-256 of every source file the stage reads,
+- the content of its upstream results (file hash when a result is a path).
+
+When the fingerprint recorded in the manifest matches and the recorded
+result still exists on disk, the stage is skipped and its previous result is
+reused. Hashing upstream *results* rather than upstream fingerprints means a
+forced re-run that produces identical files does not invalidate dependents.
+
+File digests are memoized in the manifest by ``(size, mtime)`` so unchanged
+multi-hundred-megabyte RAW files are not re-hashed on every run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+from .. import __version__
+from ..preprocessing.cache import file_sha256
+
+MANIFEST_FORMAT_VERSION = 1
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+
+def object_params(obj: object) -> dict[str, object]:
+    """Return the public, JSON-serialisable attributes of ``obj``.
+
+    Used to fingerprint configured analysers and pipelines, e.g.
+    ``cluster_threshold`` or ``n_pca_components``.
+    """
+    return {
+        key: value
+        for key, value in sorted(vars(obj).items())
+        if not key.startswith("_") and isinstance(value, _SIMPLE_TYPES)
+    }
+
+
+class StageCache:
+    """JSON manifest of stage fingerprints and results.
+
+    Args:
+        manifest_path: Location of the manifest file.
+        logger: Optional logger.
+    """
+
+    def __init__(
+        self,
+        manifest_path: str | Path,
+        *,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.manifest_path = Path(manifest_path)
+        self.logger = logger or logging.getLogger("mangetamain.orchestration")
+        self._manifest = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        empty: dict[str, dict] = {"stages": {}, "files": {}}
+        if not self.manifest_path.exists():
+            return empty
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.logger.warning("Ignoring unreadable manifest %s", self.manifest_path)
+            return empty
+        if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+            return empty
+        return {"stages": manifest["stages"], "files": manifest["files"]}
+
+    def _save(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"format_version": MANIFEST_FORMAT_VERSION, **self._manifest}
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    # ---- fingerprints -------------------------------------------------------
+    def file_digest(self, path: str | Path) -> str:
+        """Return the SHA-256 of ``path``, memoized by size and mtime."""
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+        known = self._manifest["files"].get(key)
+        if (
+            known
+            and known["size"] == stat.st_size
+            and known["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return known["sha256"]
+        digest = file_sha256(path)
+        self._manifest["files"][key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+        }
+        return digest
+
+    def _result_digest(self, result: object) -> object:
+        if isinstance(result, Path):
+            return self.file_digest(result) if result.exists() else None
+        return _encode(result)
+
+    def fingerprint(
+        self,
+        name: str,
+        params: Mapping[str, object],
+        sources: tuple[str, ...],
+        upstream: Mapping[str, object],
+    ) -> str:
+        """Return the fingerprint of a stage given its upstream results."""
+        payload = {
+            "stage": name,
+            "version": __version__,
+            "params": params,
+            "sources": {src: self.file_digest(src) for src in sources},
+            "upstream": {
+                dep: self._result_digest(result)
+                for dep, result in sorted(upstream.items())
+            },
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    # ---- lookup / store -----------------------------------------------------
+    def lookup(self, name: str, fingerprint: str) -> tuple[bool, object]:
+        """Return ``(hit, result)`` for ``name`` under ``fingerprint``.
+
+        A recorded path result only counts as a hit if the file still exists.
+        """
+        entry = self._manifest["stages"].get(name)
+        if not entry or entry["fingerprint"] != fingerprint:
+            return False, None
+        result = _decode(entry["result"])
+        if isinstance(result, Path) and not result.exists():
+            return False, None
+        return True, result
+
+    def store(self, name: str, fingerprint: str, result: object) -> None:
+        """Record the result of ``name``; unserialisable results are skipped."""
+        encoded = _encode(result)
+        if encoded is None and result is not None:
+            self.logger.debug("Stage %s result is not cacheable", name)
+            return
+        self._manifest["stages"][name] = {
+            "fingerprint": fingerprint,
+            "result": encoded,
+        }
+        self._save()
+
+
+def _encode(result: object) -> dict[str, object] | None:
+    if isinstance(result, Path):
+        return {"path": str(result)}
+    try:
+        json.dumps(result)
+    except TypeError:
+        return None
+    return {"value": result}
+
+
+def _decode(encoded: dict[str, object] | None) -> object:
+    if encoded is None:
+        return None
+    if "path" in encoded:
+        return Path(str(encoded["path"]))
+    return encoded["value"]
@@ -0,0 +1,249 @@
+"""Minimal DAG executor for pipeline stages.
+
+Stages declare the artefacts they consume (``inputs``) and produce
+(``outputs``); dependencies are inferred by matching the two. Independent
+stages run concurrently in a process pool, and a stage is submitted as soon
+as every stage producing one of its inputs has completed. Inputs that no
+stage produces are treated as external (e.g. raw files on disk).
+
+Stage callables and their keyword arguments are pickled to the worker
+processes, so they must be module-level functions with picklable arguments.
+
+Stages declaring ``params`` are cacheable: given a
+:class:`~mangetamain.orchestration.cache.StageCache`, the executor skips any
+such stage whose fingerprint (params, source file hashes and upstream
+results) matches the previous run, unless the stage is forced.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Callable, Collection, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from .cache import StageCache
+
+
+class StageExecutionError(RuntimeError):
+    """Raised when a stage fails; the original error is chained."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"Stage '{stage}' failed")
+        self.stage = stage
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A unit of work in the pipeline DAG.
+
+    Attributes:
+        name: Unique stage name, also the key of its result.
+        func: Module-level callable invoked as ``func(**kwargs)``.
+        kwargs: Keyword arguments passed to ``func``.
+        inputs: Artefact names consumed by the stage.
+        outputs: Artefact names produced by the stage.
+        params: JSON-serialisable parameters fingerprinting the stage
+            configuration. ``None`` makes the stage uncacheable.
+        sources: Files read by the stage whose content is fingerprinted.
+    """
+
+    name: str
+    func: Callable[..., object]
+    kwargs: Mapping[str, object] = field(default_factory=dict)
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    params: Mapping[str, object] | None = None
+    sources: tuple[str, ...] = ()
+
+
+def _timed_call(func: Callable[..., object], kwargs: Mapping[str, object]):
+    start = time.perf_counter()
+    result = func(**kwargs)
+    return result, time.perf_counter() - start
+
+
+class DAGExecutor:
+    """Run :class:`Stage` objects in dependency order.
+
+    Args:
+        stages: Stages to execute.
+        max_workers: Size of the process pool. ``1`` runs every stage
+            sequentially in the calling process (sharing its memory, e.g. a
+            memoized repository); ``None`` uses one worker per CPU, capped
+            at the number of stages.
+        cache: Optional stage cache used to skip unchanged cacheable stages.
+        force: Names of stages that must run even if their fingerprint is
+            unchanged; ``"all"`` forces every stage.
+        logger: Optional logger.
+
+    Raises:
+        ValueError: On duplicate stage names or outputs, dependency cycles or
+            unknown forced stages.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        *,
+        max_workers: int | None = None,
+        cache: StageCache | None = None,
+        force: Collection[str] = (),
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        if "all" in force:
+            force = tuple(self.stages)
+        unknown = sorted(set(force) - set(self.stages))
+        if unknown:
+            raise ValueError(f"Unknown stages to force: {unknown}")
+        self.max_workers = max_workers
+        #: Resolved pool size; ``1`` means stages run in the calling process
+        self.workers = max_workers or min(os.cpu_count() or 1, len(self.stages))
+        self.cache = cache
+        self.force = frozenset(force)
+        self.logger = logger or logging.getLogger("mangetamain.orchestration")
+        self.dependencies = self._resolve_dependencies()
+        self.order = self._topological_order()
+        self.durations: dict[str, float] = {}
+        self.reused: list[str] = []
+        self._fingerprints: dict[str, str] = {}
+
+    # ---- graph ------------------------------------------------------------
+    def _resolve_dependencies(self) -> dict[str, set[str]]:
+        producers: dict[str, str] = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Output '{output}' produced by both "
+                        f"'{producers[output]}' and '{stage.name}'"
+                    )
+                producers[output] = stage.name
+        return {
+            stage.name: {producers[i] for i in stage.inputs if i in producers}
+            for stage in self.stages.values()
+        }
+
+    def _topological_order(self) -> list[str]:
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        order: list[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"Dependency cycle between stages: {sorted(remaining)}"
+                )
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    # ---- execution ----------------------------------------------------------
+    def run(self) -> dict[str, object]:
+        """Execute all stages and return their results keyed by stage name.
+
+        Raises:
+            StageExecutionError: If any stage raises. Stages not yet started
+                are cancelled.
+        """
+        if self.workers <= 1:
+            return self._run_sequential()
+        return self._run_pool(self.workers)
+
+    def _record(self, name: str, seconds: float) -> None:
+        self.durations[name] = seconds
+        self.logger.info("Stage %s done in %.2fs", name, seconds)
+
+    # ---- caching ------------------------------------------------------------
+    def _reuse(self, name: str, results: dict[str, object]) -> bool:
+        """Fill ``results[name]`` from the cache when the stage is unchanged."""
+        stage = self.stages[name]
+        if self.cache is None or stage.params is None:
+            return False
+        upstream = {dep: results[dep] for dep in self.dependencies[name]}
+        fingerprint = self.cache.fingerprint(
+            name, stage.params, stage.sources, upstream
+        )
+        self._fingerprints[name] = fingerprint
+        if name in self.force:
+            return False
+        hit, result = self.cache.lookup(name, fingerprint)
+        if hit:
+            results[name] = result
+            self.reused.append(name)
+            self.logger.info("Stage %s unchanged, reusing previous result", name)
+        return hit
+
+    def _remember(self, name: str, result: object) -> None:
+        if self.cache is not None and name in self._fingerprints:
+            self.cache.store(name, self._fingerprints[name], result)
+
+    def _run_sequential(self) -> dict[str, object]:
+        results: dict[str, object] = {}
+        for name in self.order:
+            if self._reuse(name, results):
+                continue
+            stage = self.stages[name]
+            self.logger.info("Stage %s started", name)
+            try:
+                results[name], seconds = _timed_call(stage.func, stage.kwargs)
+            except Exception as exc:
+                raise StageExecutionError(name) from exc
+            self._record(name, seconds)
+            self._remember(name, results[name])
+        return results
+
+    def _run_pool(self, workers: int) -> dict[str, object]:
+        results: dict[str, object] = {}
+        pending = {name: set(deps) for name, deps in self.dependencies.items()}
+        running: dict[Future, str] = {}
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+
+            def release(name: str) -> None:
+                for deps in pending.values():
+                    deps.discard(name)
+
+            def submit_ready() -> None:
+                # Reused stages complete immediately and may unblock others
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name in [n for n in self.order if n in pending]:
+                        if pending[name]:
+                            continue
+                        del pending[name]
+                        if self._reuse(name, results):
+                            release(name)
+                            progressed = True
+                            continue
+                        stage = self.stages[name]
+                        self.logger.info("Stage %s submitted", name)
+                        future = pool.submit(_timed_call, stage.func, stage.kwargs)
+                        running[future] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name], seconds = future.result()
+                    except Exception as exc:
+                        for other in running:
+                            other.cancel()
+                        raise StageExecutionError(name) from exc
+                    self._record(name, seconds)
+                    self._remember(name, results[name])
+                    release(name)
+                submit_ready()
+        return results
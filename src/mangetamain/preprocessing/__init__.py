@@ -25,7 +25,12 @@ from .interfaces import (
     IValidator,
 )
 from .processors import BasicDataProcessor
-from .repositories import CSVDataRepository, RepositoryPaths
+from .repositories import (
+    CSVDataRepository,
+    MemoizedDataRepository,
+    ParquetDataRepository,
+    RepositoryPaths,
+)
 
 __all__ = [
     # Interfaces / ABCs
@@ -44,6 +49,8 @@ __all__ = [
     # Implementations
     "RepositoryPaths",
     "CSVDataRepository",
+    "ParquetDataRepository",
+    "MemoizedDataRepository",
     "BasicDataProcessor",
     # Submodules
     "rating",
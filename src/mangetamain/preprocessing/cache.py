@@ -0,0 +1,223 @@
+"""On-disk columnar cache for raw CSV inputs.
+
+Parsing ``RAW_recipes.csv`` and ``RAW_interactions.csv`` with ``pd.read_csv``
+dominates the wall time of the preprocessing pipeline. This module converts a
+CSV source once into a typed Parquet file and serves subsequent reads from it,
+with column projection handled by the Parquet reader.
+
+Cache entries are keyed by the source file fingerprint (size, modification
+time and content hash). The cheap ``size``/``mtime`` pair is checked first;
+the content hash is only recomputed when the modification time changed, so a
+``touch`` on an unchanged file does not trigger a rebuild.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Identity of a source file used to validate derived artefacts."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def from_path(cls, path: str | Path) -> FileFingerprint:
+        """Compute the fingerprint of ``path`` (reads the whole file once)."""
+        path = Path(path)
+        stat = path.stat()
+        return cls(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=file_sha256(path),
+        )
+
+
+def file_sha256(path: str | Path) -> str:
+    """Return the hex SHA-256 digest of a file, streamed in chunks."""
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+def read_fresh_meta(
+    source: str | Path, meta_path: Path, format_version: int
+) -> dict | None:
+    """Return the metadata sidecar of an artefact if it still matches ``source``.
+
+    The sidecar records the :class:`FileFingerprint` of the source the
+    artefact was derived from. A touched source with unchanged content is
+    accepted, and its new modification time recorded.
+
+    Returns:
+        dict | None: The sidecar content, or ``None`` when it is missing,
+        unreadable, of another format version or describes another content.
+    """
+    if not meta_path.exists():
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("format_version") != format_version:
+        return None
+
+    source = Path(source)
+    stat = source.stat()
+    if stat.st_size != meta.get("size"):
+        return None
+    if stat.st_mtime_ns == meta.get("mtime_ns"):
+        return meta
+
+    # Same size but touched: fall back to the content hash
+    if file_sha256(source) != meta.get("sha256"):
+        return None
+    meta["mtime_ns"] = stat.st_mtime_ns
+    _atomic_write_text(meta_path, json.dumps(meta))
+    return meta
+
+
+class ParquetCache:
+    """Convert CSV sources to Parquet once and serve projected reads.
+
+    Args:
+        cache_dir: Directory where Parquet files and their metadata sidecars
+            are stored. Created on first write.
+        logger: Optional logger.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        *,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self._logger = logger or logging.getLogger("mangetamain.preprocessing.cache")
+
+    def path_for(self, source: str | Path) -> Path:
+        """Return the Parquet location associated with ``source``."""
+        source = Path(source)
+        # Disambiguate homonymous files living in different directories
+        key = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{source.stem}-{key}.parquet"
+
+    def _meta_path(self, source: str | Path) -> Path:
+        return self.path_for(source).with_suffix(".meta.json")
+
+    def is_fresh(self, source: str | Path) -> bool:
+        """Return ``True`` when the cached Parquet matches ``source``."""
+        if not self.path_for(source).exists():
+            return False
+        meta = read_fresh_meta(source, self._meta_path(source), CACHE_FORMAT_VERSION)
+        return meta is not None
+
+    def ensure(
+        self,
+        source: str | Path,
+        read_source: Callable[[Path], pd.DataFrame],
+    ) -> Path:
+        """Build the Parquet entry for ``source`` if stale and return its path.
+
+        Args:
+            source: CSV file to cache.
+            read_source: Callable parsing the full source into a dataframe.
+                It is only invoked on a cache miss.
+
+        Returns:
+            Path: Location of the up-to-date Parquet file.
+        """
+        source = Path(source)
+        parquet_path = self.path_for(source)
+        if self.is_fresh(source):
+            self._logger.debug("Parquet cache hit for %s", source)
+            return parquet_path
+
+        self._logger.info("Building Parquet cache for %s", source)
+        fingerprint = FileFingerprint.from_path(source)
+        df = read_source(source)
+
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+
+        meta = {"format_version": CACHE_FORMAT_VERSION, "source": str(source)}
+        meta.update(asdict(fingerprint))
+        _atomic_write_text(self._meta_path(source), json.dumps(meta))
+        return parquet_path
+
+    def read(
+        self,
+        source: str | Path,
+        read_source: Callable[[Path], pd.DataFrame],
+        *,
+        columns: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """Return ``source`` as a dataframe, reading only ``columns``.
+
+        Columns are returned in file order, mirroring ``pd.read_csv(usecols=)``.
+
+        Raises:
+            ValueError: If a requested column does not exist in the source.
+        """
+        parquet_path = self.ensure(source, read_source)
+        if columns is None:
+            return pd.read_parquet(parquet_path)
+
+        import pyarrow.parquet as pq
+
+        available = pq.read_schema(parquet_path).names
+        ordered = _project(source, available, columns)
+        return pd.read_parquet(parquet_path, columns=ordered)
+
+    def read_batches(
+        self,
+        source: str | Path,
+        *,
+        chunksize: int,
+        columns: Sequence[str] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the cached copy of ``source`` in chunks of ``chunksize`` rows.
+
+        Only ``columns`` are decoded, one record batch at a time. The entry
+        must already be fresh (see :meth:`is_fresh`).
+
+        Raises:
+            ValueError: If a requested column does not exist in the source.
+        """
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(self.path_for(source))
+        ordered = None
+        if columns is not None:
+            ordered = _project(source, parquet_file.schema_arrow.names, columns)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=ordered):
+            yield batch.to_pandas()
+
+
+def _project(
+    source: str | Path, available: Sequence[str], columns: Sequence[str]
+) -> list[str]:
+    missing = [c for c in columns if c not in available]
+    if missing:
+        raise ValueError(f"Columns not found in {source}: {missing}")
+    return [c for c in available if c in set(columns)]
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 from .analysers import IngredientsAnalyser
+from .embeddings import EmbeddingStore
 from .strategies import IngredientsCleaning, IngredientsPreprocessing
 
 __all__ = [
+    "EmbeddingStore",
     "IngredientsCleaning",
     "IngredientsPreprocessing",
     "IngredientsAnalyser",
@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
-import ast
+import hashlib
+import json
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from scipy.sparse.csgraph import connected_components
+from sklearn import config_context
 from sklearn.cluster import AgglomerativeClustering
 from sklearn.decomposition import PCA
+from sklearn.neighbors import NearestNeighbors
 
 from ...interfaces import Analyser, AnalysisResult
+from ...ragged import attach_parsed, incidence_matrix, parsed_column
+from .embeddings import EmbeddingStore
 
 
 class IngredientsAnalyser(Analyser):
@@ -27,18 +34,30 @@ class IngredientsAnalyser(Analyser):
     Attributes
     ----------
     cluster_threshold : float
-        Distance threshold used for hierarchical clustering of ingredients.
+        Cosine distance threshold used to deduplicate ingredients.
     n_pca_components : int
         Number of principal components to compute from the co-occurrence matrix.
     embedding_model_name : str
         Name of the SentenceTransformer model used to compute embeddings.
     model : SentenceTransformer
         The loaded SentenceTransformer model instance.
+    embedding_cache_dir : Path or None
+        Root of the persistent `EmbeddingStore`; None disables caching.
+    dedup_method : str
+        Ingredient deduplication engine, one of `DEDUP_METHODS`.
+    n_neighbors : int
+        Neighbours per ingredient considered by the "knn_graph" engine.
     """
 
     DEFAULT_CLUSTER_THRESHOLD: float = 0.5
     DEFAULT_N_PCA_COMPONENTS: int = 10
     DEFAULT_MODEL_NAME: str = "all-mpnet-base-v2"
+    DEFAULT_N_NEIGHBORS: int = 10
+    DEDUP_METHODS: tuple[str, ...] = ("agglomerative", "knn_graph")
+    # Size (MiB) of the distance blocks computed at once by "knn_graph"
+    KNN_WORKING_MEMORY: int = 128
+    # Ingredient features only depend on recipes
+    INTERACTION_COLUMNS: tuple[str, ...] = ()
 
     AXES_PHRASES: dict[str, tuple[str, str]] = {
         "sweet_savory": ("sweet dessert flavor", "savory meal flavor"),
@@ -55,6 +74,9 @@ class IngredientsAnalyser(Analyser):
         cluster_threshold: float | None = None,
         n_pca_components: int | None = None,
         embedding_model: str | None = None,
+        embedding_cache_dir: str | Path | None = None,
+        dedup_method: str = "agglomerative",
+        n_neighbors: int | None = None,
     ) -> None:
         """
         Initialize the IngredientsAnalyser.
@@ -62,7 +84,7 @@ class IngredientsAnalyser(Analyser):
         Parameters
         ----------
         cluster_threshold : float, optional
-            The distance threshold for the AgglomerativeClustering.
+            The cosine distance threshold for ingredient deduplication.
             If None, defaults to `DEFAULT_CLUSTER_THRESHOLD`.
         n_pca_components : int, optional
             The number of components for PCA.
@@ -70,10 +92,39 @@ class IngredientsAnalyser(Analyser):
         embedding_model : str, optional
             The name of the SentenceTransformer model to load.
             If None, defaults to `DEFAULT_MODEL_NAME`.
+        embedding_cache_dir : str or Path, optional
+            Directory of a persistent embedding store. When set, only
+            ingredients never encoded before by this model are passed to
+            the SentenceTransformer. If None, every run re-encodes.
+        dedup_method : str, default "agglomerative"
+            "agglomerative" runs average-linkage AgglomerativeClustering,
+            which needs the full O(n²) distance matrix. "knn_graph" links
+            each ingredient to its `n_neighbors` nearest neighbours within
+            `cluster_threshold` and takes connected components, in O(n * k)
+            memory. Components chain like single linkage, so this engine
+            usually calls for a lower threshold.
+        n_neighbors : int, optional
+            Neighbours per ingredient for "knn_graph".
+            If None, defaults to `DEFAULT_N_NEIGHBORS`.
+
+        Raises
+        ------
+        ValueError
+            If `dedup_method` is not one of `DEDUP_METHODS`.
         """
+        if dedup_method not in self.DEDUP_METHODS:
+            raise ValueError(
+                f"Unknown dedup_method {dedup_method!r}; "
+                f"expected one of {self.DEDUP_METHODS}"
+            )
         self.cluster_threshold = cluster_threshold or self.DEFAULT_CLUSTER_THRESHOLD
         self.n_pca_components = n_pca_components or self.DEFAULT_N_PCA_COMPONENTS
         self.embedding_model_name = embedding_model or self.DEFAULT_MODEL_NAME
+        self.embedding_cache_dir = (
+            Path(embedding_cache_dir) if embedding_cache_dir is not None else None
+        )
+        self.dedup_method = dedup_method
+        self.n_neighbors = n_neighbors or self.DEFAULT_N_NEIGHBORS
         # Lazy-load the embedding model only when needed to keep tests lightweight
         self.model: object | None = None
 
@@ -124,6 +175,10 @@ class IngredientsAnalyser(Analyser):
                 summary={},
             )
 
+        # Work on a shallow copy holding the parsed lists for every step
+        recipes = attach_parsed(
+            recipes, {"ingredients": parsed_column(recipes, "ingredients")}
+        )
         ingredients, ingredients_count = self._extract_ingredients(recipes)
         embeddings = self._compute_embeddings(ingredients)
         scores_df = self._compute_semantic_scores(ingredients, embeddings)
@@ -165,8 +220,8 @@ class IngredientsAnalyser(Analyser):
         """
         Extract unique ingredients and their frequencies from the recipes DataFrame.
 
-        Assumes the 'ingredients' column contains string representations of lists
-        which are evaluated using `ast.literal_eval`.
+        Assumes the 'ingredients' column contains string representations of lists;
+        they are read through `parsed_column`.
 
         Parameters
         ----------
@@ -180,15 +235,24 @@ class IngredientsAnalyser(Analyser):
             - A list of unique ingredient names.
             - A pandas Series mapping ingredient names to their frequency (count).
         """
-        ingredients_series = recipes["ingredients"].apply(ast.literal_eval).explode()
-        ingredients_count = ingredients_series.value_counts()
-        ingredients = pd.unique(ingredients_series).tolist()
-        return ingredients, ingredients_count
+        parsed = parsed_column(recipes, "ingredients")
+        # The vocabulary is in order of first appearance, like pd.unique
+        vocabulary = pd.Index(parsed.vocabulary, name="ingredients")
+        counts = np.bincount(parsed.values, minlength=len(vocabulary))
+        ingredients_count = pd.Series(counts, index=vocabulary, name="count")
+        ingredients_count = ingredients_count.sort_values(
+            ascending=False, kind="stable"
+        )
+        return vocabulary.tolist(), ingredients_count
 
     def _compute_embeddings(self, ingredients: list[str]) -> np.ndarray:
         """
         Compute embeddings for all ingredients using a sentence transformer.
 
+        With an `embedding_cache_dir`, embeddings are served from the
+        persistent store and the model only encodes unseen ingredients
+        (keys are lower-cased with whitespace collapsed).
+
         Parameters
         ----------
         ingredients : List[str]
@@ -200,8 +264,46 @@ class IngredientsAnalyser(Analyser):
             A 2D numpy array where each row is the embedding vector for the
             corresponding ingredient in the input list.
         """
-        model = self._get_model()
-        return model.encode(ingredients)
+        store = self._get_store()
+        if store is None:
+            model = self._get_model()
+            return model.encode(ingredients)
+        return store.get(ingredients, lambda batch: self._get_model().encode(batch))
+
+    def _get_store(self) -> EmbeddingStore | None:
+        if self.embedding_cache_dir is None:
+            return None
+        return EmbeddingStore(self.embedding_cache_dir, self.embedding_model_name)
+
+    def _compute_axis_matrix(self) -> np.ndarray:
+        """
+        Return the semantic axis vectors, one row per entry of `AXES_PHRASES`.
+
+        All phrases are encoded in a single batch; each axis is the positive
+        phrase embedding minus the negative one. With an `embedding_cache_dir`
+        the matrix is persisted next to the ingredient embeddings, keyed by
+        model name and a hash of the phrase set, so later runs never encode
+        the axes again.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape ``(len(AXES_PHRASES), embedding_dim)``.
+        """
+        phrase_key = json.dumps(list(self.AXES_PHRASES.items()))
+        name = "axes-" + hashlib.sha1(phrase_key.encode("utf-8")).hexdigest()[:12]
+        store = self._get_store()
+        if store is not None:
+            cached = store.load_array(name)
+            if cached is not None:
+                return cached
+
+        phrases = [phrase for pair in self.AXES_PHRASES.values() for phrase in pair]
+        vectors = np.asarray(self._get_model().encode(phrases))
+        axis_matrix = vectors[0::2] - vectors[1::2]
+        if store is not None:
+            store.save_array(name, axis_matrix)
+        return axis_matrix
 
     def _get_model(self):  # returns a SentenceTransformer instance
         if self.model is None:
@@ -238,14 +340,8 @@ class IngredientsAnalyser(Analyser):
             A DataFrame where rows are ingredients and columns are semantic
             axes (e.g., 'sweet_savory'), containing cosine similarity scores.
         """
-        model = self._get_model()
-        axis_vecs = {
-            name: model.encode(pos) - model.encode(neg)
-            for name, (pos, neg) in self.AXES_PHRASES.items()
-        }
-
-        axis_names = list(axis_vecs.keys())
-        axis_matrix = np.stack(list(axis_vecs.values()))
+        axis_names = list(self.AXES_PHRASES)
+        axis_matrix = self._compute_axis_matrix()
 
         # Normalisation pour le cosinus
         emb_norm = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
@@ -262,7 +358,10 @@ class IngredientsAnalyser(Analyser):
         Add semantic scores to the recipes DataFrame.
 
         Calculates the average semantic score for each recipe by averaging the
-        scores (from `scores_df`) of its constituent ingredients.
+        scores (from `scores_df`) of its constituent ingredients. All axes are
+        computed at once: a sparse recipe x ingredient count matrix ``X`` is
+        multiplied by the ingredient x axis score matrix and divided by the
+        number of scored ingredients per recipe (NaN when there are none).
 
         Parameters
         ----------
@@ -277,17 +376,15 @@ class IngredientsAnalyser(Analyser):
             The `recipes` DataFrame, modified in-place to include new columns
             (e.g., 'score_sweet_savory').
         """
-        for axis in scores_df.columns:
-            score_map = scores_df[axis].to_dict()
-            recipes[f"score_{axis}"] = recipes["ingredients"].apply(
-                lambda ingr_list, score_map=score_map: np.mean(
-                    [
-                        score_map[i]
-                        for i in ast.literal_eval(ingr_list)
-                        if i in score_map
-                    ]
-                )
-            )
+        parsed = parsed_column(recipes, "ingredients")
+        incidence = incidence_matrix(
+            parsed, scores_df.index.get_indexer(parsed.vocabulary), len(scores_df)
+        )
+        n_scored = np.asarray(incidence.sum(axis=1), dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (incidence @ scores_df.to_numpy(dtype=np.float64)) / n_scored
+        for j, axis in enumerate(scores_df.columns):
+            recipes[f"score_{axis}"] = means[:, j]
         return recipes
 
     def _cluster_ingredients(
@@ -306,8 +403,9 @@ class IngredientsAnalyser(Analyser):
         embeddings. This ensures that the subsequent co-occurrence matrix and PCA
         operate on normalized ingredient "concepts" rather than noisy textual variations.
 
-        Uses AgglomerativeClustering with a cosine metric. The label for each
-        cluster is determined by the most frequent ingredient within that cluster.
+        Uses the engine selected by `dedup_method` (AgglomerativeClustering
+        with a cosine metric by default). The label for each cluster is
+        determined by the most frequent ingredient within that cluster.
 
         Parameters
         ----------
@@ -325,16 +423,21 @@ class IngredientsAnalyser(Analyser):
             A DataFrame with columns ['name', 'cluster', 'cluster label']
             mapping each ingredient to its cluster (the normalized ingredient name).
         """
-        model_cut = AgglomerativeClustering(
-            distance_threshold=self.cluster_threshold,
-            n_clusters=None,
-            metric="cosine",
-            linkage="average",
-        ).fit(embeddings)
+        if self.dedup_method == "knn_graph":
+            labels = self._knn_graph_labels(embeddings)
+        else:
+            labels = (
+                AgglomerativeClustering(
+                    distance_threshold=self.cluster_threshold,
+                    n_clusters=None,
+                    metric="cosine",
+                    linkage="average",
+                )
+                .fit(embeddings)
+                .labels_
+            )
 
-        ingredients_df = pd.DataFrame(
-            {"name": ingredients, "cluster": model_cut.labels_}
-        )
+        ingredients_df = pd.DataFrame({"name": ingredients, "cluster": labels})
         temp = pd.merge(
             ingredients_df,
             ingredients_count.rename("count"),
@@ -352,6 +455,41 @@ class IngredientsAnalyser(Analyser):
         ingredients_df = pd.merge(ingredients_df, cluster_labels, on="cluster")
         return ingredients_df
 
+    def _knn_graph_labels(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Label ingredients by connected components of a thresholded kNN graph.
+
+        Each ingredient is linked to those of its `n_neighbors` nearest
+        neighbours (cosine distance, brute force in blocks of at most
+        `KNN_WORKING_MEMORY` MiB) that lie within `cluster_threshold`;
+        clusters are the weakly connected components.
+
+        Parameters
+        ----------
+        embeddings : np.ndarray
+            The embedding matrix for the ingredients.
+
+        Returns
+        -------
+        np.ndarray
+            Integer cluster label per ingredient.
+        """
+        n = len(embeddings)
+        if n < 2:
+            return np.zeros(n, dtype=np.int64)
+        nn = NearestNeighbors(
+            n_neighbors=min(self.n_neighbors, n - 1),
+            metric="cosine",
+            algorithm="brute",
+        ).fit(embeddings)
+        with config_context(working_memory=self.KNN_WORKING_MEMORY):
+            graph = nn.kneighbors_graph(mode="distance")
+        # Keep close edges only; exact duplicates have an explicit 0 distance
+        graph.data = (graph.data <= self.cluster_threshold).astype(np.int8)
+        graph.eliminate_zeros()
+        _, labels = connected_components(graph, directed=True, connection="weak")
+        return labels
+
     def _compute_pca_on_cooccurrence(
         self, recipes: pd.DataFrame, ingredients_df: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -378,34 +516,8 @@ class IngredientsAnalyser(Analyser):
             - cluster_labels (pd.DataFrame): A DataFrame mapping cluster IDs
               to their string labels.
         """
-        # Construction table recette-ingrédient
-        ingredients_by_recipe = pd.DataFrame(
-            recipes["ingredients"].apply(ast.literal_eval).explode()
-        )
-        ingredients_by_recipe["id_recipe"] = ingredients_by_recipe.index.to_list()
-
-        ingredients_by_recipe = pd.merge(
-            ingredients_by_recipe,
-            ingredients_df,
-            left_on="ingredients",
-            right_on="name",
-        )
-
         cluster_labels = ingredients_df[["cluster", "cluster label"]].drop_duplicates()
-
-        # Construction de la matrice de occcurrence
-        cooc = np.zeros((len(cluster_labels), len(cluster_labels)), int)
-        index_map = {
-            label: i for i, label in enumerate(cluster_labels["cluster label"])
-        }
-
-        for recipe in range(len(recipes)):
-            ings_recipe = ingredients_by_recipe.loc[
-                ingredients_by_recipe["id_recipe"] == recipe, "cluster label"
-            ]
-            for _i, ing_recipe_h in enumerate(ings_recipe):
-                for _j, ing_recipe_v in enumerate(ings_recipe):
-                    cooc[index_map[ing_recipe_h], index_map[ing_recipe_v]] += 1
+        cooc = self._build_cooccurrence(recipes, ingredients_df, cluster_labels)
 
         log_cooc = np.log1p(cooc)  # Atténue les effets de la distribution exponentielle
         pca = PCA(n_components=self.n_pca_components)
@@ -418,6 +530,57 @@ class IngredientsAnalyser(Analyser):
 
         return coords, cluster_labels
 
+    def _build_cooccurrence(
+        self,
+        recipes: pd.DataFrame,
+        ingredients_df: pd.DataFrame,
+        cluster_labels: pd.DataFrame,
+    ) -> np.ndarray:
+        """
+        Count how often ingredient clusters appear together in a recipe.
+
+        Builds a sparse recipe x cluster incidence matrix ``X`` (entry = number
+        of the recipe's ingredients falling in the cluster) and returns the
+        product ``X.T @ X``. Entry ``(h, v)`` therefore sums, over recipes,
+        every pair of ingredient occurrences in clusters ``h`` and ``v``
+        (including an occurrence paired with itself on the diagonal).
+
+        Parameters
+        ----------
+        recipes : pd.DataFrame
+            The main recipes DataFrame with an 'ingredients' column.
+        ingredients_df : pd.DataFrame
+            The clustered ingredients DataFrame from `_cluster_ingredients`.
+        cluster_labels : pd.DataFrame
+            One row per cluster; its order defines the matrix axes.
+
+        Returns
+        -------
+        np.ndarray
+            Dense ``(n_clusters, n_clusters)`` integer co-occurrence matrix.
+        """
+        n_clusters = len(cluster_labels)
+        index_map = {
+            label: i for i, label in enumerate(cluster_labels["cluster label"])
+        }
+        column_of = {
+            name: index_map[label]
+            for name, label in zip(
+                ingredients_df["name"], ingredients_df["cluster label"], strict=False
+            )
+        }
+
+        parsed = parsed_column(recipes, "ingredients")
+        # Map the vocabulary once; ingredients without a cluster are ignored
+        vocab_cols = (
+            pd.Series(parsed.vocabulary, dtype=object)
+            .map(column_of)
+            .fillna(-1)
+            .to_numpy(dtype=np.int64)
+        )
+        incidence = incidence_matrix(parsed, vocab_cols, n_clusters)
+        return (incidence.T @ incidence).toarray()
+
     def _add_pca_features(
         self, recipes: pd.DataFrame, ingredients_df: pd.DataFrame, coords: pd.DataFrame
     ) -> pd.DataFrame:
@@ -427,7 +590,10 @@ class IngredientsAnalyser(Analyser):
         For each recipe, this method finds the clusters of its ingredients,
         retrieves the PCA coordinates for those clusters (from `coords`),
         and calculates the mean of these coordinates. These mean values
-        are added as new 'DimX' columns to the recipes DataFrame.
+        are added as new 'DimX' columns to the recipes DataFrame. The means
+        of all recipes come from one product between a sparse recipe x
+        cluster count matrix and the cluster coordinates; recipes without a
+        clustered ingredient get NaN.
 
         Note: Dimensions 'Dim1' and 'Dim3' are excluded as they are
         assumed to relate only to ingredient frequency.
@@ -446,7 +612,6 @@ class IngredientsAnalyser(Analyser):
         pd.DataFrame
             The `recipes` DataFrame updated with new 'DimX' feature columns.
         """
-        recipes["ingredients_list"] = recipes["ingredients"].apply(ast.literal_eval)
         ingredient_to_cluster = dict(
             zip(ingredients_df["name"], ingredients_df["cluster label"], strict=False)
         )
@@ -459,18 +624,17 @@ class IngredientsAnalyser(Analyser):
         ]
         cluster_coords = coords.set_index("cluster label")[dims_to_use]
 
-        def get_recipe_coords(ingredient_list: list[str]) -> pd.Series:
-            clusters = [
-                ingredient_to_cluster[i]
-                for i in ingredient_list
-                if i in ingredient_to_cluster
-            ]
-            if not clusters:
-                return pd.Series([np.nan] * len(dims_to_use), index=dims_to_use)
-            repeated_coords = cluster_coords.loc[clusters]
-            return repeated_coords.mean()
-
-        recipes[dims_to_use] = recipes["ingredients_list"].apply(get_recipe_coords)
+        # ingredient (vocabulary entry) -> row of cluster_coords, -1 if unknown
+        parsed = parsed_column(recipes, "ingredients")
+        item_clusters = cluster_coords.index.get_indexer(
+            pd.Series(parsed.vocabulary, dtype=object).map(ingredient_to_cluster)
+        )
+        incidence = incidence_matrix(parsed, item_clusters, len(cluster_coords))
+        n_known = np.asarray(incidence.sum(axis=1), dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (incidence @ cluster_coords.to_numpy(dtype=np.float64)) / n_known
+
+        recipes[dims_to_use] = means
         return recipes
 
     # ======================================================
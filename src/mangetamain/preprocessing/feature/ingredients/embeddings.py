@@ -0,0 +1,217 @@
+"""Persistent on-disk store for ingredient embeddings."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+STORE_FORMAT_VERSION = 1
+
+
+def normalize_text(text: str) -> str:
+    """Return the cache key of ``text``: lower-cased, whitespace collapsed."""
+    return " ".join(str(text).lower().split())
+
+
+class EmbeddingStore:
+    """
+    Append-only embedding cache keyed by (model name, normalized string).
+
+    Each model owns a sub-directory holding two files:
+
+    - ``vectors.f32``: raw row-major float32 matrix, memory-mapped on read,
+    - ``index.json``: dimension and the normalized strings in row order,
+
+    plus any named derived arrays (e.g. semantic axis vectors) saved with
+    `save_array`.
+
+    Only strings never seen before are passed to ``encode``; their vectors are
+    appended to the matrix, so subsequent runs load embeddings without
+    touching the model. The index is rewritten atomically after the vectors
+    are appended and records the row count, so an interrupted write leaves
+    the store readable. A single writer per store is assumed.
+
+    Parameters
+    ----------
+    cache_dir : str or Path
+        Root directory of the store. Created on first write.
+    model_name : str
+        Name of the embedding model; vectors of different models never mix.
+    logger : logging.Logger, optional
+        Logger used to report cache hits and misses.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        model_name: str,
+        *,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.model_name = model_name
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        digest = hashlib.sha1(model_name.encode("utf-8")).hexdigest()[:8]
+        self.directory = Path(cache_dir) / f"{slug}-{digest}"
+        self._logger = logger or logging.getLogger(
+            "mangetamain.preprocessing.feature.ingredients"
+        )
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._dim: int | None = None
+        self._load_index()
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / "vectors.f32"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, text: object) -> bool:
+        return normalize_text(str(text)) in self._rows
+
+    def _load_index(self) -> None:
+        try:
+            index = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            index.get("format_version") != STORE_FORMAT_VERSION
+            or index.get("model") != self.model_name
+        ):
+            return
+        keys, dim = index["keys"], index["dim"]
+        expected = len(keys) * dim * np.dtype(np.float32).itemsize
+        try:
+            size = self._vectors_path.stat().st_size
+        except OSError:
+            return
+        if size < expected:
+            self._logger.warning("Embedding store %s is truncated", self.directory)
+            return
+        self._keys, self._dim = keys, dim
+        self._rows = {key: row for row, key in enumerate(keys)}
+
+    def _matrix(self) -> np.ndarray:
+        if not self._keys:
+            return np.empty((0, self._dim or 0), dtype=np.float32)
+        return np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self._keys), self._dim),
+        )
+
+    def _append(self, keys: list[str], vectors: np.ndarray) -> None:
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(
+                f"Embedding dimension changed from {self._dim} to {vectors.shape[1]}"
+            )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        expected = len(self._keys) * vectors.shape[1] * vectors.itemsize
+        mode = "r+b" if self._vectors_path.exists() else "wb"
+        with open(self._vectors_path, mode) as fh:
+            # Drop any tail left by an interrupted append
+            fh.truncate(expected)
+            fh.seek(expected)
+            fh.write(np.ascontiguousarray(vectors).tobytes())
+
+        self._dim = vectors.shape[1]
+        for key in keys:
+            self._rows[key] = len(self._keys)
+            self._keys.append(key)
+        index = {
+            "format_version": STORE_FORMAT_VERSION,
+            "model": self.model_name,
+            "dim": self._dim,
+            "keys": self._keys,
+        }
+        tmp_path = self._index_path.with_name(f"index.json.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+
+    def _array_path(self, name: str) -> Path:
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", name):
+            raise ValueError(f"Invalid array name: {name!r}")
+        return self.directory / f"{name}.npy"
+
+    def load_array(self, name: str) -> np.ndarray | None:
+        """
+        Return the array saved under ``name`` for this model, if any.
+
+        Parameters
+        ----------
+        name : str
+            Array name (letters, digits, ``_``, ``.`` and ``-``).
+
+        Returns
+        -------
+        np.ndarray or None
+            The saved array, or None when absent or unreadable.
+        """
+        try:
+            return np.load(self._array_path(name), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def save_array(self, name: str, array: np.ndarray) -> None:
+        """
+        Persist ``array`` under ``name`` for this model (atomic replace).
+
+        Parameters
+        ----------
+        name : str
+            Array name (letters, digits, ``_``, ``.`` and ``-``).
+        array : np.ndarray
+            Numeric array to save.
+        """
+        path = self._array_path(name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as fh:
+            np.save(fh, np.asarray(array), allow_pickle=False)
+        os.replace(tmp_path, path)
+
+    def get(
+        self,
+        texts: Sequence[str],
+        encode: Callable[[list[str]], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Return the embeddings of ``texts``, encoding only unseen strings.
+
+        Parameters
+        ----------
+        texts : Sequence[str]
+            Strings to embed. Keys are normalized with `normalize_text`.
+        encode : Callable[[list[str]], np.ndarray]
+            Batch encoder called once with the missing normalized strings.
+
+        Returns
+        -------
+        np.ndarray
+            A ``(len(texts), dim)`` float32 array aligned with ``texts``.
+        """
+        keys = [normalize_text(t) for t in texts]
+        missing = list(dict.fromkeys(k for k in keys if k not in self._rows))
+        self._logger.info(
+            "Embedding store: %d hits, %d to encode",
+            len(keys) - len(missing),
+            len(missing),
+        )
+        if missing:
+            vectors = np.asarray(encode(missing), dtype=np.float32)
+            self._append(missing, vectors.reshape(len(missing), -1))
+        rows = np.fromiter((self._rows[k] for k in keys), dtype=np.int64)
+        return np.asarray(self._matrix()[rows])
@@ -10,6 +10,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ...interfaces import ICleaningStrategy, IPreprocessingStrategy
+from ...ragged import RaggedArray, attach_parsed
 
 
 class IngredientsCleaning(ICleaningStrategy):
@@ -34,21 +35,27 @@ class IngredientsCleaning(ICleaningStrategy):
 
 
 class IngredientsPreprocessing(IPreprocessingStrategy):
-    """No-op preprocessing for ingredients.
+    """Parse the stringified ``ingredients`` lists once.
 
-    Could expand stringified lists to proper arrays or tokenize ingredients.
+    The parsed :class:`~mangetamain.preprocessing.ragged.RaggedArray` is
+    attached to a shallow copy of ``recipes`` and shared by every step of
+    :class:`IngredientsAnalyser`.
     """
 
     def preprocess(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        """Return preprocessed copies of the inputs.
+        """Attach the parsed ingredient lists to ``recipes``.
 
         Args:
             recipes: Recipes dataframe.
             interactions: Interactions dataframe.
 
         Returns:
-            Tuple of possibly transformed ``(recipes, interactions)``.
+            Tuple of ``(recipes, interactions)``; ``recipes`` is a shallow
+            copy carrying the parsed column when ``ingredients`` exists.
         """
-        return recipes, interactions
+        if "ingredients" not in recipes.columns:
+            return recipes, interactions
+        parsed = RaggedArray.from_string_lists(recipes["ingredients"])
+        return attach_parsed(recipes, {"ingredients": parsed}), interactions
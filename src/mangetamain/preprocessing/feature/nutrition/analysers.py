@@ -8,11 +8,11 @@ containing a feature table and summary statistics.
 
 from __future__ import annotations
 
-import ast
-
+import numpy as np
 import pandas as pd
 
 from ...interfaces import Analyser, AnalysisResult
+from ...ragged import parsed_column
 
 
 class NutritionAnalyser(Analyser):
@@ -26,9 +26,24 @@ class NutritionAnalyser(Analyser):
 
     Attributes
     ----------
-    None explicitly defined — this class is stateless.
+    NUTRIENT_COLUMNS : tuple of str
+        Names of the seven values of a "nutrition" list, in order. They are
+        held as ``float32``.
     """
 
+    # Nutrition features only depend on recipes
+    INTERACTION_COLUMNS: tuple[str, ...] = ()
+
+    NUTRIENT_COLUMNS: tuple[str, ...] = (
+        "calories",
+        "fat",
+        "sugar",
+        "sodium",
+        "protein",
+        "sat_fat",
+        "carbs",
+    )
+
     def analyze(
         self,
         recipes: pd.DataFrame,
@@ -78,19 +93,13 @@ class NutritionAnalyser(Analyser):
                 summary={},
             )
 
-        nutrition_series = recipes["nutrition"].dropna()
+        # Reuse the values parsed by NutritionPreprocessing when attached
+        parsed = parsed_column(recipes, "nutrition", numeric=True)
+        present = np.flatnonzero(~parsed.missing)
         nutrition_df = pd.DataFrame(
-            nutrition_series.apply(ast.literal_eval).tolist(),
-            columns=[
-                "calories",
-                "fat",
-                "sugar",
-                "sodium",
-                "protein",
-                "sat_fat",
-                "carbs",
-            ],
-            index=nutrition_series.index,
+            parsed.to_matrix(len(self.NUTRIENT_COLUMNS))[present],
+            columns=list(self.NUTRIENT_COLUMNS),
+            index=recipes.index[present],
         )
 
         # Ensure id and name are present and aligned
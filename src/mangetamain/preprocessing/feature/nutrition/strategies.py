@@ -10,6 +10,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ...interfaces import ICleaningStrategy, IPreprocessingStrategy
+from ...ragged import RaggedArray, attach_parsed
 
 
 class NutritionCleaning(ICleaningStrategy):
@@ -35,22 +36,26 @@ class NutritionCleaning(ICleaningStrategy):
 
 
 class NutritionPreprocessing(IPreprocessingStrategy):
-    """No-op preprocessing for nutrition inputs.
+    """Parse the stringified ``nutrition`` lists once.
 
-    Could expand list-like nutrition fields to structured columns or compute
-    derived fields required by downstream analysers.
+    The parsed :class:`~mangetamain.preprocessing.ragged.RaggedArray` is
+    attached to a shallow copy of ``recipes`` for the nutrition analyser.
     """
 
     def preprocess(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        """Return preprocessed copies of the inputs.
+        """Attach the parsed nutrition values to ``recipes``.
 
         Args:
             recipes: Recipes dataframe.
             interactions: Interactions dataframe (unused here).
 
         Returns:
-            Tuple of possibly transformed ``(recipes, interactions)``.
+            Tuple of ``(recipes, interactions)``; ``recipes`` is a shallow
+            copy carrying the parsed column when ``nutrition`` exists.
         """
-        return recipes, interactions
+        if "nutrition" not in recipes.columns:
+            return recipes, interactions
+        parsed = RaggedArray.from_number_lists(recipes["nutrition"])
+        return attach_parsed(recipes, {"nutrition": parsed}), interactions
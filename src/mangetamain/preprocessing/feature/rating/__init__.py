@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from .analyzers import RatingAnalyser
+from .stats_store import RatingStatsStore
 from .strategies import RatingCleaning, RatingPreprocessing
 
 __all__ = [
     "RatingCleaning",
     "RatingPreprocessing",
     "RatingAnalyser",
+    "RatingStatsStore",
 ]
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from ...interfaces import Analyser, AnalysisResult
@@ -29,6 +31,9 @@ class RatingAnalyser(Analyser):
     proportion of rated interactions per recipe.
     """
 
+    # Interaction columns read by :meth:`analyze_chunks`
+    INTERACTION_COLUMNS: tuple[str, ...] = ("recipe_id", "rating")
+
     def __init__(self, *, logger: logging.Logger | None = None) -> None:
         self._logger = logger or logging.getLogger(__name__)
 
@@ -80,92 +85,87 @@ class RatingAnalyser(Analyser):
         if "rating" not in interactions.columns:
             interactions = interactions.assign(rating=pd.NA)
 
-        # Build masks
-        rating_series = interactions["rating"].astype(float)
-        is_rated = rating_series.fillna(0) > 0
+        per_recipe, rated = self._aggregate(interactions)
+        mu = float(rated.quantile(mu_percentile)) if not rated.empty else 0.0
+        return self._finalize(
+            per_recipe,
+            recipes,
+            mu=mu,
+            num_interactions=len(interactions),
+            c=c,
+            with_wilson_per_recipe=with_wilson_per_recipe,
+        )
 
-        # Per-recipe aggregates
-        grp = interactions.groupby("recipe_id", dropna=False)
+    def analyze_chunks(
+        self,
+        recipes: pd.DataFrame,
+        chunks: Iterable[pd.DataFrame],
+        *,
+        c: int | None = None,
+        mu_percentile: float = 0.5,
+        with_wilson_per_recipe: bool = False,
+    ) -> AnalysisResult:
+        """Streaming variant of :meth:`analyze` over interaction chunks.
 
-        n_interactions = grp.size().rename("n_interactions").reset_index()
-        n_rated = (
-            grp["rating"]
-            .apply(lambda s: (s.fillna(0).astype(float) > 0).sum())
-            .rename("n_rated")
-            .reset_index()
-        )
+        Each chunk is folded into running per-recipe sufficient statistics
+        (see :class:`~.stats_store.RatingStatsStore`), so memory depends on
+        the number of recipes and the chunk size, not on the number of
+        interactions. Ratings must lie on the 1-5 scale (or be <= 0 / NaN).
 
-        rated_only = interactions.loc[is_rated].copy()
-        if rated_only.empty:
-            rated_agg = pd.DataFrame(
-                {
-                    "recipe_id": pd.Series(dtype="int64"),
-                    "mean_rating": pd.Series(dtype="float"),
-                    "median_rating": pd.Series(dtype="float"),
-                    "rating_std": pd.Series(dtype="float"),
-                }
-            )
-        else:
-            rated_grp = rated_only.groupby("recipe_id")
-            rated_agg = (
-                rated_grp["rating"]
-                .agg(
-                    mean_rating="mean",
-                    median_rating="median",
-                    rating_std="std",
-                )
-                .reset_index()
-                .fillna({"rating_std": 0})
-            )
+        Args:
+            recipes: Recipe metadata (``id`` and ``name``).
+            chunks: Interaction frames with ``recipe_id`` and ``rating``.
+            c: See :meth:`analyze`.
+            mu_percentile: See :meth:`analyze`.
+            with_wilson_per_recipe: See :meth:`analyze`.
 
-        # Attach recipe names
-        # rated_agg = rated_agg.merge(
-        #     per_recipe.merge(
-        #         recipes[["id", "name"]],
-        #         left_on="recipe_id",
-        #         right_on="id",
-        #         how="left",
-        #     )
-        #     .drop(columns=["id"])
-        #     .rename(columns={"name": "recipe_name"})
-        # )
-
-        # Merge aggregates
-        per_recipe = n_interactions.merge(n_rated, on="recipe_id", how="left").merge(
-            rated_agg, on="recipe_id", how="left"
-        )
-        per_recipe["n_rated"] = per_recipe["n_rated"].fillna(0).astype(int)
-        per_recipe["share_rated"] = (
-            per_recipe["n_rated"].divide(per_recipe["n_interactions"]).fillna(0)
+        Returns:
+            AnalysisResult: Same table and summary as :meth:`analyze` on the
+            concatenated chunks.
+        """
+        from .stats_store import RatingStatsStore
+
+        store = RatingStatsStore(logger=self._logger)
+        for chunk in chunks:
+            store.update(chunk)
+        return store.analyze(
+            recipes,
+            analyser=self,
+            c=c,
+            mu_percentile=mu_percentile,
+            with_wilson_per_recipe=with_wilson_per_recipe,
         )
 
+    def _finalize(
+        self,
+        per_recipe: pd.DataFrame,
+        recipes: pd.DataFrame,
+        *,
+        mu: float,
+        num_interactions: int,
+        c: int | None = None,
+        with_wilson_per_recipe: bool = False,
+    ) -> AnalysisResult:
+        """Derive smoothed means, names, Wilson bounds and the summary.
+
+        Args:
+            per_recipe: Output table of :meth:`_aggregate`.
+            recipes: Recipe metadata (``id`` and ``name``).
+            mu: Prior mean, a percentile of the rated-only distribution.
+            num_interactions: Number of interactions aggregated.
+            c: Prior strength (see :meth:`analyze`).
+            with_wilson_per_recipe: Whether to add per-recipe Wilson bounds.
+
+        Returns:
+            AnalysisResult: The result documented in :meth:`analyze`.
+        """
         # Bayesian smoothing (simple):
         # bayes_mean = (mu * c + sum_ratings) / (c + n_rated)
         # Choose c as global prior strength; mu as global mean over rated
         # Informative prior mean based on percentile of rated-only distribution
-        mu = (
-            float(rated_only["rating"].quantile(mu_percentile))
-            if not rated_only.empty
-            else 0.0
-        )
         c_value = (
             c if c is not None else max(5, int(per_recipe["n_rated"].median() or 5))
         )
-        # compute sum_ratings per recipe
-        if rated_only.empty:
-            sum_ratings = pd.DataFrame(
-                {"recipe_id": per_recipe["recipe_id"], "sum_ratings": 0.0}
-            )
-        else:
-            sum_ratings = (
-                rated_only.groupby("recipe_id")["rating"]
-                .sum()
-                .rename("sum_ratings")
-                .reset_index()
-            )
-        per_recipe = per_recipe.merge(sum_ratings, on="recipe_id", how="left").fillna(
-            {"sum_ratings": 0.0}
-        )
         per_recipe["bayes_mean"] = (mu * c_value + per_recipe["sum_ratings"]) / (
             c_value + per_recipe["n_rated"].clip(lower=0)
         )
@@ -232,7 +232,7 @@ class RatingAnalyser(Analyser):
 
         summary = {
             "num_unique_recipes": num_recipes,
-            "num_interactions": int(len(interactions)),
+            "num_interactions": int(num_interactions),
             "n_with_rating": n_with_rating,
             "phat": phat_mean,
             "wilson_low": wilson_low,
@@ -244,6 +244,95 @@ class RatingAnalyser(Analyser):
             summary=summary,
         )
 
+    @staticmethod
+    def _aggregate(interactions: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+        """Compute every per-recipe aggregate in a single pass.
+
+        Recipe ids are factorized once (sorted, missing ids grouped last as
+        ``groupby(dropna=False)`` does); counts and sums are ``np.bincount``
+        reductions over the codes and medians/deviations are segment
+        reductions over ratings sorted by code. Only ratings > 0 count as
+        rated.
+
+        Args:
+            interactions: Frame with ``recipe_id`` and ``rating`` columns.
+
+        Returns:
+            tuple[pd.DataFrame, pd.Series]: Per-recipe table with columns
+            ``recipe_id``, ``n_interactions``, ``n_rated``, ``mean_rating``,
+            ``median_rating``, ``rating_std``, ``share_rated`` and
+            ``sum_ratings`` (mean/median/std are NaN for unrated recipes and
+            std is 0 for a single rating), and the rated-only ratings.
+        """
+        codes, recipe_ids = pd.factorize(
+            interactions["recipe_id"], sort=True, use_na_sentinel=False
+        )
+        n_recipes = len(recipe_ids)
+        ratings = (
+            pd.to_numeric(interactions["rating"], errors="coerce")
+            .astype(float)
+            .to_numpy()
+        )
+        is_rated = np.nan_to_num(ratings, nan=0.0) > 0
+        rated_codes = codes[is_rated]
+        rated = ratings[is_rated]
+
+        n_interactions = np.bincount(codes, minlength=n_recipes)
+        n_rated = np.bincount(rated_codes, minlength=n_recipes)
+        sum_ratings = np.bincount(
+            rated_codes, weights=rated, minlength=n_recipes
+        ).astype(float)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sum_ratings / n_rated
+            # Segment reductions over ratings sorted by recipe code
+            order = np.lexsort((rated, rated_codes))
+            sorted_ratings = rated[order]
+            starts = np.concatenate([[0], np.cumsum(n_rated)[:-1]])
+            has_rating = n_rated > 0
+            lo = starts + (n_rated - 1) // 2
+            hi = starts + n_rated // 2
+            median = np.full(n_recipes, np.nan)
+            median[has_rating] = (
+                sorted_ratings[lo[has_rating]] + sorted_ratings[hi[has_rating]]
+            ) / 2
+            deviations = rated - mean[rated_codes]
+            sq_dev = np.bincount(
+                rated_codes, weights=deviations * deviations, minlength=n_recipes
+            )
+            std = np.sqrt(sq_dev / (n_rated - 1))
+        std[n_rated == 1] = 0.0
+        std[~has_rating] = np.nan
+        # Rated-only statistics are not reported for a missing recipe id
+        missing_id = pd.isna(recipe_ids)
+        mean[missing_id] = median[missing_id] = std[missing_id] = np.nan
+        sum_ratings[missing_id] = 0.0
+
+        sums = pd.Series(sum_ratings)
+        if (
+            pd.api.types.is_integer_dtype(interactions["rating"])
+            and len(rated)
+            and has_rating.all()
+            and not missing_id.any()
+        ):
+            # Integer sums, as a rated-only groupby().sum() of int64 ratings;
+            # narrower rating dtypes (e.g. compacted int8) would overflow
+            sums = sums.astype(np.int64)
+
+        per_recipe = pd.DataFrame(
+            {
+                "recipe_id": recipe_ids,
+                "n_interactions": n_interactions,
+                "n_rated": n_rated.astype(int),
+                "mean_rating": mean,
+                "median_rating": median,
+                "rating_std": std,
+                "share_rated": n_rated / n_interactions,
+                "sum_ratings": sums,
+            }
+        )
+        return per_recipe, pd.Series(rated)
+
     def generate_report(self, result: AnalysisResult, path: Path) -> dict[str, object]:
         """Write CSV outputs for per-recipe metrics and global summary.
 
@@ -0,0 +1,265 @@
+"""Persistent, append-only per-recipe rating statistics."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ...interfaces import AnalysisResult
+from .analyzers import RatingAnalyser
+
+
+class RatingStatsStore:
+    """Mergeable per-recipe sufficient statistics of the ratings.
+
+    For every recipe the store keeps the number of interactions, the number
+    of rated interactions (rating > 0), the sum and sum of squares of the
+    ratings and a histogram over the discrete rating scale
+    (:attr:`RATING_LEVELS`). The histogram is an exact, mergeable quantile
+    sketch: per-recipe medians and the global prior percentile used by the
+    Bayesian mean are read from it without the interaction history.
+
+    :meth:`update` folds a batch of new interactions into the state in time
+    proportional to the batch, and :meth:`analyze` rebuilds the same table
+    as :meth:`RatingAnalyser.analyze` over the whole history from the state
+    alone. Updates are append-only: absorbing a batch twice counts it twice.
+
+    Args:
+        path: Parquet file holding the state; loaded when it exists. ``None``
+            keeps the state in memory only.
+        logger: Optional logger.
+    """
+
+    RATING_LEVELS: tuple[int, ...] = (1, 2, 3, 4, 5)
+
+    def __init__(
+        self, path: str | Path | None = None, *, logger: logging.Logger | None = None
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self._logger = logger or logging.getLogger(__name__)
+        self._levels = np.asarray(self.RATING_LEVELS, dtype=float)
+        self._hist_columns = [f"hist_{level}" for level in self.RATING_LEVELS]
+        self._recipe_ids = np.empty(0, dtype=np.int64)
+        self._n_interactions = np.empty(0, dtype=np.int64)
+        self._sums = np.empty(0, dtype=float)
+        self._sum_squares = np.empty(0, dtype=float)
+        self._hist = np.empty((0, len(self.RATING_LEVELS)), dtype=np.int64)
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._recipe_ids)
+
+    @property
+    def num_interactions(self) -> int:
+        """Total number of interactions absorbed so far."""
+        return int(self._n_interactions.sum())
+
+    def _load(self) -> None:
+        state = pd.read_parquet(self.path)
+        required = {
+            "recipe_id",
+            "n_interactions",
+            "sum_ratings",
+            "sum_sq_ratings",
+            *self._hist_columns,
+        }
+        missing = required - set(state.columns)
+        if missing:
+            raise ValueError(f"Rating stats file lacks columns: {sorted(missing)}")
+        self._recipe_ids = state["recipe_id"].to_numpy(np.int64)
+        self._n_interactions = state["n_interactions"].to_numpy(np.int64)
+        self._sums = state["sum_ratings"].to_numpy(float)
+        self._sum_squares = state["sum_sq_ratings"].to_numpy(float)
+        self._hist = state[self._hist_columns].to_numpy(np.int64)
+
+    def save(self) -> Path:
+        """Write the state to :attr:`path` (atomic replace) and return it."""
+        if self.path is None:
+            raise ValueError("This rating stats store has no path")
+        state = pd.DataFrame(
+            {
+                "recipe_id": self._recipe_ids,
+                "n_interactions": self._n_interactions,
+                "sum_ratings": self._sums,
+                "sum_sq_ratings": self._sum_squares,
+            }
+        )
+        state[self._hist_columns] = self._hist
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        state.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def update(self, interactions: pd.DataFrame) -> int:
+        """Fold a batch of new interactions into the statistics.
+
+        Args:
+            interactions: New rows with ``recipe_id`` and an optional
+                ``rating`` column. Rows without a recipe id are ignored.
+
+        Returns:
+            int: Number of interactions absorbed.
+
+        Raises:
+            ValueError: If ``recipe_id`` is missing or a positive rating is
+                not one of :attr:`RATING_LEVELS`.
+        """
+        if "recipe_id" not in interactions.columns:
+            raise ValueError("interactions must contain 'recipe_id'")
+        recipe_ids = pd.to_numeric(interactions["recipe_id"], errors="coerce")
+        known = recipe_ids.notna().to_numpy()
+        if not known.all():
+            self._logger.warning(
+                "Ignoring %d interactions without recipe id", int((~known).sum())
+            )
+        if "rating" in interactions.columns:
+            ratings = pd.to_numeric(interactions["rating"], errors="coerce")
+            ratings = ratings.to_numpy(float)[known]
+        else:
+            ratings = np.full(int(known.sum()), np.nan)
+
+        # Sorted ids make the state lookups below cache-friendly
+        codes, batch_ids = pd.factorize(
+            recipe_ids.to_numpy()[known].astype(np.int64), sort=True
+        )
+        rated = np.nan_to_num(ratings, nan=0.0) > 0
+        bins = np.searchsorted(self._levels, ratings[rated])
+        clipped = np.minimum(bins, len(self._levels) - 1)
+        if len(bins) and (self._levels[clipped] != ratings[rated]).any():
+            raise ValueError(
+                f"Ratings must be one of {list(self.RATING_LEVELS)} or <= 0"
+            )
+
+        n_batch, n_levels = len(batch_ids), len(self._levels)
+        counts = np.bincount(codes, minlength=n_batch)
+        hist = np.bincount(
+            codes[rated] * n_levels + bins, minlength=n_batch * n_levels
+        ).reshape(n_batch, n_levels)
+
+        rows = self._rows_for(np.asarray(batch_ids, dtype=np.int64))
+        self._n_interactions[rows] += counts
+        self._hist[rows] += hist
+        # Sums are derived from the batch histogram so they stay exact
+        self._sums[rows] += hist @ self._levels
+        self._sum_squares[rows] += hist @ (self._levels**2)
+        self._logger.info(
+            "Rating stats: absorbed %d interactions over %d recipes",
+            len(codes),
+            n_batch,
+        )
+        return len(codes)
+
+    def merge(self, other: RatingStatsStore) -> None:
+        """Add the statistics of another store (e.g. of another shard)."""
+        if other.RATING_LEVELS != self.RATING_LEVELS:
+            raise ValueError("Cannot merge stores with different rating levels")
+        rows = self._rows_for(other._recipe_ids)
+        self._n_interactions[rows] += other._n_interactions
+        self._sums[rows] += other._sums
+        self._sum_squares[rows] += other._sum_squares
+        self._hist[rows] += other._hist
+
+    def _rows_for(self, recipe_ids: np.ndarray) -> np.ndarray:
+        """Return the state rows of unique ``recipe_ids``, inserting unseen ones."""
+        rows = np.searchsorted(self._recipe_ids, recipe_ids)
+        known = rows < len(self._recipe_ids)
+        known[known] = self._recipe_ids[rows[known]] == recipe_ids[known]
+        if known.all():
+            return rows
+        new_ids = np.sort(recipe_ids[~known])
+        at = np.searchsorted(self._recipe_ids, new_ids)
+        self._recipe_ids = np.insert(self._recipe_ids, at, new_ids)
+        self._n_interactions = np.insert(self._n_interactions, at, 0)
+        self._sums = np.insert(self._sums, at, 0.0)
+        self._sum_squares = np.insert(self._sum_squares, at, 0.0)
+        self._hist = np.insert(self._hist, at, 0, axis=0)
+        return np.searchsorted(self._recipe_ids, recipe_ids)
+
+    def _quantile(self, counts: np.ndarray, q: float) -> float:
+        """Linear-interpolation quantile (pandas' default) of a histogram."""
+        total = int(counts.sum())
+        if total == 0:
+            return 0.0
+        cumulative = np.cumsum(counts)
+        position = (total - 1) * q
+        lo, hi = int(np.floor(position)), int(np.ceil(position))
+        below = self._levels[np.searchsorted(cumulative, lo, side="right")]
+        above = self._levels[np.searchsorted(cumulative, hi, side="right")]
+        return float(below + (above - below) * (position - lo))
+
+    def per_recipe(self) -> pd.DataFrame:
+        """Return the per-recipe aggregates of :meth:`RatingAnalyser._aggregate`.
+
+        Returns:
+            pd.DataFrame: One row per recipe id, in ascending order.
+        """
+        n_rated = self._hist.sum(axis=1)
+        has_rating = n_rated > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self._sums / n_rated
+            variance = (self._sum_squares - self._sums * mean) / (n_rated - 1)
+            std = np.sqrt(np.clip(variance, 0.0, None))
+        std[n_rated == 1] = 0.0
+        std[~has_rating] = np.nan
+
+        # Median from the histogram: average of the two middle order stats
+        cumulative = np.cumsum(self._hist, axis=1)
+        lo = ((n_rated - 1) // 2)[:, None]
+        hi = (n_rated // 2)[:, None]
+        last = len(self._levels) - 1
+        lo_bin = np.minimum((cumulative <= lo).sum(axis=1), last)
+        hi_bin = np.minimum((cumulative <= hi).sum(axis=1), last)
+        median = (self._levels[lo_bin] + self._levels[hi_bin]) / 2
+        median[~has_rating] = np.nan
+
+        return pd.DataFrame(
+            {
+                "recipe_id": self._recipe_ids,
+                "n_interactions": self._n_interactions,
+                "n_rated": n_rated.astype(int),
+                "mean_rating": mean,
+                "median_rating": median,
+                "rating_std": std,
+                "share_rated": n_rated / self._n_interactions,
+                "sum_ratings": self._sums,
+            }
+        )
+
+    def analyze(
+        self,
+        recipes: pd.DataFrame,
+        *,
+        analyser: RatingAnalyser | None = None,
+        c: int | None = None,
+        mu_percentile: float = 0.5,
+        with_wilson_per_recipe: bool = False,
+    ) -> AnalysisResult:
+        """Build the :meth:`RatingAnalyser.analyze` result from the state.
+
+        Args:
+            recipes: Recipe metadata (``id`` and ``name``).
+            analyser: Analyser used to finish the table; a default one when
+                omitted.
+            c: Prior strength of the Bayesian mean.
+            mu_percentile: Percentile of all rated ratings used as prior mean.
+            with_wilson_per_recipe: Whether to add per-recipe Wilson bounds.
+
+        Returns:
+            AnalysisResult: Table and summary over every absorbed interaction.
+        """
+        analyser = analyser or RatingAnalyser(logger=self._logger)
+        mu = self._quantile(self._hist.sum(axis=0), mu_percentile)
+        return analyser._finalize(
+            self.per_recipe(),
+            recipes,
+            mu=mu,
+            num_interactions=self.num_interactions,
+            c=c,
+            with_wilson_per_recipe=with_wilson_per_recipe,
+        )
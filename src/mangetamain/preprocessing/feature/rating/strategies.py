@@ -23,7 +23,7 @@ class RatingCleaning(ICleaningStrategy):
     def clean(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        """Return cleaned copies of the inputs.
+        """Return the inputs unchanged (no copy is made).
 
         Args:
             recipes: Recipes dataframe.
@@ -40,9 +40,7 @@ class RatingCleaning(ICleaningStrategy):
         #     interactions_clean = interactions_clean.dropna(
         #         subset=["rating"]
         #     )  # type: ignore[call-overload]
-        interactions_clean = interactions.copy()
-        recipes_clean = recipes.copy()
-        return recipes_clean, interactions_clean
+        return recipes, interactions
 
 
 class RatingPreprocessing(IPreprocessingStrategy):
@@ -56,7 +54,7 @@ class RatingPreprocessing(IPreprocessingStrategy):
     def preprocess(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        """Return preprocessed copies of the inputs.
+        """Return the inputs unchanged (no copy is made).
 
         Args:
             recipes: Recipes dataframe.
@@ -70,6 +68,4 @@ class RatingPreprocessing(IPreprocessingStrategy):
         #     interactions_pp["rating_normalized"] = (
         #         interactions_pp["rating"].astype(float) / 5.0
         #     )
-        recipes_pp = recipes.copy()
-        interactions_pp = interactions.copy()
-        return recipes_pp, interactions_pp
+        return recipes, interactions
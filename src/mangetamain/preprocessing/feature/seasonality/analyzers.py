@@ -9,12 +9,18 @@ features along with a seasonality strength metric.
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
 from ...interfaces import Analyser, AnalysisResult
+from .day_of_year import (
+    add_seasonal_sums,
+    parse_day_of_year,
+    seasonal_sums,
+    smooth_seasonality,
+)
 
 
 class SeasonalityAnalyzer(Analyser):
@@ -26,6 +32,9 @@ class SeasonalityAnalyzer(Analyser):
     with limited data.
     """
 
+    # Interaction columns read by :meth:`analyze_chunks`
+    INTERACTION_COLUMNS: tuple[str, ...] = ("recipe_id", "date")
+
     def __init__(self, *, logger: logging.Logger | None = None) -> None:
         """Initializes the SeasonalityAnalyzer.
 
@@ -70,70 +79,85 @@ class SeasonalityAnalyzer(Analyser):
             "Computing seasonality features for recipes based on user interaction data"
         )
 
-        df_interactions = interactions.copy()
+        return self._features(self._partial_sums(interactions))
+
+    def analyze_chunks(
+        self,
+        recipes: pd.DataFrame,
+        chunks: Iterable[pd.DataFrame],
+        **kwargs: object,
+    ) -> AnalysisResult:
+        """Streaming variant of :meth:`analyze` over interaction chunks.
+
+        Each chunk is reduced to per-recipe counts and sine/cosine sums that
+        are added to running totals, so memory depends on the number of
+        recipes and the chunk size, not on the number of interactions.
+
+        Args:
+            recipes (pd.DataFrame): Unused, kept for interface symmetry.
+            chunks (Iterable[pd.DataFrame]): Interaction frames with
+                'recipe_id' and 'date'.
+            **kwargs (object): Additional keyword arguments (unused).
+
+        Returns:
+            AnalysisResult: Same features as :meth:`analyze` on the
+            concatenated chunks.
+
+        Raises:
+            ValueError: If a chunk lacks the required columns or holds
+                invalid dates.
+        """
+        totals: pd.DataFrame | None = None
+        for chunk in chunks:
+            totals = add_seasonal_sums(totals, self._partial_sums(chunk))
+        if totals is None:
+            totals = pd.DataFrame(
+                {"n": [], "sin_sum": [], "cos_sum": []},
+                index=pd.Index([], dtype="int64", name="recipe_id"),
+            )
+        return self._features(totals)
+
+    def _partial_sums(self, interactions: pd.DataFrame) -> pd.DataFrame:
+        """Reduce interactions to per-recipe ``n``, ``sin_sum`` and ``cos_sum``.
+
+        Sums are additive across chunks, unlike means.
+
+        Args:
+            interactions (pd.DataFrame): Frame with 'recipe_id' and 'date'.
+
+        Returns:
+            pd.DataFrame: Totals indexed by 'recipe_id'.
+
+        Raises:
+            ValueError: If required columns are missing or dates are invalid.
+        """
         date_col = "date"
         group_col = "recipe_id"
-        k = 5.0
 
         # Validate required columns
         if (
-            date_col not in df_interactions.columns
-            or group_col not in df_interactions.columns
+            date_col not in interactions.columns
+            or group_col not in interactions.columns
         ):
             raise ValueError(
                 f"interactions must contain '{date_col}' and '{group_col}'"
             )
 
-        # Convert date column to datetime and compute day-of-year
-        df_interactions[date_col] = pd.to_datetime(
-            df_interactions[date_col], errors="coerce"
-        )
-        if df_interactions[date_col].isna().any():
-            raise ValueError(f"Invalid dates found in '{date_col}'")
-
-        doy = df_interactions[date_col].dt.dayofyear
-        df_interactions["doy_sin"] = np.sin(2 * np.pi * doy / 365)
-        df_interactions["doy_cos"] = np.cos(2 * np.pi * doy / 365)
-
-        # Compute global sine/cosine averages for smoothing
-        sin_global_ = df_interactions["doy_sin"].mean()
-        cos_global_ = df_interactions["doy_cos"].mean()
-
-        # Aggregate per recipe_id
-        agg = (
-            df_interactions.groupby(group_col)
-            .agg(
-                sin_mean=("doy_sin", "mean"),
-                cos_mean=("doy_cos", "mean"),
-                n=("doy_sin", "size"),
-            )
-            .reset_index()
-        )
+        doy = parse_day_of_year(interactions[date_col], column=date_col)
+        return seasonal_sums(interactions[group_col], doy)
 
-        # Empirical Bayes smoothing
-        agg["inter_doy_sin_smooth"] = (agg["n"] * agg["sin_mean"] + k * sin_global_) / (
-            agg["n"] + k
-        )
-        agg["inter_doy_cos_smooth"] = (agg["n"] * agg["cos_mean"] + k * cos_global_) / (
-            agg["n"] + k
-        )
+    def _features(self, totals: pd.DataFrame) -> AnalysisResult:
+        """Turn per-recipe totals into smoothed seasonality features.
 
-        # Compute seasonal strength (vector length)
-        agg["inter_strength"] = np.sqrt(
-            agg["inter_doy_sin_smooth"] ** 2 + agg["inter_doy_cos_smooth"] ** 2
-        )
+        Args:
+            totals (pd.DataFrame): Output of :meth:`_partial_sums`, possibly
+                summed over several chunks.
 
-        # Store only the aggregated features for merging later
-        df_features = agg[
-            [
-                group_col,
-                "inter_doy_sin_smooth",
-                "inter_doy_cos_smooth",
-                "inter_strength",
-            ]
-        ]
-
-        return AnalysisResult(table=df_features, summary={})
+        Returns:
+            AnalysisResult: Per-recipe features and an empty summary.
+        """
+        features, _, _ = smooth_seasonality(totals, k=5.0)
+        return AnalysisResult(table=features, summary={})
 
     def generate_report(self, result: AnalysisResult, path):
         """Generates and saves CSV reports for seasonality results.
@@ -0,0 +1,141 @@
+"""Vectorized day-of-year kernels shared by the seasonality features.
+
+Interaction dates repeat heavily (a few thousand distinct days for a million
+interactions), so dates are factorized and only the distinct values are
+parsed, with an explicit ISO format. Day-of-year sine/cosine values come from
+precomputed lookup tables and per-recipe totals from ``np.bincount``.
+
+Totals are additive, so they can be accumulated over chunks of interactions
+before :func:`smooth_seasonality` turns them into features.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+# sin/cos of 2π·doy/365 for doy = 1..366, indexed by ``doy - 1``
+DOY_SIN = np.sin(2 * np.pi * np.arange(1, 367) / 365)
+DOY_COS = np.cos(2 * np.pi * np.arange(1, 367) / 365)
+
+
+def parse_day_of_year(dates: pd.Series, *, column: str = "date") -> np.ndarray:
+    """Return the day of year (1..366) of every date.
+
+    Datetime columns are used as is. Other values are factorized, parsed with
+    :data:`ISO_DATE_FORMAT`, and distinct values that do not match it fall
+    back to ``pd.to_datetime`` format inference.
+
+    Args:
+        dates: Dates as ISO strings, ``datetime.date`` objects or datetimes.
+        column: Column name used in the error message.
+
+    Returns:
+        np.ndarray: Integer day of year aligned with ``dates``.
+
+    Raises:
+        ValueError: If a date is missing or cannot be parsed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        if dates.isna().any():
+            raise ValueError(f"Invalid dates found in '{column}'")
+        return dates.dt.dayofyear.to_numpy()
+
+    codes, uniques = pd.factorize(dates)
+    if (codes < 0).any():
+        raise ValueError(f"Invalid dates found in '{column}'")
+    parsed = pd.Series(pd.to_datetime(uniques, format=ISO_DATE_FORMAT, errors="coerce"))
+    failed = parsed.isna().to_numpy()
+    if failed.any():
+        parsed[failed] = pd.to_datetime(
+            pd.Series(uniques[failed]), errors="coerce"
+        ).to_numpy()
+        if parsed.isna().any():
+            raise ValueError(f"Invalid dates found in '{column}'")
+    return parsed.dt.dayofyear.to_numpy()[codes]
+
+
+def seasonal_sums(group_ids: pd.Series, doy: np.ndarray) -> pd.DataFrame:
+    """Per-group interaction count and sums of the day-of-year sine/cosine.
+
+    Sums are additive across chunks of interactions, unlike means. Rows with
+    a missing group id are dropped, as ``groupby`` does.
+
+    Args:
+        group_ids: Group (recipe) id of every interaction.
+        doy: Day of year of every interaction (see :func:`parse_day_of_year`).
+
+    Returns:
+        pd.DataFrame: Columns ``n``, ``sin_sum`` and ``cos_sum`` indexed by
+        the sorted group ids.
+    """
+    codes, uniques = pd.factorize(group_ids, sort=True)
+    known = codes >= 0
+    codes, rows = codes[known], np.asarray(doy)[known] - 1
+    n_groups = len(uniques)
+    sin_sum = np.bincount(codes, weights=DOY_SIN[rows], minlength=n_groups)
+    cos_sum = np.bincount(codes, weights=DOY_COS[rows], minlength=n_groups)
+    return pd.DataFrame(
+        {
+            "n": np.bincount(codes, minlength=n_groups),
+            "sin_sum": sin_sum.astype(float),
+            "cos_sum": cos_sum.astype(float),
+        },
+        index=pd.Index(uniques, name=group_ids.name),
+    )
+
+
+def add_seasonal_sums(totals: pd.DataFrame | None, sums: pd.DataFrame) -> pd.DataFrame:
+    """Return ``totals + sums`` aligned on group ids (``sums`` when no totals).
+
+    Args:
+        totals: Running totals, or ``None`` before the first batch.
+        sums: Totals of a new batch (see :func:`seasonal_sums`).
+
+    Returns:
+        pd.DataFrame: Combined totals with an integer ``n`` column.
+    """
+    if totals is None:
+        return sums
+    combined = totals.add(sums, fill_value=0)
+    combined["n"] = combined["n"].astype(np.int64)
+    return combined
+
+
+def smooth_seasonality(
+    totals: pd.DataFrame, k: float = 5.0
+) -> tuple[pd.DataFrame, float, float]:
+    """Turn per-group totals into empirically smoothed seasonality features.
+
+    Each group's mean sine/cosine is shrunk toward the global mean with
+    strength ``k``; ``inter_strength`` is the length of the smoothed vector.
+
+    Args:
+        totals: Output of :func:`seasonal_sums`, possibly summed over chunks.
+        k: Smoothing strength (pseudo-count of the global mean).
+
+    Returns:
+        tuple[pd.DataFrame, float, float]: Features with the group column,
+        ``inter_doy_sin_smooth``, ``inter_doy_cos_smooth`` and
+        ``inter_strength`` sorted by group, then the global sine and cosine
+        means.
+    """
+    agg = totals.sort_index()
+    n = agg["n"].to_numpy(np.int64)
+    n_total = n.sum()
+    sin_global = float(agg["sin_sum"].sum() / n_total) if n_total else np.nan
+    cos_global = float(agg["cos_sum"].sum() / n_total) if n_total else np.nan
+
+    sin_smooth = (agg["sin_sum"].to_numpy() + k * sin_global) / (n + k)
+    cos_smooth = (agg["cos_sum"].to_numpy() + k * cos_global) / (n + k)
+    features = pd.DataFrame(
+        {
+            agg.index.name: agg.index.to_numpy(),
+            "inter_doy_sin_smooth": sin_smooth,
+            "inter_doy_cos_smooth": cos_smooth,
+            "inter_strength": np.sqrt(sin_smooth**2 + cos_smooth**2),
+        }
+    )
+    return features, sin_global, cos_global
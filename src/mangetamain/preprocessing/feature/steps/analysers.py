@@ -35,6 +35,9 @@ class StepsAnalyser(Analyser):
     correlation between them.
     """
 
+    # Complexity features only depend on recipes
+    INTERACTION_COLUMNS: tuple[str, ...] = ()
+
     def __init__(self, *, logger: logging.Logger | None = None) -> None:
         """Initializes the StepsAnalyser.
 
@@ -2,11 +2,25 @@ import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 
+from .feature.seasonality.day_of_year import (
+    add_seasonal_sums,
+    parse_day_of_year,
+    seasonal_sums,
+    smooth_seasonality,
+)
+
+FEATURE_COLUMNS = ["inter_doy_sin_smooth", "inter_doy_cos_smooth", "inter_strength"]
+
 
 class RecipeSeasonalityFeatureBuilder(BaseEstimator, TransformerMixin):
     """
     Transformer that computes seasonality features for recipes based on user
     interaction data.
+
+    The fitted state is the per-recipe interaction count and day-of-year
+    sine/cosine sums (``totals_``); the global sums are their column totals.
+    ``partial_fit`` adds a new batch of interactions to that state and
+    refreshes the smoothed features without the interaction history.
     """
 
     def __init__(self, date_col="date", group_col="recipe_id", k=5.0):
@@ -26,9 +40,11 @@ class RecipeSeasonalityFeatureBuilder(BaseEstimator, TransformerMixin):
         self.k = k
 
         # Attributes learned during fit
+        self.totals_ = None
         self.feature_df_ = None
         self.sin_global_ = None
         self.cos_global_ = None
+        self._feature_index = None
 
     def fit(self, X: pd.DataFrame, y=None):
         """
@@ -46,65 +62,52 @@ class RecipeSeasonalityFeatureBuilder(BaseEstimator, TransformerMixin):
         self : object
             Fitted transformer.
         """
-        X = X.copy()
+        self.totals_ = None
+        return self.partial_fit(X)
 
+    def partial_fit(self, X: pd.DataFrame, y=None):
+        """
+        Add a batch of interactions to the fitted state.
+
+        Per-recipe counts and sine/cosine sums of the batch are added to
+        ``totals_``, then the smoothed features and global means are
+        recomputed from the totals. Fitting batches one after the other gives
+        the same result as ``fit`` on their concatenation.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            New interactions containing at least date_col and group_col.
+        y : ignored
+            Not used (exists for sklearn compatibility).
+
+        Returns
+        -------
+        self : object
+            Updated transformer.
+        """
         # Validate required columns
         if self.date_col not in X.columns or self.group_col not in X.columns:
             raise ValueError(f"X must contain '{self.date_col}' and '{self.group_col}'")
 
-        # Convert date column to datetime and compute day-of-year
-        X[self.date_col] = pd.to_datetime(X[self.date_col], errors="coerce")
-        if X[self.date_col].isna().any():
-            raise ValueError(f"Invalid dates found in '{self.date_col}'")
-
-        doy = X[self.date_col].dt.dayofyear
-        X["doy_sin"] = np.sin(2 * np.pi * doy / 365)
-        X["doy_cos"] = np.cos(2 * np.pi * doy / 365)
-
-        # Compute global sine/cosine averages for smoothing
-        self.sin_global_ = X["doy_sin"].mean()
-        self.cos_global_ = X["doy_cos"].mean()
-
-        # Aggregate per recipe_id
-        agg = (
-            X.groupby(self.group_col)
-            .agg(
-                sin_mean=("doy_sin", "mean"),
-                cos_mean=("doy_cos", "mean"),
-                n=("doy_sin", "size"),
-            )
-            .reset_index()
+        # Day-of-year lookup tables and bincount totals, then smoothing
+        doy = parse_day_of_year(X[self.date_col], column=self.date_col)
+        self.totals_ = add_seasonal_sums(
+            self.totals_, seasonal_sums(X[self.group_col], doy)
         )
-
-        # Empirical Bayes smoothing
-        agg["inter_doy_sin_smooth"] = (
-            agg["n"] * agg["sin_mean"] + self.k * self.sin_global_
-        ) / (agg["n"] + self.k)
-
-        agg["inter_doy_cos_smooth"] = (
-            agg["n"] * agg["cos_mean"] + self.k * self.cos_global_
-        ) / (agg["n"] + self.k)
-
-        # Compute seasonal strength (vector length)
-        agg["inter_strength"] = np.sqrt(
-            agg["inter_doy_sin_smooth"] ** 2 + agg["inter_doy_cos_smooth"] ** 2
+        self.feature_df_, self.sin_global_, self.cos_global_ = smooth_seasonality(
+            self.totals_, k=self.k
         )
-
-        # Store only the aggregated features for merging later
-        self.feature_df_ = agg[
-            [
-                self.group_col,
-                "inter_doy_sin_smooth",
-                "inter_doy_cos_smooth",
-                "inter_strength",
-            ]
-        ]
+        self._feature_index = pd.Index(self.feature_df_[self.group_col])
 
         return self
 
     def transform(self, X: pd.DataFrame):
         """
-        Merge the precomputed seasonality features into the recipes DataFrame.
+        Add the fitted seasonality features to the recipes DataFrame.
+
+        Recipes are matched on ``id`` through a hash index of the fitted
+        recipe ids; rows are returned in input order with a fresh index.
 
         Parameters
         ----------
@@ -119,20 +122,18 @@ class RecipeSeasonalityFeatureBuilder(BaseEstimator, TransformerMixin):
         if self.feature_df_ is None:
             raise RuntimeError("Must fit on interactions before transforming recipes")
 
-        X_out = X.copy()
-
-        # Merge seasonal features into recipes
-        X_out = X_out.merge(
-            self.feature_df_, left_on="id", right_on=self.group_col, how="left"
-        )
-
-        # Fill missing recipes (not seen in interactions) with global values
-        X_out["inter_doy_sin_smooth"] = X_out["inter_doy_sin_smooth"].fillna(
-            self.sin_global_
-        )
-        X_out["inter_doy_cos_smooth"] = X_out["inter_doy_cos_smooth"].fillna(
-            self.cos_global_
-        )
-        X_out["inter_strength"] = X_out["inter_strength"].fillna(0.0)
+        X_out = X.reset_index(drop=True)
+        rows = self._feature_index.get_indexer(X_out["id"])
+        seen = rows >= 0
+        if self.group_col != "id":
+            # Fitted ids of the matches, NaN for unseen recipes (as a left merge)
+            group_ids = pd.Series(self._feature_index[rows])
+            X_out[self.group_col] = group_ids if seen.all() else group_ids.where(seen)
+
+        # Missing recipes (not seen in interactions) get global values
+        defaults = np.array([self.sin_global_, self.cos_global_, 0.0])
+        values = self.feature_df_[FEATURE_COLUMNS].to_numpy()[rows]
+        values[~seen] = defaults
+        X_out[FEATURE_COLUMNS] = values
 
         return X_out
@@ -0,0 +1,321 @@
+"""Recipe-id-aligned columnar store of the analysers' feature tables.
+
+Every analyser writes one feature table indexed by recipe id
+(``nutrition_table.csv``, ``rating_table.csv``…). Joining them used to mean
+parsing every CSV and chaining ``DataFrame.merge`` calls on the index, each
+call copying the whole table built so far. :class:`FeatureStore` keeps one
+Parquet column group per analyser in a shared directory, each with the
+recipe id as key column, and assembles any selection of their columns side
+by side:
+
+- only the requested columns are decoded (Parquet column projection);
+- the rows kept are the recipe ids present in every group, in the order of
+  the first group, as with inner merges on the index;
+- a group whose ids already follow that order is used as is, the others are
+  gathered once with ``Table.take``; the columns are then put together in a
+  single Arrow table, without copying, and converted to pandas once.
+
+Groups are rebuilt from their source table only when it changes (same
+fingerprint checks as :class:`~mangetamain.preprocessing.cache.ParquetCache`),
+so tables of cached stages or backup files are converted once.
+
+Groups are rebuilt (:meth:`FeatureStore.ensure_all`) and decoded
+(:meth:`FeatureStore.read`) concurrently in a thread pool, as CSV parsing
+and Parquet decoding mostly release the GIL: loading is bound by the
+largest table rather than by the sum. The time spent on every group is
+logged.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import TypeVar
+
+import numpy as np
+import pandas as pd
+
+from .cache import FileFingerprint, _atomic_write_text, read_fresh_meta
+
+FEATURE_STORE_FORMAT_VERSION = 1
+
+#: Key column holding the recipe id in every group file
+RECIPE_ID_COLUMN = "__recipe_id__"
+
+T = TypeVar("T")
+
+
+class FeatureStore:
+    """Directory of recipe-id-keyed Parquet column groups.
+
+    Args:
+        store_dir: Directory of the ``<group>.parquet`` files and their
+            metadata sidecars. Created on first write.
+        max_workers: Threads loading groups concurrently; ``None`` uses one
+            per CPU (at most one per group) and ``1`` loads them in turn.
+        logger: Optional logger.
+    """
+
+    def __init__(
+        self,
+        store_dir: str | Path,
+        *,
+        max_workers: int | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.store_dir = Path(store_dir)
+        self.max_workers = max_workers
+        self._logger = logger or logging.getLogger(
+            "mangetamain.preprocessing.feature_store"
+        )
+
+    def path_for(self, group: str) -> Path:
+        """Return the Parquet location of column group ``group``."""
+        return self.store_dir / f"{group}.parquet"
+
+    def _meta_path(self, group: str) -> Path:
+        return self.path_for(group).with_suffix(".meta.json")
+
+    def _read_meta(self, group: str) -> dict:
+        try:
+            return json.loads(self._meta_path(group).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def write(
+        self,
+        group: str,
+        table: pd.DataFrame,
+        *,
+        source: str | Path | None = None,
+    ) -> Path:
+        """Store ``table``, indexed by recipe id, as column group ``group``.
+
+        Args:
+            group: Group name, e.g. the analyser name.
+            table: Feature table indexed by recipe id.
+            source: File ``table`` was read from, recorded so that
+                :meth:`ensure` can tell when the group is stale.
+
+        Returns:
+            Path: Location of the group file.
+
+        Raises:
+            ValueError: If recipe ids are duplicated or a column uses the
+                reserved key column name.
+        """
+        fingerprint = None if source is None else FileFingerprint.from_path(source)
+        return self._write(group, table, source, fingerprint)
+
+    def _write(
+        self,
+        group: str,
+        table: pd.DataFrame,
+        source: str | Path | None,
+        fingerprint: FileFingerprint | None,
+    ) -> Path:
+        if not table.index.is_unique:
+            raise ValueError(f"Recipe ids of feature group {group!r} must be unique")
+        if RECIPE_ID_COLUMN in table.columns:
+            raise ValueError(f"{RECIPE_ID_COLUMN!r} is reserved for the recipe id")
+
+        path = self.path_for(group)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        table.reset_index(names=RECIPE_ID_COLUMN).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        meta = {
+            "format_version": FEATURE_STORE_FORMAT_VERSION,
+            "index_name": table.index.name,
+            "n_rows": len(table),
+            "source": None if source is None else str(source),
+        }
+        if fingerprint is not None:
+            meta.update(asdict(fingerprint))
+        _atomic_write_text(self._meta_path(group), json.dumps(meta))
+        return path
+
+    def is_fresh(self, group: str, source: str | Path) -> bool:
+        """Return ``True`` when ``group`` was written from the current ``source``."""
+        if not self.path_for(group).exists():
+            return False
+        meta = read_fresh_meta(
+            source, self._meta_path(group), FEATURE_STORE_FORMAT_VERSION
+        )
+        return meta is not None
+
+    def ensure(
+        self,
+        group: str,
+        source: str | Path,
+        read_source: Callable[[Path], pd.DataFrame],
+    ) -> Path:
+        """(Re)write ``group`` from ``source`` if stale and return its path.
+
+        Args:
+            group: Group name.
+            source: Feature table file the group mirrors.
+            read_source: Callable parsing ``source`` into a dataframe indexed
+                by recipe id. It is only invoked when the group is stale.
+
+        Returns:
+            Path: Location of the up-to-date group file.
+        """
+        source = Path(source)
+        if self.is_fresh(group, source):
+            self._logger.debug("Feature group %s is up to date", group)
+            return self.path_for(group)
+
+        self._logger.info("Writing feature group %s from %s", group, source)
+        fingerprint = FileFingerprint.from_path(source)
+        return self._write(group, read_source(source), source, fingerprint)
+
+    def ensure_all(
+        self,
+        sources: Mapping[str, str | Path],
+        read_source: Callable[[Path], pd.DataFrame],
+    ) -> dict[str, Path]:
+        """Run :meth:`ensure` for every ``group: source`` pair concurrently.
+
+        Returns:
+            dict[str, Path]: Location of every group file, in ``sources``
+            order.
+        """
+        groups = list(sources)
+        paths = self._map_timed(
+            "Checked",
+            lambda group: self.ensure(group, sources[group], read_source),
+            groups,
+        )
+        return dict(zip(groups, paths, strict=True))
+
+    def _map_timed(
+        self, action: str, func: Callable[[str], T], groups: Sequence[str]
+    ) -> list[T]:
+        """Apply ``func`` to every group in the thread pool, logging timings."""
+
+        def timed(group: str) -> tuple[T, float]:
+            start = time.perf_counter()
+            result = func(group)
+            return result, time.perf_counter() - start
+
+        workers = self.max_workers or min(os.cpu_count() or 1, len(groups))
+        start = time.perf_counter()
+        if workers <= 1 or len(groups) <= 1:
+            outcomes = [timed(group) for group in groups]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(timed, groups))
+        wall = time.perf_counter() - start
+
+        for group, (_, seconds) in zip(groups, outcomes, strict=True):
+            self._logger.info("%s feature group %s in %.3fs", action, group, seconds)
+        self._logger.info(
+            "%s %d feature groups in %.3fs (%.3fs summed, %d thread(s))",
+            action,
+            len(groups),
+            wall,
+            sum(seconds for _, seconds in outcomes),
+            workers,
+        )
+        return [result for result, _ in outcomes]
+
+    def columns(self, group: str) -> list[str]:
+        """Return the columns of ``group`` in file order.
+
+        Raises:
+            FileNotFoundError: If the group has not been written.
+        """
+        import pyarrow.parquet as pq
+
+        path = self.path_for(group)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Feature group {group!r} not found in {self.store_dir}"
+            )
+        return [c for c in pq.read_schema(path).names if c != RECIPE_ID_COLUMN]
+
+    def read(
+        self,
+        groups: Sequence[str],
+        *,
+        columns: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """Assemble ``groups`` side by side on the recipe ids they share.
+
+        Args:
+            groups: Column groups, left to right. Rows follow the order of
+                the first group, restricted to ids present in every group.
+            columns: Columns to read; ``None`` reads all of them. A column
+                present in several groups is taken from the first one.
+
+        Returns:
+            pd.DataFrame: Indexed by recipe id, named as in the first group,
+            with columns in group then file order.
+
+        Raises:
+            FileNotFoundError: If a group has not been written.
+            ValueError: If ``groups`` is empty or a requested column is in
+                none of them.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not groups:
+            raise ValueError("At least one feature group is required")
+        wanted = None if columns is None else set(columns)
+        seen: set[str] = set()
+        projections = {}
+        for group in groups:
+            names = [
+                c
+                for c in self.columns(group)
+                if c not in seen and (wanted is None or c in wanted)
+            ]
+            seen.update(names)
+            projections[group] = [RECIPE_ID_COLUMN, *names]
+        if columns is not None:
+            missing = [c for c in columns if c not in seen]
+            if missing:
+                raise ValueError(
+                    f"Columns not found in feature groups {list(groups)}: {missing}"
+                )
+        tables = self._map_timed(
+            "Read",
+            lambda group: pq.read_table(
+                self.path_for(group), columns=projections[group]
+            ),
+            list(groups),
+        )
+
+        ids = [table.column(RECIPE_ID_COLUMN).to_numpy() for table in tables]
+        keys = pd.Index(ids[0])
+        keep = np.ones(len(keys), dtype=bool)
+        for other in ids[1:]:
+            keep &= keys.isin(other)
+        common = keys[keep]
+
+        arrays, names = [], []
+        for table, group_ids in zip(tables, ids, strict=True):
+            rows = pd.Index(group_ids).get_indexer(common)
+            aligned = len(rows) == len(group_ids) and bool(
+                (rows == np.arange(len(rows))).all()
+            )
+            if not aligned:
+                table = table.take(rows)
+            arrays.extend(table.columns[1:])
+            names.extend(table.column_names[1:])
+
+        index = pd.Index(common, name=self._read_meta(groups[0]).get("index_name"))
+        if not arrays:
+            return pd.DataFrame(index=index)
+        frame = pa.Table.from_arrays(arrays, names=names).to_pandas()
+        frame.index = index
+        return frame
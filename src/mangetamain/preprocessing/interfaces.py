@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import abc
 import logging
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Protocol
@@ -24,6 +25,39 @@ class IDataRepository(abc.ABC):
     ) -> pd.DataFrame:  # pragma: no cover
         """Return the raw interactions dataframe."""
 
+    def iter_interactions(
+        self, chunksize: int, *, columns: Sequence[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the interactions in chunks of at most ``chunksize`` rows.
+
+        The default implementation slices the fully loaded table; file-backed
+        repositories override it to stream from disk in bounded memory.
+
+        Args:
+            chunksize: Maximum number of rows per chunk.
+            columns: Columns to keep (all when ``None``).
+        """
+        interactions = self.load_interactions()
+        if columns is not None:
+            interactions = interactions[list(columns)]
+        for start in range(0, len(interactions), chunksize):
+            yield interactions.iloc[start : start + chunksize]
+
+    def prepare_recipes(self) -> None:  # noqa: B027 - optional hook
+        """Get the recipes ready to be loaded, without loading them.
+
+        Same contract as :meth:`prepare_interactions`; nothing to do by
+        default.
+        """
+
+    def prepare_interactions(self) -> None:  # noqa: B027 - optional hook
+        """Get the interactions ready for :meth:`iter_interactions`.
+
+        Called once before the interactions are streamed, so that any costly
+        preparation (e.g. building an on-disk cache) is not repeated by each
+        consumer. Nothing to do by default.
+        """
+
 
 class IValidator(abc.ABC):
     """Validation contract applied to dataframes before processing."""
@@ -34,7 +68,14 @@ class IValidator(abc.ABC):
 
 
 class ICleaningStrategy(Protocol):
-    """Strategy to clean raw dataframes prior to preprocessing."""
+    """Strategy to clean raw dataframes prior to preprocessing.
+
+    Strategies that modify their input dataframes in place must set
+    ``mutates_inputs = True`` so processors hand them private copies; others
+    receive the caller's frames as-is and must not write into them.
+    """
+
+    mutates_inputs: bool = False
 
     def clean(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
@@ -43,7 +84,12 @@ class ICleaningStrategy(Protocol):
 
 
 class IPreprocessingStrategy(Protocol):
-    """Strategy to transform cleaned dataframes into model-ready form."""
+    """Strategy to transform cleaned dataframes into model-ready form.
+
+    Same ownership contract as :class:`ICleaningStrategy`.
+    """
+
+    mutates_inputs: bool = False
 
     def preprocess(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
@@ -53,11 +99,22 @@ class IPreprocessingStrategy(Protocol):
 
 @dataclass(frozen=True)
 class ProcessedPair:
-    """Container for a pair of dataframes used across the pipeline."""
+    """Container for a pair of dataframes used across the pipeline.
+
+    The frames may share memory with the repository that produced them (no
+    copy is made by pass-through strategies). Consumers that need to modify
+    values in place should call :meth:`copy` first.
+    """
 
     recipes: pd.DataFrame
     interactions: pd.DataFrame
 
+    def copy(self) -> ProcessedPair:
+        """Return a pair owning deep copies of both dataframes."""
+        return ProcessedPair(
+            recipes=self.recipes.copy(), interactions=self.interactions.copy()
+        )
+
 
 @dataclass(frozen=True)
 class AnalysisResult:
@@ -72,6 +129,10 @@ class AnalysisResult:
 class Analyser(abc.ABC):
     """Abstract base for domain analyzers (rating, ingredients, steps, …)."""
 
+    # Interaction columns the analyser reads: ``None`` for all of them, ``()``
+    # when it only works on recipes and interactions need not be loaded
+    INTERACTION_COLUMNS: tuple[str, ...] | None = None
+
     @abc.abstractmethod
     def analyze(
         self,
@@ -116,11 +177,20 @@ class DataProcessor(abc.ABC):
     ) -> ProcessedPair:  # pragma: no cover - interface only
         """Return preprocessed dataframes."""
 
-    def run(self) -> ProcessedPair:
-        """Load, clean, and preprocess data in sequence."""
+    def run(self, *, load_interactions: bool = True) -> ProcessedPair:
+        """Load, clean, and preprocess data in sequence.
+
+        Args:
+            load_interactions: When ``False``, the interactions are not loaded
+                and strategies receive an empty dataframe instead, for
+                analysers working on recipes only.
+        """
         self._logger.debug("Loading raw dataframes from repository")
         recipes = self._repository.load_recipes()
-        interactions = self._repository.load_interactions()
+        if load_interactions:
+            interactions = self._repository.load_interactions()
+        else:
+            interactions = pd.DataFrame()
 
         self._logger.debug("Cleaning dataframes")
         cleaned = self.clean(recipes, interactions)
@@ -128,3 +198,21 @@ class DataProcessor(abc.ABC):
         self._logger.debug("Preprocessing dataframes")
         preprocessed = self.preprocess(cleaned.recipes, cleaned.interactions)
         return preprocessed
+
+    def iter_chunks(
+        self, chunksize: int, *, columns: Sequence[str] | None = None
+    ) -> Iterator[ProcessedPair]:
+        """Stream interaction chunks through cleaning and preprocessing.
+
+        Recipes are loaded once and paired with every chunk, so strategies
+        must be row-local on interactions (as the rating and seasonality
+        ones are) for the chunks to add up to :meth:`run`.
+
+        Args:
+            chunksize: Maximum number of interactions per chunk.
+            columns: Interaction columns to read (all when ``None``).
+        """
+        recipes = self._repository.load_recipes()
+        for chunk in self._repository.iter_interactions(chunksize, columns=columns):
+            cleaned = self.clean(recipes, chunk)
+            yield self.preprocess(cleaned.recipes, cleaned.interactions)
@@ -20,7 +20,7 @@ class NoOpCleaning(ICleaningStrategy):
     def clean(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        return recipes.copy(), interactions.copy()
+        return recipes, interactions
 
 
 class NoOpPreprocessing(IPreprocessingStrategy):
@@ -29,11 +29,17 @@ class NoOpPreprocessing(IPreprocessingStrategy):
     def preprocess(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
-        return recipes.copy(), interactions.copy()
+        return recipes, interactions
 
 
 class BasicDataProcessor(DataProcessor):
-    """Orchestrates cleaning and preprocessing via Strategy pattern."""
+    """Orchestrates cleaning and preprocessing via Strategy pattern.
+
+    With ``copy_on_write=True`` (default) dataframes flow through the strategy
+    chain without copies; only strategies declaring ``mutates_inputs = True``
+    receive private deep copies. ``copy_on_write=False`` restores eager
+    defensive copies before every strategy.
+    """
 
     def __init__(
         self,
@@ -42,18 +48,32 @@ class BasicDataProcessor(DataProcessor):
         cleaning: ICleaningStrategy | None = None,
         preprocessing: IPreprocessingStrategy | None = None,
         logger: logging.Logger | None = None,
+        copy_on_write: bool = True,
     ) -> None:
         super().__init__(repository, logger=logger)
         self._cleaning = cleaning or NoOpCleaning()
         self._preprocessing = preprocessing or NoOpPreprocessing()
+        self._copy_on_write = copy_on_write
+
+    def _inputs_for(
+        self, strategy: object, recipes: pd.DataFrame, interactions: pd.DataFrame
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        if self._copy_on_write and not getattr(strategy, "mutates_inputs", False):
+            return recipes, interactions
+        self._logger.debug("Copying inputs for %s", type(strategy).__name__)
+        return recipes.copy(), interactions.copy()
 
     def clean(self, recipes: pd.DataFrame, interactions: pd.DataFrame) -> ProcessedPair:
+        recipes, interactions = self._inputs_for(self._cleaning, recipes, interactions)
         recipes_c, interactions_c = self._cleaning.clean(recipes, interactions)
         return ProcessedPair(recipes=recipes_c, interactions=interactions_c)
 
     def preprocess(
         self, recipes: pd.DataFrame, interactions: pd.DataFrame
     ) -> ProcessedPair:
+        recipes, interactions = self._inputs_for(
+            self._preprocessing, recipes, interactions
+        )
         recipes_p, interactions_p = self._preprocessing.preprocess(
             recipes, interactions
         )
@@ -0,0 +1,374 @@
+"""Compact parsed representation of stringified list columns.
+
+RAW Food.com columns such as ``ingredients``, ``tags`` or ``nutrition`` hold
+Python list reprs (``"['salt', 'water']"``, ``"[51.5, 0.0, 13.0]"``).
+Evaluating them with ``ast.literal_eval`` compiles every cell and yields
+hundreds of thousands of small Python lists. :class:`RaggedArray` stores a
+parsed column instead as flat ``values`` plus row ``offsets``; string items
+are dictionary-encoded against a ``vocabulary`` (in order of first
+appearance, like ``pd.unique``).
+
+A preprocessing strategy parses a column once and attaches the result to the
+recipes frame with :func:`attach_parsed`; every consumer then retrieves it
+with :func:`parsed_column`, which only re-parses when nothing valid is
+attached. The attachment lives in ``DataFrame.attrs``, which pandas
+deep-copies on most operations; :class:`RaggedArray` returns itself from
+``__deepcopy__`` so that propagation stays free. The attached array records
+the index it was built for and is ignored once rows have been filtered or
+reordered.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+PARSED_ATTR = "mangetamain.parsed"
+
+# Quoted items of a list repr; escapes are left to ``ast.literal_eval``
+_QUOTED = re.compile(r"'([^'\\]*)'|\"([^\"\\]*)\"")
+
+# Rows of number lists parsed per ``np.fromstring`` call; a block holding a
+# malformed cell is re-parsed row by row
+_NUMBER_BLOCK_ROWS = 8192
+
+
+def _parse_string_list(cell: object) -> list | None:
+    if isinstance(cell, (list, tuple, np.ndarray)):
+        return list(cell)
+    if not isinstance(cell, str):
+        return None
+    text = cell.strip()
+    if "\\" in text or not (text.startswith("[") and text.endswith("]")):
+        return list(ast.literal_eval(text))
+    return [single or double for single, double in _QUOTED.findall(text)]
+
+
+def _parse_number_list(cell: object) -> list | None:
+    if isinstance(cell, (list, tuple, np.ndarray)):
+        return [float(x) for x in cell]
+    if not isinstance(cell, str):
+        return None
+    text = cell.strip()
+    if text.startswith("[") and text.endswith("]"):
+        body = text[1:-1].strip()
+        if not body:
+            return []
+        try:
+            return [float(x) for x in body.split(",")]
+        except ValueError:
+            pass
+    return [float(x) for x in ast.literal_eval(text)]
+
+
+def _parse_number_block(texts: list[str]) -> tuple[np.ndarray, np.ndarray] | None:
+    """Parse ``"[x, y, ...]"`` cells with one C-level ``np.fromstring`` call.
+
+    The cells are joined into one ASCII buffer; the bracket and comma
+    positions give every row length, then the brackets are blanked out (the
+    closing one becomes the separator) and the whole buffer is parsed at once.
+
+    Returns:
+        Row lengths and flat ``float64`` values, or ``None`` when a cell is
+        not a plain bracketed number list or has an empty item (left to the
+        row-level parser).
+    """
+    sizes = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    if not len(texts):
+        return sizes, np.empty(0, dtype=np.float64)
+    if (sizes < 2).any():
+        return None
+    try:
+        buf = np.frombuffer("".join(texts).encode("ascii"), dtype=np.uint8).copy()
+    except UnicodeEncodeError:
+        return None
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+    brackets = (buf == ord("[")) | (buf == ord("]"))
+    if (
+        brackets.sum() != 2 * len(texts)
+        or (buf[starts] != ord("[")).any()
+        or (buf[ends - 1] != ord("]")).any()
+    ):
+        return None
+    # ``np.fromstring`` reads an empty item (``[1, ]``, ``[1,, 2]``) as -1
+    shown = buf[buf > ord(" ")]
+    after_comma = np.isin(shown[1:], (ord(","), ord("]")))
+    if (
+        ((shown[:-1] == ord(",")) & after_comma)
+        | ((shown[:-1] == ord("[")) & (shown[1:] == ord(",")))
+    ).any():
+        return None
+
+    # Non-blank characters and commas between each pair of brackets
+    visible = np.concatenate([[0], np.cumsum(buf > ord(" "))])
+    commas = np.concatenate([[0], np.cumsum(buf == ord(","))])
+    filled = visible[ends - 1] - visible[starts + 1] > 0
+    lengths = np.where(filled, commas[ends] - commas[starts] + 1, 0)
+
+    buf[starts] = ord(" ")
+    buf[ends - 1] = np.where(filled, ord(","), ord(" "))
+    if not lengths.sum():
+        return lengths, np.empty(0, dtype=np.float64)
+    try:
+        with warnings.catch_warnings():
+            # Older NumPy only warns on unparsable text
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(buf.tobytes(), sep=",")
+    except (ValueError, DeprecationWarning):
+        return None
+    if len(values) != lengths.sum():
+        return None
+    return lengths, values
+
+
+def _parse_number_lists(
+    series: pd.Series,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse a column of number lists into offsets, ``float64`` values, missing.
+
+    String cells are parsed in blocks of :data:`_NUMBER_BLOCK_ROWS` rows by
+    :func:`_parse_number_block`; blocks holding other cells (malformed text,
+    Python lists) fall back to :func:`_parse_number_list` for each row.
+    """
+    cells = series.to_numpy(dtype=object)
+    # 0: missing, 1: string, 2: already a sequence
+    kinds = np.fromiter(
+        (
+            (
+                1
+                if isinstance(c, str)
+                else 2 if isinstance(c, (list, tuple, np.ndarray)) else 0
+            )
+            for c in cells
+        ),
+        dtype=np.int8,
+        count=len(cells),
+    )
+    missing = kinds == 0
+
+    lengths = np.zeros(len(cells), dtype=np.int64)
+    pieces = []
+    for start in range(0, len(cells), _NUMBER_BLOCK_ROWS):
+        block = slice(start, start + _NUMBER_BLOCK_ROWS)
+        text = kinds[block] == 1
+        parsed = None
+        if not (kinds[block] == 2).any():
+            parsed = _parse_number_block([c.strip() for c in cells[block][text]])
+        if parsed is not None:
+            lengths[block][text] = parsed[0]
+            pieces.append(parsed[1])
+            continue
+        rows = [_parse_number_list(cell) for cell in cells[block]]
+        lengths[block] = [len(r) if r is not None else 0 for r in rows]
+        pieces.append(np.array([x for r in rows if r for x in r], dtype=np.float64))
+
+    offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.concatenate(pieces) if pieces else np.empty(0, dtype=np.float64)
+    return offsets, values, missing
+
+
+def _flatten(rows: list[list | None]) -> tuple[np.ndarray, list, np.ndarray]:
+    missing = np.fromiter((r is None for r in rows), dtype=bool, count=len(rows))
+    lengths = np.fromiter(
+        (len(r) if r is not None else 0 for r in rows),
+        dtype=np.int64,
+        count=len(rows),
+    )
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = [item for r in rows if r for item in r]
+    return offsets, flat, missing
+
+
+@dataclass(frozen=True, eq=False)
+class RaggedArray:
+    """Variable-length rows stored as flat values and offsets.
+
+    Row ``i`` holds ``values[offsets[i]:offsets[i + 1]]``. For string columns
+    ``values`` are ``int32`` codes into ``vocabulary``.
+
+    Attributes:
+        offsets: ``int64`` array of length ``n_rows + 1``.
+        values: Flat item codes (strings) or ``float64`` values (numbers).
+        index: Row labels of the frame the column was parsed from.
+        vocabulary: Distinct string items, or ``None`` for numeric columns.
+        missing: Boolean mask of rows that were missing (NaN) in the source.
+    """
+
+    offsets: np.ndarray
+    values: np.ndarray
+    index: pd.Index
+    vocabulary: np.ndarray | None = None
+    missing: np.ndarray | None = None
+
+    # ---- construction -------------------------------------------------------
+    @classmethod
+    def from_string_lists(cls, series: pd.Series) -> RaggedArray:
+        """Parse a column of stringified string lists.
+
+        Raises:
+            ValueError: If a non-missing cell is not a valid list literal.
+        """
+        rows = [_parse_string_list(cell) for cell in series]
+        offsets, flat, missing = _flatten(rows)
+        codes, vocabulary = pd.factorize(pd.Series(flat, dtype=object))
+        return cls(
+            offsets=offsets,
+            values=codes.astype(np.int32),
+            index=series.index,
+            vocabulary=np.asarray(vocabulary, dtype=object),
+            missing=missing,
+        )
+
+    @classmethod
+    def from_number_lists(cls, series: pd.Series) -> RaggedArray:
+        """Parse a column of stringified number lists into ``float64`` values.
+
+        Well-formed cells are parsed block-wise in C; only blocks holding a
+        malformed cell are parsed row by row.
+
+        Raises:
+            ValueError: If a non-missing cell is not a valid list literal.
+        """
+        offsets, values, missing = _parse_number_lists(series)
+        return cls(offsets=offsets, values=values, index=series.index, missing=missing)
+
+    # ---- pandas attrs propagation ------------------------------------------
+    def __copy__(self) -> RaggedArray:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> RaggedArray:
+        # Immutable by convention: sharing is safe and keeps attrs cheap
+        return self
+
+    # ---- accessors ----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of items in each row."""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint of the arrays (vocabulary excluded)."""
+        return self.offsets.nbytes + self.values.nbytes
+
+    def row_ids(self) -> np.ndarray:
+        """Return the row position of every flat item."""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def items(self) -> np.ndarray:
+        """Return the flat decoded items (strings or numbers)."""
+        if self.vocabulary is None:
+            return self.values
+        return self.vocabulary[self.values]
+
+    def row(self, i: int) -> list:
+        """Return row ``i`` as a Python list."""
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return self.items()[start:stop].tolist()
+
+    def tolist(self) -> list[list]:
+        """Return all rows as Python lists (empty for missing rows)."""
+        items = self.items().tolist()
+        bounds = self.offsets.tolist()
+        return [items[a:b] for a, b in zip(bounds[:-1], bounds[1:], strict=True)]
+
+    def to_matrix(self, width: int, dtype: np.dtype = np.float32) -> np.ndarray:
+        """Return a numeric column as a dense ``(n_rows, width)`` array.
+
+        Shorter rows (and missing ones) are padded with NaN, like the
+        ``pd.DataFrame`` constructor does for lists of lists.
+
+        Raises:
+            ValueError: If the column holds strings or a row is longer than
+                ``width``.
+        """
+        if self.vocabulary is not None:
+            raise ValueError("Only numeric columns can be converted to a matrix")
+        lengths = self.lengths
+        if (lengths > width).any():
+            raise ValueError(f"Rows hold more than {width} values")
+        if (lengths == width).all():
+            return self.values.astype(dtype).reshape(len(self), width)
+        matrix = np.full((len(self), width), np.nan, dtype=dtype)
+        positions = np.arange(len(self.values)) - np.repeat(self.offsets[:-1], lengths)
+        matrix[self.row_ids(), positions] = self.values
+        return matrix
+
+    def matches(self, index: pd.Index) -> bool:
+        """Return ``True`` if the array was parsed for rows ``index``."""
+        return self.index is index or self.index.equals(index)
+
+
+def incidence_matrix(
+    parsed: RaggedArray, item_columns: np.ndarray, n_columns: int
+) -> sparse.csr_matrix:
+    """Return the sparse row x column count matrix of a string column.
+
+    Args:
+        parsed: Dictionary-encoded column.
+        item_columns: Column of each vocabulary entry; ``-1`` drops the item.
+        n_columns: Number of columns of the result.
+
+    Returns:
+        sparse.csr_matrix: ``int64`` matrix whose entry ``(i, j)`` counts the
+        items of row ``i`` mapped to column ``j``. Multiplying it by a
+        per-column feature matrix sums features per row; dividing by its row
+        sums gives the mean over the row's mapped items.
+    """
+    cols = np.asarray(item_columns, dtype=np.int64)[parsed.values]
+    known = cols >= 0
+    return sparse.csr_matrix(
+        (
+            np.ones(int(known.sum()), dtype=np.int64),
+            (parsed.row_ids()[known], cols[known]),
+        ),
+        shape=(len(parsed), n_columns),
+    )
+
+
+def attach_parsed(df: pd.DataFrame, parsed: dict[str, RaggedArray]) -> pd.DataFrame:
+    """Return a shallow copy of ``df`` carrying parsed columns in ``attrs``.
+
+    The input frame is left untouched, so frames shared through a memoized
+    repository are not modified.
+    """
+    out = df.copy(deep=False)
+    out.attrs[PARSED_ATTR] = {**out.attrs.get(PARSED_ATTR, {}), **parsed}
+    return out
+
+
+def parsed_column(
+    df: pd.DataFrame, column: str, *, numeric: bool = False
+) -> RaggedArray:
+    """Return column ``column`` of ``df`` parsed as a :class:`RaggedArray`.
+
+    Uses the array attached by a preprocessing strategy when it still matches
+    the rows of ``df``; parses the column otherwise.
+
+    Args:
+        df: Frame holding the stringified list column.
+        column: Column name.
+        numeric: Parse items as floats instead of strings.
+    """
+    attached = df.attrs.get(PARSED_ATTR, {}).get(column)
+    if (
+        attached is not None
+        and (attached.vocabulary is None) == numeric
+        and attached.matches(df.index)
+    ):
+        return attached
+    if numeric:
+        return RaggedArray.from_number_lists(df[column])
+    return RaggedArray.from_string_lists(df[column])
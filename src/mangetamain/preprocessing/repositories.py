@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
+import threading
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
 import pandas as pd
 
+from .cache import ParquetCache
 from .exceptions import DataLoadError, DataNotFoundError
 from .interfaces import IDataRepository
+from .schema import (
+    INTERACTIONS_SCHEMA,
+    RECIPES_SCHEMA,
+    CompactionReport,
+    TableSchema,
+    compact_frame,
+)
 
 
 @dataclass(frozen=True)
@@ -22,7 +31,13 @@ class RepositoryPaths:
 
 
 class CSVDataRepository(IDataRepository):
-    """Load dataframes from CSV files with optional column selection."""
+    """Load dataframes from CSV files with optional column selection.
+
+    With ``compact=True`` loaded tables are narrowed to the dtypes of
+    :data:`~.schema.RECIPES_SCHEMA` / :data:`~.schema.INTERACTIONS_SCHEMA`
+    (values unchanged); the last report per table is kept in
+    :attr:`compaction_reports`.
+    """
 
     def __init__(
         self,
@@ -30,6 +45,7 @@ class CSVDataRepository(IDataRepository):
         *,
         recipe_usecols: Sequence[str] | None = None,
         interaction_usecols: Sequence[str] | None = None,
+        compact: bool = False,
         logger: logging.Logger | None = None,
     ) -> None:
         self._paths = paths or RepositoryPaths()
@@ -37,9 +53,11 @@ class CSVDataRepository(IDataRepository):
         self._interaction_usecols = (
             list(interaction_usecols) if interaction_usecols else None
         )
+        self._compact = compact
         self._logger = logger or logging.getLogger(
             "mangetamain.preprocessing.repositories"
         )
+        self.compaction_reports: dict[str, CompactionReport] = {}
 
     def _ensure_exists(self, file_path: str) -> Path:
         path = Path(file_path)
@@ -48,21 +66,200 @@ class CSVDataRepository(IDataRepository):
             raise DataNotFoundError(str(path))
         return path
 
+    def _read_table(self, path: Path, usecols: list[str] | None) -> pd.DataFrame:
+        return pd.read_csv(path, usecols=usecols)
+
+    def _iter_table(
+        self, path: Path, usecols: list[str] | None, chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(path, usecols=usecols, chunksize=chunksize) as reader:
+            yield from reader
+
+    def _compact_table(self, df: pd.DataFrame, schema: TableSchema) -> pd.DataFrame:
+        if not self._compact:
+            return df
+        df, report = compact_frame(df, schema)
+        self.compaction_reports[schema.name] = report
+        report.log(self._logger)
+        return df
+
     def load_recipes(self) -> pd.DataFrame:
         path = self._ensure_exists(self._paths.recipes_csv)
         try:
-            df = pd.read_csv(path, usecols=self._recipe_usecols)
+            df = self._read_table(path, self._recipe_usecols)
             self._logger.debug("Loaded recipes: %d rows", len(df))
-            return df
+            return self._compact_table(df, RECIPES_SCHEMA)
         except Exception as exc:  # noqa: BLE001 - wrap into domain error
             raise DataLoadError(f"Failed to load recipes from {path}") from exc
 
     def load_interactions(self) -> pd.DataFrame:
         path = self._ensure_exists(self._paths.interactions_csv)
         try:
-            df = pd.read_csv(path, usecols=self._interaction_usecols)
+            df = self._read_table(path, self._interaction_usecols)
             self._logger.debug("Loaded interactions: %d rows", len(df))
-            return df
+            return self._compact_table(df, INTERACTIONS_SCHEMA)
         except Exception as exc:  # noqa: BLE001 - wrap into domain error
             msg = f"Failed to load interactions from {path}"
             raise DataLoadError(msg) from exc
+
+    def iter_interactions(
+        self, chunksize: int, *, columns: Sequence[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Stream the interactions from disk, ``chunksize`` rows at a time.
+
+        ``columns`` overrides ``interaction_usecols`` for this read.
+        """
+        path = self._ensure_exists(self._paths.interactions_csv)
+        usecols = list(columns) if columns is not None else self._interaction_usecols
+        try:
+            for chunk in self._iter_table(path, usecols, chunksize):
+                if self._compact:
+                    chunk, _ = compact_frame(chunk, INTERACTIONS_SCHEMA)
+                yield chunk
+        except Exception as exc:  # noqa: BLE001 - wrap into domain error
+            msg = f"Failed to stream interactions from {path}"
+            raise DataLoadError(msg) from exc
+
+
+class ParquetDataRepository(CSVDataRepository):
+    """CSV repository backed by a transparent Parquet cache.
+
+    The first load of each CSV parses it in full and writes a typed Parquet
+    copy under ``cache_dir``; later loads read the Parquet file instead,
+    projecting ``recipe_usecols``/``interaction_usecols`` at read time. The
+    cache is invalidated when the source size, modification time and content
+    hash no longer match (see :class:`~.cache.ParquetCache`).
+    """
+
+    def __init__(
+        self,
+        paths: RepositoryPaths | None = None,
+        *,
+        cache_dir: str | Path = "data/cache",
+        recipe_usecols: Sequence[str] | None = None,
+        interaction_usecols: Sequence[str] | None = None,
+        compact: bool = False,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        super().__init__(
+            paths,
+            recipe_usecols=recipe_usecols,
+            interaction_usecols=interaction_usecols,
+            compact=compact,
+            logger=logger,
+        )
+        self._cache = ParquetCache(cache_dir, logger=self._logger)
+
+    def _read_table(self, path: Path, usecols: list[str] | None) -> pd.DataFrame:
+        return self._cache.read(path, pd.read_csv, columns=usecols)
+
+    def _iter_table(
+        self, path: Path, usecols: list[str] | None, chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        if self._cache.is_fresh(path):
+            yield from self._cache.read_batches(
+                path, chunksize=chunksize, columns=usecols
+            )
+            return
+        # Building the cache would parse the whole file at once
+        self._logger.info("No fresh Parquet cache for %s, streaming the CSV", path)
+        yield from super()._iter_table(path, usecols, chunksize)
+
+    def _prepare(self, file_path: str, table: str) -> None:
+        path = self._ensure_exists(file_path)
+        try:
+            self._cache.ensure(path, pd.read_csv)
+        except Exception as exc:  # noqa: BLE001 - wrap into domain error
+            raise DataLoadError(f"Failed to cache {table} from {path}") from exc
+
+    def prepare_recipes(self) -> None:
+        """Build the recipes Parquet cache without keeping the table."""
+        self._prepare(self._paths.recipes_csv, "recipes")
+
+    def prepare_interactions(self) -> None:
+        """Build the interactions Parquet cache so later reads stream batches.
+
+        A stale cache is rebuilt by parsing the CSV in full, once; the parsed
+        table is dropped as soon as it is written.
+        """
+        self._prepare(self._paths.interactions_csv, "interactions")
+
+
+class MemoizedDataRepository(IDataRepository):
+    """Load-once wrapper sharing raw tables across processors.
+
+    Each table is fetched from the wrapped repository on first access and
+    served from memory afterwards. Callers receive shallow copies: adding or
+    dropping columns does not leak between consumers, but values are shared
+    and must be treated as read-only.
+
+    Hit/miss counters are kept per table so a run can verify that each raw
+    table is parsed exactly once. Memoized tables are not pickled: a copy sent
+    to a worker process starts empty and reloads through the wrapped
+    repository.
+    """
+
+    def __init__(
+        self,
+        repository: IDataRepository,
+        *,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._repository = repository
+        self._logger = logger or logging.getLogger(
+            "mangetamain.preprocessing.repositories"
+        )
+        self._tables: dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self.hits: dict[str, int] = {"recipes": 0, "interactions": 0}
+        self.misses: dict[str, int] = {"recipes": 0, "interactions": 0}
+
+    def _get(self, name: str, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            if name in self._tables:
+                self.hits[name] += 1
+            else:
+                self.misses[name] += 1
+                self._logger.debug("Memoized repository miss: %s", name)
+                self._tables[name] = loader()
+            return self._tables[name].copy(deep=False)
+
+    def load_recipes(self) -> pd.DataFrame:
+        return self._get("recipes", self._repository.load_recipes)
+
+    def load_interactions(self) -> pd.DataFrame:
+        return self._get("interactions", self._repository.load_interactions)
+
+    def iter_interactions(
+        self, chunksize: int, *, columns: Sequence[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Slice the memoized interactions, or stream them without memoizing."""
+        with self._lock:
+            memoized = "interactions" in self._tables
+        if memoized:
+            yield from super().iter_interactions(chunksize, columns=columns)
+        else:
+            yield from self._repository.iter_interactions(chunksize, columns=columns)
+
+    def prepare_recipes(self) -> None:
+        """Prepare the wrapped repository; nothing is memoized."""
+        self._repository.prepare_recipes()
+
+    def prepare_interactions(self) -> None:
+        """Prepare the wrapped repository; nothing is memoized."""
+        self._repository.prepare_interactions()
+
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        state["_tables"] = {}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drop memoized tables (counters are preserved)."""
+        with self._lock:
+            self._tables.clear()
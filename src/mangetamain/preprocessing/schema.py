@@ -0,0 +1,238 @@
+"""Compact dtypes for the recipe and interaction tables.
+
+``pd.read_csv`` and the Parquet cache return ``int64`` ids, ``float64``
+numbers and ``object`` strings, several times the memory the values need. A
+:class:`TableSchema` declares a narrower target dtype per column and
+:func:`compact_frame` applies it, reporting the bytes saved per column in a
+:class:`CompactionReport`.
+
+Casts never change values: integer columns are only narrowed when no value
+is missing and all fit the target type, and strings become categoricals or
+Arrow-backed strings with the same contents, so analyser outputs are
+unchanged. ``float32`` targets are the exception; they are only declared for
+values that were computed in ``float32`` in the first place.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+#: Target dtype names understood by :func:`compact_frame` besides numpy ones
+CATEGORY = "category"
+STRING = "string"
+
+_STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Target dtypes of the columns of one table.
+
+    Attributes:
+        name: Table name used in reports and log messages.
+        dtypes: Column name to target dtype: a numpy integer or float type
+            name (``"int32"``, ``"float32"``...), :data:`CATEGORY` for
+            repetitive strings or :data:`STRING` for Arrow-backed strings.
+            Columns absent from a frame are ignored.
+    """
+
+    name: str
+    dtypes: Mapping[str, str] = field(default_factory=dict)
+
+
+RECIPES_SCHEMA = TableSchema(
+    "recipes",
+    {
+        "id": "int32",
+        "minutes": "int32",
+        "contributor_id": "int32",
+        "n_steps": "int16",
+        "n_ingredients": "int16",
+        "submitted": CATEGORY,
+        "name": STRING,
+        "tags": STRING,
+        "nutrition": STRING,
+        "steps": STRING,
+        "description": STRING,
+        "ingredients": STRING,
+    },
+)
+
+INTERACTIONS_SCHEMA = TableSchema(
+    "interactions",
+    {
+        "user_id": "int32",
+        "recipe_id": "int32",
+        "rating": "int8",
+        "date": CATEGORY,
+        "review": STRING,
+    },
+)
+
+#: Merged feature table read by the Streamlit app (``recipes_merged.csv.gz``)
+MERGED_SCHEMA = TableSchema(
+    "recipes_merged",
+    {
+        "id": "int32",
+        "minutes": "int32",
+        "n_steps": "int16",
+        "n_ingredients": "int16",
+        "cluster": "int8",
+        "name": STRING,
+        "tags": STRING,
+        # Computed in float32 by NutritionAnalyser
+        "energy_density": "float32",
+        "protein_ratio": "float32",
+        "fat_ratio": "float32",
+        "nutrient_balance_index": "float32",
+    },
+)
+
+
+@dataclass(frozen=True)
+class ColumnCompaction:
+    """Memory of one compacted column before and after the cast."""
+
+    column: str
+    dtype_before: str
+    dtype_after: str
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    """Per-column outcome of :func:`compact_frame` on one table."""
+
+    table: str
+    columns: tuple[ColumnCompaction, ...]
+
+    @property
+    def bytes_before(self) -> int:
+        return sum(c.bytes_before for c in self.columns)
+
+    @property
+    def bytes_after(self) -> int:
+        return sum(c.bytes_after for c in self.columns)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return one row per compacted column, largest saving first."""
+        rows = [{**c.__dict__, "bytes_saved": c.bytes_saved} for c in self.columns]
+        frame = pd.DataFrame(
+            rows,
+            columns=[
+                "column",
+                "dtype_before",
+                "dtype_after",
+                "bytes_before",
+                "bytes_after",
+                "bytes_saved",
+            ],
+        )
+        return frame.sort_values("bytes_saved", ascending=False, ignore_index=True)
+
+    def log(self, logger: logging.Logger) -> None:
+        """Log the total saving at INFO and every column at DEBUG."""
+        logger.info(
+            "Compacted %s: %.1f MiB -> %.1f MiB over %d columns",
+            self.table,
+            self.bytes_before / 2**20,
+            self.bytes_after / 2**20,
+            len(self.columns),
+        )
+        for c in self.columns:
+            logger.debug(
+                "  %s: %s -> %s, %d bytes saved",
+                c.column,
+                c.dtype_before,
+                c.dtype_after,
+                c.bytes_saved,
+            )
+
+
+def _holds_only_strings(series: pd.Series) -> bool:
+    if not pd.api.types.is_object_dtype(series.dtype):
+        return False
+    return pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def _cast(series: pd.Series, target: str) -> pd.Series | None:
+    """Return ``series`` cast to ``target``, or ``None`` if not value-preserving."""
+    dtype = series.dtype
+    if target == CATEGORY:
+        if pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.StringDtype):
+            return series.astype(CATEGORY)
+        return None
+    if target == STRING:
+        if _holds_only_strings(series):
+            return series.astype(_STRING_DTYPE)
+        return None
+
+    target_dtype = np.dtype(target)
+    if target_dtype.itemsize >= dtype.itemsize:
+        return None
+    if target_dtype.kind in "iu":
+        if not pd.api.types.is_integer_dtype(dtype) or series.isna().any():
+            return None
+        info = np.iinfo(target_dtype)
+        if len(series) and (series.min() < info.min or series.max() > info.max):
+            return None
+        return series.astype(target_dtype)
+    if target_dtype.kind == "f" and pd.api.types.is_float_dtype(dtype):
+        return series.astype(target_dtype)
+    return None
+
+
+def compact_frame(
+    df: pd.DataFrame, schema: TableSchema
+) -> tuple[pd.DataFrame, CompactionReport]:
+    """Cast the columns of ``df`` declared in ``schema`` to their target dtypes.
+
+    Columns that are absent, already narrower than the target, whose values
+    the cast would change (out-of-range or missing integers, non-string
+    objects) or that the cast would not shrink are left as they are and
+    omitted from the report.
+
+    Args:
+        df: Frame to compact; it is not modified.
+        schema: Target dtypes.
+
+    Returns:
+        tuple[pd.DataFrame, CompactionReport]: A shallow copy of ``df`` with
+        the compacted columns, and the memory saved per column.
+    """
+    out = df.copy(deep=False)
+    columns = []
+    for column, target in schema.dtypes.items():
+        if column not in out.columns:
+            continue
+        before = out[column]
+        after = _cast(before, target)
+        if after is None:
+            continue
+        compaction = ColumnCompaction(
+            column=column,
+            dtype_before=str(before.dtype),
+            dtype_after=str(after.dtype),
+            bytes_before=int(before.memory_usage(index=False, deep=True)),
+            bytes_after=int(after.memory_usage(index=False, deep=True)),
+        )
+        # e.g. a categorical of mostly distinct values
+        if compaction.bytes_saved <= 0:
+            continue
+        out[column] = after
+        columns.append(compaction)
+    return out, CompactionReport(schema.name, tuple(columns))
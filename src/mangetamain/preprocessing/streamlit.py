@@ -1,6 +1,5 @@
 """Data preprocessing functions for Streamlit application."""
 
-import ast
 import re
 
 import numpy as np
@@ -10,6 +9,9 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import RobustScaler
 from wordcloud import WordCloud
 
+from .ragged import parsed_column
+from .schema import MERGED_SCHEMA, compact_frame
+
 # from .factories import ProcessorFactory
 # from .feature.ingredients import IngredientsAnalyser
 # from .feature.nutrition import NutritionAnalyser
@@ -149,6 +151,8 @@ from wordcloud import WordCloud
 def load_recipes_data() -> pd.DataFrame:
     """Load and preprocess recipes data from compressed CSV files.
 
+    Columns are narrowed to the dtypes of :data:`~.schema.MERGED_SCHEMA`.
+
     Returns:
         pd.DataFrame: Combined recipes and clustering data
     """
@@ -161,6 +165,7 @@ def load_recipes_data() -> pd.DataFrame:
         if df.empty:
             raise ValueError(f"No data found at {target_path}")
 
+    df, _ = compact_frame(df, MERGED_SCHEMA)
     return df, f"Loaded data from {target_path}"
 
 
@@ -310,6 +315,7 @@ def get_tag_cloud(df: pd.DataFrame, tag_col: str, use_tfidf: bool = True):
         df (pd.DataFrame): DataFrame containing a column with tag lists as
             strings.
         tag_col (str): Column name containing the tags (stringified lists).
+            Missing cells count as recipes without tags.
         use_tfidf (bool): Whether to compute TF-IDF weights instead of simple
             counts.
 
@@ -317,9 +323,7 @@ def get_tag_cloud(df: pd.DataFrame, tag_col: str, use_tfidf: bool = True):
         WordCloud: Generated WordCloud object
     """
     # Parse tags column
-    df["parsed_tags"] = df[tag_col].apply(
-        lambda x: ast.literal_eval(x) if isinstance(x, str) else x
-    )
+    df["parsed_tags"] = parsed_column(df, tag_col).tolist()
 
     # Preprocess tags so multi-word tags stay together
     # Replace spaces with underscores: "hello world" → "hello-world"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mangetamain.clustering import REQUIRED_FEATURES, RecipeClusteringPipeline
+from src.app.predict_clusters import predict_clusters
+
+
+def test_predict_clusters_writes_clustering_layout(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    corpus = pd.DataFrame(
+        rng.normal(size=(300, len(REQUIRED_FEATURES))), columns=REQUIRED_FEATURES
+    )
+    pipeline = RecipeClusteringPipeline()
+    pipeline.cluster(corpus)
+    model_path = pipeline.model.save(tmp_path / "model.joblib")
+
+    new = pd.DataFrame(
+        rng.normal(size=(4, len(REQUIRED_FEATURES))),
+        columns=REQUIRED_FEATURES,
+        index=pd.Index([11, 12, 13, 14], name="id"),
+    ).assign(name=["a", "b", "c", "d"])
+    features_csv = tmp_path / "new.csv"
+    new.to_csv(features_csv)
+
+    out_csv = predict_clusters(
+        features_csv,
+        model_path=model_path,
+        out_csv=tmp_path / "out" / "clusters.csv",
+        logger=logging.getLogger("test"),
+    )
+
+    written = pd.read_csv(out_csv, index_col=0)
+    assert list(written.columns) == ["name", "cluster", "pc_1", "pc_2"]
+    assert written.index.tolist() == [11, 12, 13, 14]
+    expected = pipeline.model.predict(new)
+    np.testing.assert_array_equal(written["cluster"], expected["cluster"])
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import app.run_all as run_all
+from mangetamain.orchestration import Stage
+from mangetamain.preprocessing.interfaces import IDataRepository
+from mangetamain.preprocessing.repositories import MemoizedDataRepository
+
+
+class _CountingRepository:
+    hits = 3
+    misses = 2
+
+
+def _table(name: str) -> Path:
+    return Path(f"{name}_table.csv")
+
+
+def _fake_stages(repository, logger, chunksize=None) -> list[Stage]:
+    return [
+        Stage(name, _table, kwargs={"name": name}, outputs=(f"{name}_table",))
+        for name in run_all.FEATURE_STAGES
+    ]
+
+
+@pytest.fixture
+def fake_preprocessing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        run_all, "make_repository", lambda logger: _CountingRepository()
+    )
+    monkeypatch.setattr(run_all, "build_preprocessing_stages", _fake_stages)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_repository_counters_only_logged_in_process(
+    workers: int, fake_preprocessing: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    logger = logging.getLogger("test_run_all")
+    with caplog.at_level(logging.INFO, logger="test_run_all"):
+        outputs = run_all.run_preprocessing(logger, max_workers=workers)
+
+    assert outputs == {name: _table(name) for name in run_all.FEATURE_STAGES}
+    logged = "\n".join(caplog.messages)
+    if workers == 1:
+        assert "repository hits=3, misses=2" in logged
+    else:
+        assert "hits=" not in logged
+        assert "with 2 worker processes" in logged
+
+
+def test_run_preprocessing_forces_all_stages(fake_preprocessing: None) -> None:
+    outputs = run_all.run_preprocessing(
+        logging.getLogger("test_run_all"), max_workers=1, force=("all",)
+    )
+    assert set(outputs) == set(run_all.FEATURE_STAGES)
+
+
+class _TrackedAnalyser:
+    DEFAULT_THRESHOLD = 0.5
+    built = False
+
+    def __init__(
+        self, threshold: float | None = None, *, logger: logging.Logger | None = None
+    ) -> None:
+        type(self).built = True
+
+    def analyze(self, recipes, interactions, *, smoothing: float = 2.0) -> None:
+        return None
+
+
+def test_feature_stage_params_read_class_without_building_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(
+        run_all.FEATURE_STAGES,
+        "tracked",
+        ("create_rating", _TrackedAnalyser, {"threshold": 0.2}, "backup.csv"),
+    )
+
+    params = run_all.feature_stage_params("tracked")
+
+    assert not _TrackedAnalyser.built
+    assert params["analyser"].endswith("._TrackedAnalyser")
+    assert params["analyser_params"] == {"threshold": 0.2}
+    assert params["analyser_defaults"] == {"DEFAULT_THRESHOLD": 0.5}
+    assert params["analyze_params"] == {"smoothing": 2.0}
+    assert isinstance(
+        run_all.make_analyser("tracked", logging.getLogger("test")), _TrackedAnalyser
+    )
+
+
+class _RawRepository(IDataRepository):
+    def __init__(self) -> None:
+        self.prepared = 0
+
+    def load_recipes(self) -> pd.DataFrame:
+        return pd.DataFrame({"id": [1, 2], "name": ["A", "B"]})
+
+    def load_interactions(self) -> pd.DataFrame:
+        raise AssertionError("interactions must not be loaded in full")
+
+    def iter_interactions(self, chunksize, *, columns=None):
+        interactions = pd.DataFrame({"recipe_id": [1, 2, 2], "rating": [5, 4, 3]})
+        for start in range(0, len(interactions), chunksize):
+            yield interactions.iloc[start : start + chunksize][list(columns)]
+
+    def prepare_interactions(self) -> None:
+        self.prepared += 1
+
+
+class _ReportingAnalyser:
+    def analyze(self, recipes, interactions) -> int:
+        assert interactions.empty
+        return len(recipes)
+
+    def generate_report(self, result, path: Path) -> dict[str, object]:
+        table_path = path / f"{type(self).__name__}.csv"
+        table_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({"rows": [result]}, index=pd.Index([1], name="id")).to_csv(
+            table_path
+        )
+        return {"table_path": table_path}
+
+
+class _RecipesOnlyAnalyser(_ReportingAnalyser):
+    INTERACTION_COLUMNS: tuple[str, ...] = ()
+
+
+class _ChunkedAnalyser(_ReportingAnalyser):
+    INTERACTION_COLUMNS: tuple[str, ...] = ("recipe_id", "rating")
+
+    def analyze_chunks(self, recipes, chunks) -> int:
+        return sum(len(chunk) for chunk in chunks)
+
+
+def test_chunked_run_never_memoizes_interactions(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    raw = _RawRepository()
+    repo = MemoizedDataRepository(raw)
+    monkeypatch.setattr(run_all, "make_repository", lambda logger: repo)
+    monkeypatch.setattr(
+        run_all,
+        "FEATURE_STAGES",
+        {
+            "chunked": ("create_basic", _ChunkedAnalyser, {}, "chunked.csv"),
+            "recipes_only": ("create_basic", _RecipesOnlyAnalyser, {}, "recipes.csv"),
+        },
+    )
+
+    outputs = run_all.run_preprocessing(
+        logging.getLogger("test_run_all"), max_workers=1, chunksize=2
+    )
+
+    assert pd.read_csv(outputs["chunked"])["rows"].tolist() == [3]
+    assert pd.read_csv(outputs["recipes_only"])["rows"].tolist() == [2]
+    assert raw.prepared == 1
+    assert repo.misses["interactions"] == 0
+    assert "interactions" not in repo._tables
+
+
+class _RecordingRepository(_RawRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def load_recipes(self) -> pd.DataFrame:
+        self.calls.append("load_recipes")
+        return super().load_recipes()
+
+    def load_interactions(self) -> pd.DataFrame:
+        self.calls.append("load_interactions")
+        return pd.DataFrame({"recipe_id": [1], "rating": [5]})
+
+    def prepare_recipes(self) -> None:
+        self.calls.append("prepare_recipes")
+
+    def prepare_interactions(self) -> None:
+        self.calls.append("prepare_interactions")
+
+
+@pytest.mark.parametrize(
+    "in_worker, chunksize, calls",
+    [
+        (False, None, ["load_recipes", "load_interactions"]),
+        (False, 2, ["load_recipes", "prepare_interactions"]),
+        (True, None, ["prepare_recipes", "prepare_interactions"]),
+        (True, 2, ["prepare_recipes", "prepare_interactions"]),
+    ],
+)
+def test_raw_tables_only_builds_caches_in_pool_workers(
+    monkeypatch: pytest.MonkeyPatch, in_worker: bool, chunksize, calls
+) -> None:
+    parent = object() if in_worker else None
+    monkeypatch.setattr(run_all.multiprocessing, "parent_process", lambda: parent)
+    repo = _RecordingRepository()
+
+    run_all.load_raw_tables(repo, chunksize)
+
+    assert repo.calls == calls
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing.feature.rating import RatingAnalyser
+from mangetamain.preprocessing.interfaces import IDataRepository
+from src.app import update_ratings
+from src.app.update_ratings import update_rating_table
+
+
+class _Repository(IDataRepository):
+    def __init__(self, recipes: pd.DataFrame, interactions: pd.DataFrame) -> None:
+        self.recipes, self.interactions = recipes, interactions
+        self.interaction_loads = 0
+
+    def load_recipes(self) -> pd.DataFrame:
+        return self.recipes
+
+    def load_interactions(self) -> pd.DataFrame:
+        self.interaction_loads += 1
+        return self.interactions
+
+
+def test_update_seeds_once_then_only_reads_batches(tmp_path: Path) -> None:
+    recipes = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+    history = pd.DataFrame({"recipe_id": [1, 1, 2], "rating": [5, 0, 4]})
+    batch = pd.DataFrame({"recipe_id": [2, 3, 3], "rating": [2, 5, 5]})
+    batch_csv = tmp_path / "batch.csv"
+    batch.to_csv(batch_csv, index=False)
+    repository = _Repository(recipes, history)
+    kwargs = {
+        "repository": repository,
+        "logger": logging.getLogger("test"),
+        "store_path": tmp_path / "stats.parquet",
+        "out_dir": tmp_path,
+    }
+
+    update_rating_table(None, **kwargs)
+    table_path = update_rating_table(batch_csv, **kwargs)
+
+    assert repository.interaction_loads == 1
+    assert table_path == tmp_path / "rating_table.csv"
+    expected = RatingAnalyser().analyze(recipes, pd.concat([history, batch])).table
+    pd.testing.assert_frame_equal(pd.read_csv(table_path), expected, check_dtype=False)
+
+
+def test_main_seeds_from_rating_columns_only(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(update_ratings, "configure_logging", lambda **kwargs: None)
+    Path("data").mkdir()
+    pd.DataFrame({"name": ["a", "b"], "id": [1, 2], "minutes": [5, 9]}).to_csv(
+        "data/RAW_recipes.csv", index=False
+    )
+    pd.DataFrame(
+        {
+            "user_id": [7, 8, 9],
+            "recipe_id": [1, 2, 2],
+            "date": ["2020-01-01"] * 3,
+            "rating": [5, 4, 3],
+            "review": ["long free text"] * 3,
+        }
+    ).to_csv("data/RAW_interactions.csv", index=False)
+    seeded: list[pd.DataFrame] = []
+    original_update = update_ratings.RatingStatsStore.update
+
+    def recording_update(self, interactions: pd.DataFrame) -> int:
+        seeded.append(interactions)
+        return original_update(self, interactions)
+
+    monkeypatch.setattr(update_ratings.RatingStatsStore, "update", recording_update)
+
+    update_ratings.main([])
+
+    assert list(seeded[0].columns) == ["recipe_id", "rating"]
+    table = pd.read_csv("data/preprocessed/rating_table.csv", index_col=0)
+    assert table.loc[2, "n_interactions"] == 2
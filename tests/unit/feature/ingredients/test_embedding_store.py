@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mangetamain.preprocessing.feature.ingredients import (
+    EmbeddingStore,
+    IngredientsAnalyser,
+)
+
+
+class _CountingEncoder:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(t), t.count("a"), ord(t[0])] for t in texts], float)
+
+
+def test_store_only_encodes_unseen_strings(tmp_path: Path) -> None:
+    encoder = _CountingEncoder()
+    store = EmbeddingStore(tmp_path, "model-a")
+    first = store.get(["salt", "Olive  Oil", "salt"], encoder.encode)
+
+    assert encoder.calls == [["salt", "olive oil"]]
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first[0], first[2])
+
+    # A fresh instance reads the persisted vectors back
+    reopened = EmbeddingStore(tmp_path, "model-a")
+    again = reopened.get(["olive oil", "sugar"], encoder.encode)
+
+    assert encoder.calls[1:] == [["sugar"]]
+    np.testing.assert_array_equal(again[0], first[1])
+    assert len(EmbeddingStore(tmp_path, "model-a")) == 3
+
+
+def test_store_keeps_models_apart(tmp_path: Path) -> None:
+    encoder = _CountingEncoder()
+    EmbeddingStore(tmp_path, "model-a").get(["salt"], encoder.encode)
+    EmbeddingStore(tmp_path, "model-b").get(["salt"], encoder.encode)
+
+    assert encoder.calls == [["salt"], ["salt"]]
+
+
+def test_store_ignores_tail_of_interrupted_append(tmp_path: Path) -> None:
+    encoder = _CountingEncoder()
+    store = EmbeddingStore(tmp_path, "model-a")
+    store.get(["salt"], encoder.encode)
+    with open(store.directory / "vectors.f32", "ab") as fh:
+        fh.write(b"\x00" * 5)
+
+    store = EmbeddingStore(tmp_path, "model-a")
+    vectors = store.get(["salt", "pepper"], encoder.encode)
+
+    np.testing.assert_array_equal(vectors[1], [6, 0, ord("p")])
+
+
+def test_analyser_reuses_cached_embeddings(tmp_path: Path, monkeypatch) -> None:
+    encoder = _CountingEncoder()
+    analyser = IngredientsAnalyser(embedding_cache_dir=tmp_path)
+    monkeypatch.setattr(analyser, "_get_model", lambda: encoder)
+    ingredients = ["salt", "water", "flour"]
+
+    first = analyser._compute_embeddings(ingredients)
+    second = analyser._compute_embeddings(ingredients)
+
+    assert encoder.calls == [ingredients]
+    np.testing.assert_array_equal(first, second)
+    assert isinstance(analyser.embedding_cache_dir, Path)
+    assert pd.Series(first[:, 0]).tolist() == [4.0, 5.0, 5.0]
+
+
+def test_axis_phrases_encoded_in_one_batch_and_persisted(
+    tmp_path: Path, monkeypatch
+) -> None:
+    encoder = _CountingEncoder()
+
+    def make(axes=None) -> IngredientsAnalyser:
+        analyser = IngredientsAnalyser(embedding_cache_dir=tmp_path)
+        if axes is not None:
+            analyser.AXES_PHRASES = axes
+        monkeypatch.setattr(analyser, "_get_model", lambda: encoder)
+        return analyser
+
+    first = make()._compute_axis_matrix()
+    phrases = [p for pair in IngredientsAnalyser.AXES_PHRASES.values() for p in pair]
+    assert encoder.calls == [phrases]
+    assert first.shape == (len(IngredientsAnalyser.AXES_PHRASES), 3)
+
+    # Another run with the same model and phrases does not touch the model
+    np.testing.assert_array_equal(make()._compute_axis_matrix(), first)
+    assert len(encoder.calls) == 1
+
+    # A different phrase set is encoded and cached separately
+    make({"hot_cold": ("hot", "cold")})._compute_axis_matrix()
+    assert encoder.calls[1:] == [["hot", "cold"]]
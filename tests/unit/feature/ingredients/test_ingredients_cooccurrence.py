@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import ast
+
+import numpy as np
+import pandas as pd
+
+from mangetamain.preprocessing.feature.ingredients.analysers import (
+    IngredientsAnalyser,
+)
+
+
+def _reference_cooccurrence(recipes, ingredients_df, cluster_labels) -> np.ndarray:
+    # Straightforward per-recipe double loop over cluster labels
+    index_map = {label: i for i, label in enumerate(cluster_labels["cluster label"])}
+    to_label = dict(
+        zip(ingredients_df["name"], ingredients_df["cluster label"], strict=True)
+    )
+    cooc = np.zeros((len(cluster_labels), len(cluster_labels)), int)
+    for text in recipes["ingredients"]:
+        labels = [to_label[i] for i in ast.literal_eval(text) if i in to_label]
+        for h in labels:
+            for v in labels:
+                cooc[index_map[h], index_map[v]] += 1
+    return cooc
+
+
+def test_sparse_cooccurrence_matches_pairwise_counts() -> None:
+    rng = np.random.default_rng(0)
+    vocabulary = [f"ing{i}" for i in range(30)]
+    recipes = pd.DataFrame(
+        {
+            "ingredients": [
+                str([str(i) for i in rng.choice(vocabulary, size=rng.integers(0, 8))])
+                for _ in range(200)
+            ]
+        },
+        # A non-range index must not change the result
+        index=np.arange(200) * 3 + 7,
+    )
+    # "ing29" is left unclustered and must be ignored
+    ingredients_df = pd.DataFrame(
+        {
+            "name": vocabulary[:-1],
+            "cluster": [i % 9 for i in range(29)],
+        }
+    )
+    ingredients_df["cluster label"] = "C" + ingredients_df["cluster"].astype(str)
+    cluster_labels = ingredients_df[["cluster", "cluster label"]].drop_duplicates()
+
+    cooc = IngredientsAnalyser()._build_cooccurrence(
+        recipes, ingredients_df, cluster_labels
+    )
+
+    np.testing.assert_array_equal(
+        cooc, _reference_cooccurrence(recipes, ingredients_df, cluster_labels)
+    )
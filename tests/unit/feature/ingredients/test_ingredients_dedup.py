@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing.feature.ingredients.analysers import (
+    IngredientsAnalyser,
+)
+
+
+def _variants() -> tuple[list[str], np.ndarray, pd.Series]:
+    ingredients = ["onion", "onions", "red onion", "sugar", "white sugar", "salt"]
+    embeddings = np.array(
+        [
+            [1.0, 0.0, 0.0],
+            [0.98, 0.05, 0.0],
+            [0.95, 0.1, 0.05],
+            [0.0, 1.0, 0.0],
+            [0.05, 0.97, 0.0],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+    counts = pd.Series([50, 10, 5, 40, 3, 60], index=ingredients)
+    return ingredients, embeddings, counts
+
+
+@pytest.mark.parametrize("method", ["agglomerative", "knn_graph"])
+def test_dedup_engines_group_near_duplicates(method: str) -> None:
+    analyser = IngredientsAnalyser(
+        cluster_threshold=0.2, dedup_method=method, n_neighbors=2
+    )
+    out = analyser._cluster_ingredients(*_variants())
+
+    labels = dict(zip(out["name"], out["cluster label"], strict=True))
+    assert labels == {
+        "onion": "onion",
+        "onions": "onion",
+        "red onion": "onion",
+        "sugar": "sugar",
+        "white sugar": "sugar",
+        "salt": "salt",
+    }
+
+
+def test_knn_graph_handles_single_ingredient() -> None:
+    analyser = IngredientsAnalyser(dedup_method="knn_graph")
+    assert analyser._knn_graph_labels(np.ones((1, 3))).tolist() == [0]
+
+
+def test_unknown_dedup_method_is_rejected() -> None:
+    with pytest.raises(ValueError, match="dedup_method"):
+        IngredientsAnalyser(dedup_method="hdbscan")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from mangetamain.preprocessing.feature.ingredients.analysers import (
+    IngredientsAnalyser,
+)
+
+
+def test_semantic_scores_are_per_recipe_means_of_known_ingredients() -> None:
+    recipes = pd.DataFrame(
+        {
+            "id": [10, 11, 12, 13],
+            "ingredients": [
+                str(["salt", "sugar", "salt"]),
+                str(["sugar", "unknown"]),
+                str(["unknown"]),
+                str([]),
+            ],
+        }
+    )
+    scores_df = pd.DataFrame(
+        {"sweet_savory": [-0.5, 0.75], "spicy_mild": [0.1, 0.2]},
+        index=["salt", "sugar"],
+    )
+
+    out = IngredientsAnalyser()._add_semantic_features(recipes.copy(), scores_df)
+
+    expected_sweet = [np.mean([-0.5, 0.75, -0.5]), 0.75, np.nan, np.nan]
+    np.testing.assert_allclose(out["score_sweet_savory"], expected_sweet)
+    np.testing.assert_allclose(
+        out["score_spicy_mild"], [np.mean([0.1, 0.2, 0.1]), 0.2, np.nan, np.nan]
+    )
+    assert list(out.columns[-2:]) == ["score_sweet_savory", "score_spicy_mild"]
+
+
+def test_pca_features_average_cluster_coordinates() -> None:
+    recipes = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "ingredients": [
+                str(["onion", "onions", "garlic"]),
+                str(["garlic", "mystery"]),
+                str(["mystery"]),
+            ],
+        }
+    )
+    ingredients_df = pd.DataFrame(
+        {
+            "name": ["onion", "onions", "garlic"],
+            "cluster": [0, 0, 1],
+            "cluster label": ["onion", "onion", "garlic"],
+        }
+    )
+    coords = pd.DataFrame(
+        {
+            "Dim1": [9.0, 9.0],
+            "Dim2": [1.0, 4.0],
+            "Dim3": [9.0, 9.0],
+            "Dim4": [-2.0, 2.0],
+            "cluster": [0, 1],
+            "cluster label": ["onion", "garlic"],
+        }
+    )
+
+    out = IngredientsAnalyser()._add_pca_features(
+        recipes.copy(), ingredients_df, coords
+    )
+
+    # Dim1/Dim3 are excluded; "onion" counts twice in the first recipe
+    assert [c for c in out.columns if c.startswith("Dim")] == ["Dim2", "Dim4"]
+    np.testing.assert_allclose(out["Dim2"], [2.0, 4.0, np.nan])
+    np.testing.assert_allclose(out["Dim4"], [-2.0 / 3.0, 2.0, np.nan])
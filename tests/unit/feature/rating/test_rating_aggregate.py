@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing.feature.rating.analyzers import RatingAnalyser
+
+
+def _interactions(seed: int = 0, n: int = 2_000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ratings = rng.choice(6, size=n).astype(float)
+    ratings[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({"recipe_id": rng.integers(0, 300, size=n), "rating": ratings})
+
+
+def test_single_pass_matches_groupby_reductions() -> None:
+    interactions = _interactions()
+    per_recipe, rated = RatingAnalyser._aggregate(interactions)
+
+    grp = interactions.groupby("recipe_id")
+    rated_only = interactions[interactions["rating"] > 0]
+    by_rated = rated_only.groupby("recipe_id")["rating"]
+    expected = pd.DataFrame(
+        {
+            "n_interactions": grp.size(),
+            "n_rated": by_rated.size(),
+            "mean_rating": by_rated.mean(),
+            "median_rating": by_rated.median(),
+            "rating_std": by_rated.std().fillna(0),
+            "sum_ratings": by_rated.sum(),
+        }
+    ).fillna({"n_rated": 0, "sum_ratings": 0.0})
+
+    table = per_recipe.set_index("recipe_id")
+    pd.testing.assert_frame_equal(
+        table[expected.columns], expected, check_dtype=False, check_names=False
+    )
+    np.testing.assert_allclose(
+        table["share_rated"], expected["n_rated"] / expected["n_interactions"]
+    )
+    assert sorted(rated) == sorted(rated_only["rating"])
+
+
+def test_single_pass_edge_cases() -> None:
+    interactions = pd.DataFrame(
+        {"recipe_id": [3, 3, 1, 2, 2, 2], "rating": [0, 0, 4, 5, 1, 3]}
+    )
+    per_recipe, _ = RatingAnalyser._aggregate(interactions)
+
+    assert per_recipe["recipe_id"].tolist() == [1, 2, 3]
+    assert per_recipe["n_rated"].tolist() == [1, 3, 0]
+    assert per_recipe["median_rating"].iloc[1] == 3.0
+    # A single rating has zero spread; an unrated recipe has no statistics
+    assert per_recipe["rating_std"].iloc[0] == 0.0
+    assert per_recipe[["mean_rating", "rating_std"]].iloc[2].isna().all()
+    assert per_recipe["sum_ratings"].tolist() == [4.0, 9.0, 0.0]
+
+
+def test_analyze_accepts_interactions_without_rating_column() -> None:
+    recipes = pd.DataFrame({"id": [1, 2], "name": ["a", "b"]})
+    result = RatingAnalyser().analyze(recipes, pd.DataFrame({"recipe_id": [1, 2]}))
+
+    assert result.table["n_rated"].tolist() == [0, 0]
+    assert result.summary["n_with_rating"] == 0
+    assert result.table["sum_ratings"].tolist() == pytest.approx([0.0, 0.0])
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing.feature.rating import (
+    RatingAnalyser,
+    RatingStatsStore,
+)
+
+
+def _history(n: int = 3_000, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    interactions = pd.DataFrame(
+        {
+            "recipe_id": rng.integers(0, 400, size=n),
+            "rating": rng.choice(6, size=n, p=[0.1, 0.05, 0.05, 0.1, 0.2, 0.5]),
+        }
+    )
+    recipes = pd.DataFrame(
+        {"id": np.arange(400), "name": [f"r{i}" for i in range(400)]}
+    )
+    return recipes, interactions
+
+
+def _assert_same_result(actual, expected) -> None:
+    pd.testing.assert_frame_equal(
+        actual.table, expected.table, check_dtype=False, rtol=1e-12
+    )
+    assert actual.summary == pytest.approx(expected.summary)
+
+
+@pytest.mark.parametrize("mu_percentile", [0.5, 0.3])
+def test_incremental_updates_match_full_recompute(
+    tmp_path: Path, mu_percentile: float
+) -> None:
+    recipes, interactions = _history()
+    path = tmp_path / "rating_stats.parquet"
+
+    for bounds in np.array_split(np.arange(len(interactions)), 3):
+        batch = interactions.iloc[bounds]
+        # Reopen the persisted state before every batch
+        store = RatingStatsStore(path)
+        store.update(batch)
+        store.save()
+
+    result = RatingStatsStore(path).analyze(
+        recipes, mu_percentile=mu_percentile, with_wilson_per_recipe=True
+    )
+    expected = RatingAnalyser().analyze(
+        recipes,
+        interactions,
+        mu_percentile=mu_percentile,
+        with_wilson_per_recipe=True,
+    )
+    _assert_same_result(result, expected)
+
+
+def test_merged_shards_match_full_recompute(tmp_path: Path) -> None:
+    recipes, interactions = _history(seed=1)
+    left = RatingStatsStore(tmp_path / "left.parquet")
+    right = RatingStatsStore(tmp_path / "right.parquet")
+    left.update(interactions.iloc[::2])
+    right.update(interactions.iloc[1::2])
+
+    left.merge(right)
+
+    assert left.num_interactions == len(interactions)
+    _assert_same_result(
+        left.analyze(recipes), RatingAnalyser().analyze(recipes, interactions)
+    )
+
+
+def test_ratings_off_the_scale_are_rejected(tmp_path: Path) -> None:
+    store = RatingStatsStore(tmp_path / "stats.parquet")
+    with pytest.raises(ValueError, match="Ratings must be one of"):
+        store.update(pd.DataFrame({"recipe_id": [1, 2], "rating": [5, 3.5]}))
+
+
+def test_store_file_without_rating_sums_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "stats.parquet"
+    store = RatingStatsStore(path)
+    store.update(pd.DataFrame({"recipe_id": [1, 2], "rating": [5, 3]}))
+    store.save()
+    pd.read_parquet(path).drop(columns=["sum_ratings", "sum_sq_ratings"]).to_parquet(
+        path, index=False
+    )
+
+    with pytest.raises(ValueError, match="sum_ratings.*sum_sq_ratings"):
+        RatingStatsStore(path)
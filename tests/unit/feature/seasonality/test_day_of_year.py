@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing.feature.seasonality.day_of_year import (
+    DOY_COS,
+    DOY_SIN,
+    parse_day_of_year,
+    seasonal_sums,
+)
+
+
+def test_lookup_tables_cover_leap_years() -> None:
+    doy = np.arange(1, 367)
+    assert DOY_SIN.shape == DOY_COS.shape == (366,)
+    np.testing.assert_allclose(DOY_SIN, np.sin(2 * np.pi * doy / 365))
+    np.testing.assert_allclose(DOY_COS, np.cos(2 * np.pi * doy / 365))
+
+
+@pytest.mark.parametrize(
+    "dates",
+    [
+        pd.Series(["2012-12-31", "2013-02-01", "2012-12-31"]),
+        pd.Series(pd.to_datetime(["2012-12-31", "2013-02-01", "2012-12-31"])),
+        pd.Series([datetime.date(2012, 12, 31), datetime.date(2013, 2, 1)] * 2),
+        # Values that are not plain ISO dates fall back to format inference
+        pd.Series(["2012-12-31 08:30:00", "2013-02-01"]),
+    ],
+)
+def test_parse_day_of_year_formats(dates: pd.Series) -> None:
+    expected = pd.to_datetime(dates.astype(str), format="mixed").dt.dayofyear
+    np.testing.assert_array_equal(parse_day_of_year(dates), expected)
+
+
+@pytest.mark.parametrize("bad", [None, "not a date"])
+def test_parse_day_of_year_rejects_invalid(bad: object) -> None:
+    with pytest.raises(ValueError, match="Invalid dates found in 'when'"):
+        parse_day_of_year(pd.Series(["2020-01-01", bad]), column="when")
+
+
+def test_seasonal_sums_match_groupby() -> None:
+    rng = np.random.default_rng(0)
+    recipe_id = pd.Series(rng.integers(0, 20, size=500), name="recipe_id")
+    doy = rng.integers(1, 367, size=500)
+    frame = pd.DataFrame(
+        {
+            "recipe_id": recipe_id,
+            "sin": np.sin(2 * np.pi * doy / 365),
+            "cos": np.cos(2 * np.pi * doy / 365),
+        }
+    )
+    expected = frame.groupby("recipe_id").agg(
+        n=("sin", "size"), sin_sum=("sin", "sum"), cos_sum=("cos", "sum")
+    )
+
+    pd.testing.assert_frame_equal(seasonal_sums(recipe_id, doy), expected)
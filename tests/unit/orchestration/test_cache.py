@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from mangetamain.orchestration import DAGExecutor, Stage, StageCache
+
+
+def _build(source: str, out: str, log: str) -> Path:
+    with open(log, "a") as fh:
+        fh.write("build\n")
+    Path(out).write_text(Path(source).read_text().upper())
+    return Path(out)
+
+
+def _report(table: str, out: str, log: str) -> Path:
+    with open(log, "a") as fh:
+        fh.write("report\n")
+    Path(out).write_text(f"report of {Path(table).read_text()}")
+    return Path(out)
+
+
+def _stages(tmp_path: Path, *, threshold: float = 0.5) -> list[Stage]:
+    source, table, report, log = (
+        str(tmp_path / n) for n in ("raw.txt", "table.txt", "report.txt", "log")
+    )
+    return [
+        Stage(
+            "build",
+            _build,
+            kwargs={"source": source, "out": table, "log": log},
+            outputs=("table",),
+            params={"threshold": threshold},
+            sources=(source,),
+        ),
+        Stage(
+            "report",
+            _report,
+            kwargs={"table": table, "out": report, "log": log},
+            inputs=("table",),
+            params={},
+        ),
+    ]
+
+
+def _run(tmp_path: Path, workers: int = 1, **kwargs) -> list[str]:
+    log = tmp_path / "log"
+    log.write_text("")
+    stages = kwargs.pop("stages", None) or _stages(tmp_path)
+    cache = StageCache(tmp_path / "manifest.json")
+    DAGExecutor(stages, max_workers=workers, cache=cache, **kwargs).run()
+    return log.read_text().split()
+
+
+@pytest.fixture
+def raw(tmp_path: Path) -> Path:
+    path = tmp_path / "raw.txt"
+    path.write_text("abc")
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unchanged_stages_are_skipped(tmp_path: Path, raw: Path, workers: int):
+    assert _run(tmp_path, workers) == ["build", "report"]
+    assert _run(tmp_path, workers) == []
+    assert (tmp_path / "report.txt").read_text() == "report of ABC"
+
+
+def test_source_change_invalidates_stage_and_dependents(tmp_path: Path, raw: Path):
+    _run(tmp_path)
+    raw.write_text("xyz")
+
+    assert _run(tmp_path) == ["build", "report"]
+    assert (tmp_path / "report.txt").read_text() == "report of XYZ"
+
+
+def test_param_change_invalidates_stage(tmp_path: Path, raw: Path) -> None:
+    _run(tmp_path)
+
+    # The rebuilt table is identical, so its dependent is still reused
+    assert _run(tmp_path, stages=_stages(tmp_path, threshold=0.7)) == ["build"]
+
+
+def test_forced_stage_with_identical_output_keeps_dependents(
+    tmp_path: Path, raw: Path
+) -> None:
+    _run(tmp_path)
+
+    assert _run(tmp_path, force=("build",)) == ["build"]
+
+
+def test_missing_output_is_recomputed(tmp_path: Path, raw: Path) -> None:
+    _run(tmp_path)
+    (tmp_path / "report.txt").unlink()
+
+    assert _run(tmp_path) == ["report"]
+
+
+def test_unknown_forced_stage_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown stages"):
+        DAGExecutor(_stages(tmp_path), force=("nope",))
+
+
+def test_file_digest_memoized_by_size_and_mtime(tmp_path: Path, raw: Path) -> None:
+    cache = StageCache(tmp_path / "manifest.json")
+    first = cache.file_digest(raw)
+    raw.write_text("abd")
+
+    assert cache.file_digest(raw) != first
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from mangetamain.orchestration import DAGExecutor, Stage, StageExecutionError
+
+
+def _write(path: str, text: str) -> str:
+    Path(path).write_text(text)
+    return text
+
+
+def _concat(out: str, sources: list[str]) -> str:
+    text = "".join(Path(s).read_text() for s in sources)
+    return _write(out, text)
+
+
+def _fail() -> None:
+    raise RuntimeError("boom")
+
+
+def _stages(tmp_path: Path) -> list[Stage]:
+    a, b, c = (str(tmp_path / n) for n in ("a.txt", "b.txt", "c.txt"))
+    return [
+        # Declared out of order on purpose: "join" depends on both leaves
+        Stage(
+            "join",
+            _concat,
+            kwargs={"out": c, "sources": [a, b]},
+            inputs=("a", "b"),
+            outputs=("c",),
+        ),
+        Stage("left", _write, kwargs={"path": a, "text": "A"}, outputs=("a",)),
+        Stage("right", _write, kwargs={"path": b, "text": "B"}, outputs=("b",)),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_executor_runs_dependencies_first(tmp_path: Path, workers: int) -> None:
+    executor = DAGExecutor(_stages(tmp_path), max_workers=workers)
+    results = executor.run()
+
+    assert results == {"left": "A", "right": "B", "join": "AB"}
+    assert executor.order.index("join") == 2
+    assert set(executor.durations) == {"left", "right", "join"}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_executor_wraps_stage_failures(workers: int) -> None:
+    executor = DAGExecutor([Stage("bad", _fail)], max_workers=workers)
+    with pytest.raises(StageExecutionError, match="bad") as info:
+        executor.run()
+    assert isinstance(info.value.__cause__, RuntimeError)
+
+
+def test_executor_rejects_cycles_and_duplicates() -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        DAGExecutor(
+            [
+                Stage("x", _fail, inputs=("y",), outputs=("x",)),
+                Stage("y", _fail, inputs=("x",), outputs=("y",)),
+            ]
+        )
+    with pytest.raises(ValueError, match="Duplicate"):
+        DAGExecutor([Stage("x", _fail), Stage("x", _fail)])
+
+
+def test_force_all_expands_to_every_stage(tmp_path: Path) -> None:
+    executor = DAGExecutor(_stages(tmp_path), max_workers=1, force=("all",))
+    assert executor.force == {"join", "left", "right"}
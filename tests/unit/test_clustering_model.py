@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_blobs
+
+from mangetamain.clustering import (
+    REQUIRED_FEATURES,
+    ClusteringModel,
+    ClusteringPaths,
+    RecipeClusteringPipeline,
+)
+
+
+def _features(n: int, seed: int = 0) -> pd.DataFrame:
+    X, _ = make_blobs(
+        n_samples=n,
+        n_features=len(REQUIRED_FEATURES),
+        centers=5,
+        cluster_std=3.0,
+        random_state=seed,
+    )
+    index = pd.Index(np.arange(n) + 100, name="id")
+    return pd.DataFrame(X, columns=REQUIRED_FEATURES, index=index)
+
+
+@pytest.mark.parametrize("mode", ["exact", "minibatch"])
+def test_model_reproduces_fitted_clusters(tmp_path: Path, mode: str) -> None:
+    recipes = _features(2_000)
+    pipeline = RecipeClusteringPipeline(mode=mode, batch_size=500)
+    result = pipeline.cluster(recipes)
+
+    model = ClusteringModel.load(pipeline.model.save(tmp_path / "model.joblib"))
+    # Columns in another order plus an unused one
+    shuffled = recipes[REQUIRED_FEATURES[::-1]].assign(name="r")
+    predicted = model.predict(shuffled)
+
+    assert model.metadata["mode"] == mode
+    assert model.n_clusters == 5
+    pd.testing.assert_series_equal(
+        predicted["cluster"], result["cluster"], check_dtype=False
+    )
+    for column in ("pc_1", "pc_2"):
+        np.testing.assert_allclose(predicted[column], result[column], atol=1e-9)
+
+    # A single recipe is labelled like it was during the fit
+    one = model.predict(recipes.iloc[[7]])
+    assert one["cluster"].item() == result["cluster"].iloc[7]
+
+
+def test_pipeline_predict_loads_saved_model(tmp_path: Path) -> None:
+    paths = ClusteringPaths(base=tmp_path, out_dir=tmp_path)
+    fitted = RecipeClusteringPipeline(paths=paths)
+    fitted.cluster(_features(500))
+    fitted.model.save(paths.model_path())
+
+    new_recipes = _features(20, seed=1)
+    predicted = RecipeClusteringPipeline(paths=paths).predict(new_recipes)
+
+    pd.testing.assert_frame_equal(predicted, fitted.model.predict(new_recipes))
+
+
+def test_model_rejects_bad_inputs(tmp_path: Path) -> None:
+    pipeline = RecipeClusteringPipeline()
+    pipeline.cluster(_features(200))
+
+    with pytest.raises(ValueError, match="Missing required variables"):
+        pipeline.model.predict(_features(5).drop(columns="bayes_mean"))
+    holes = _features(5)
+    holes.iloc[0, 0] = np.nan
+    with pytest.raises(ValueError, match="missing values"):
+        pipeline.model.predict(holes)
+
+    with pytest.raises(FileNotFoundError):
+        ClusteringModel.load(tmp_path / "absent.joblib")
+    joblib.dump({"format_version": 0}, tmp_path / "old.joblib")
+    with pytest.raises(ValueError, match="format version"):
+        ClusteringModel.load(tmp_path / "old.joblib")
@@ -21,8 +21,9 @@ def _frame(index_values, cols):
     return df
 
 
+@pytest.mark.parametrize("mode", ["exact", "minibatch"])
 @pytest.mark.parametrize("n", [25])
-def test_pipeline_runs_with_minimal_inputs(tmp_path: Path, n: int) -> None:
+def test_pipeline_runs_with_minimal_inputs(tmp_path: Path, n: int, mode: str) -> None:
     base = tmp_path / "preprocessed"
     out_dir = tmp_path / "clustering"
     base.mkdir(parents=True)
@@ -90,9 +91,43 @@ def test_pipeline_runs_with_minimal_inputs(tmp_path: Path, n: int) -> None:
     ingredients.to_csv(base / "ingredients_table.csv")
 
     paths = ClusteringPaths(base=base, out_dir=out_dir)
-    pipe = RecipeClusteringPipeline(paths=paths)
+    pipe = RecipeClusteringPipeline(paths=paths, mode=mode)
     df = pipe.run()
 
     assert {"cluster", "pc_1", "pc_2"}.issubset(df.columns)
     out_csv = out_dir / "recipes_clustering_with_pca.csv"
     assert out_csv.exists()
+    assert (out_dir / "recipes_similarity_index.joblib").exists()
+    assert len(pipe.most_similar(df.index[0], k=3)) == 3
+
+
+def _blobs(n: int) -> pd.DataFrame:
+    from sklearn.datasets import make_blobs
+
+    from mangetamain.clustering.pipeline import REQUIRED_FEATURES
+
+    X, _ = make_blobs(
+        n_samples=n, n_features=len(REQUIRED_FEATURES), centers=5, random_state=0
+    )
+    return pd.DataFrame(X, columns=REQUIRED_FEATURES).assign(name="r")
+
+
+def test_minibatch_mode_agrees_with_exact_mode() -> None:
+    from sklearn.metrics import adjusted_rand_score
+
+    recipes = _blobs(3_000)
+    exact = RecipeClusteringPipeline().cluster(recipes)
+    minibatch = RecipeClusteringPipeline(mode="minibatch", batch_size=500).cluster(
+        recipes
+    )
+
+    assert list(minibatch.columns) == list(exact.columns)
+    assert minibatch.index.equals(exact.index)
+    assert adjusted_rand_score(exact["cluster"], minibatch["cluster"]) > 0.99
+    for column in ("pc_1", "pc_2"):
+        assert abs(exact[column].corr(minibatch[column])) > 0.999
+
+
+def test_unknown_clustering_mode_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown clustering mode"):
+        RecipeClusteringPipeline(mode="approximate")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+
+import app.sweep_clusters as sweep_clusters
+from mangetamain.clustering import REQUIRED_FEATURES, RecipeClusteringPipeline
+from mangetamain.clustering.kmeans import fit_kmeans, row_chunks
+
+
+def _features(n: int, seed: int = 0) -> pd.DataFrame:
+    X, _ = make_blobs(
+        n_samples=n,
+        n_features=len(REQUIRED_FEATURES),
+        centers=5,
+        cluster_std=3.0,
+        random_state=seed,
+    )
+    index = pd.Index(np.arange(n) + 100, name="id")
+    return pd.DataFrame(X, columns=REQUIRED_FEATURES, index=index)
+
+
+def test_row_chunks_cover_rows_without_short_tail() -> None:
+    chunks = row_chunks(10, 3)
+
+    assert [c.stop - c.start for c in chunks] == [3, 3, 4]
+    assert chunks[0].start == 0 and chunks[-1].stop == 10
+    assert all(a.stop == b.start for a, b in zip(chunks[:-1], chunks[1:], strict=True))
+    assert row_chunks(5, 10) == [slice(0, 5)]
+    assert row_chunks(5, 0) == [slice(i, i + 1) for i in range(5)]
+
+
+def test_fit_kmeans_full_and_minibatch_agree_on_separated_blobs() -> None:
+    X, truth = make_blobs(n_samples=900, centers=3, cluster_std=0.5, random_state=1)
+
+    full, labels = fit_kmeans(X, 3, random_state=0)
+    mini, mini_labels = fit_kmeans(X, 3, random_state=0, batch_size=200, passes=2)
+
+    assert isinstance(full, KMeans) and isinstance(mini, MiniBatchKMeans)
+    assert labels.dtype == mini_labels.dtype == np.int32
+    np.testing.assert_array_equal(mini_labels, mini.predict(X))
+    assert adjusted_rand_score(truth, labels) == pytest.approx(1.0)
+    assert adjusted_rand_score(labels, mini_labels) == pytest.approx(1.0)
+
+
+def test_sweep_scores_every_configuration(tmp_path: Path) -> None:
+    recipes = _features(600)
+    pipeline = RecipeClusteringPipeline()
+    pipeline.cluster(recipes)
+
+    table = pipeline.sweep(
+        recipes, [5, 3], [12, 2], max_workers=2, silhouette_sample=300
+    )
+
+    assert list(table.columns) == [
+        "n_clusters",
+        "n_pcs",
+        "inertia",
+        "silhouette",
+        "seconds",
+    ]
+    assert list(zip(table["n_pcs"], table["n_clusters"], strict=True)) == [
+        (2, 3),
+        (2, 5),
+        (12, 3),
+        (12, 5),
+    ]
+    # The default configuration matches the fitted pipeline
+    default = table.set_index(["n_clusters", "n_pcs"]).loc[(5, 12)]
+    assert default["inertia"] == pytest.approx(pipeline.model.kmeans.inertia_)
+    assert table["silhouette"].between(-1, 1).all()
+
+    # In-process and mini-batch sweeps report the same layout
+    sequential = pipeline.sweep(recipes, [5, 3], [12, 2], max_workers=1)
+    pd.testing.assert_frame_equal(
+        sequential.drop(columns="seconds").iloc[:, :3],
+        table.drop(columns="seconds").iloc[:, :3],
+    )
+    minibatch = RecipeClusteringPipeline(mode="minibatch", batch_size=200).sweep(
+        recipes, [5], [12], max_workers=1
+    )
+    assert minibatch["inertia"].item() == pytest.approx(default["inertia"], rel=0.05)
+
+    with pytest.raises(ValueError, match="n_pcs must lie"):
+        pipeline.sweep(recipes, [5], [40])
+    with pytest.raises(ValueError, match="n_clusters must lie"):
+        pipeline.sweep(recipes, [1, 5], [12])
+
+
+def test_sweep_clusters_cli_writes_sweep_csv(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sweep_clusters, "configure_logging", lambda **kwargs: None)
+    features = _features(300)
+    base = Path("data/preprocessed")
+    base.mkdir(parents=True)
+    groups = ["nutrition", "seasonality", "rating", "complexity", "ingredients"]
+    for group, columns in zip(
+        groups, np.array_split(REQUIRED_FEATURES, len(groups)), strict=True
+    ):
+        features[list(columns)].to_csv(base / f"{group}_table.csv")
+
+    sweep_clusters.main(
+        ["--k", "2", "3", "--pcs", "2", "4", "--workers", "1"]
+        + ["--silhouette-sample", "100"]
+    )
+
+    table = pd.read_csv("data/clustering/clustering_sweep.csv")
+    assert list(zip(table["n_pcs"], table["n_clusters"], strict=True)) == [
+        (2, 2),
+        (2, 3),
+        (4, 2),
+        (4, 3),
+    ]
+    assert "silhouette" in capsys.readouterr().out
@@ -134,3 +134,53 @@ def test_custom_column_names():
         set(out.columns)
     )
     assert len(out) == 3
+
+
+def test_partial_fit_batches_match_full_fit(interactions_df, recipes_df):
+    full = RecipeSeasonalityFeatureBuilder().fit(interactions_df)
+
+    incremental = RecipeSeasonalityFeatureBuilder()
+    for batch in (
+        interactions_df.iloc[:3],
+        interactions_df.iloc[3:6],
+        interactions_df.iloc[6:],
+    ):
+        assert incremental.partial_fit(batch) is incremental
+
+    pd.testing.assert_frame_equal(incremental.feature_df_, full.feature_df_)
+    assert np.isclose(incremental.sin_global_, full.sin_global_)
+    assert np.isclose(incremental.cos_global_, full.cos_global_)
+    pd.testing.assert_frame_equal(
+        incremental.transform(recipes_df), full.transform(recipes_df)
+    )
+
+
+def test_fit_resets_partial_fit_state(interactions_df):
+    builder = RecipeSeasonalityFeatureBuilder()
+    builder.partial_fit(interactions_df)
+    builder.fit(interactions_df.iloc[:3])
+
+    assert builder.feature_df_["recipe_id"].tolist() == [1]
+    assert builder.totals_["n"].tolist() == [3]
+
+
+def test_transform_matches_left_merge(interactions_df):
+    builder = RecipeSeasonalityFeatureBuilder().fit(interactions_df)
+    # Duplicated, unordered and unseen ids with a non-default index
+    recipes = pd.DataFrame(
+        {"id": [3, 4, 1, 3], "title": list("wxyz")}, index=[9, 7, 5, 3]
+    )
+
+    out = builder.transform(recipes)
+    expected = recipes.merge(
+        builder.feature_df_, left_on="id", right_on="recipe_id", how="left"
+    )
+    expected["inter_doy_sin_smooth"] = expected["inter_doy_sin_smooth"].fillna(
+        builder.sin_global_
+    )
+    expected["inter_doy_cos_smooth"] = expected["inter_doy_cos_smooth"].fillna(
+        builder.cos_global_
+    )
+    expected["inter_strength"] = expected["inter_strength"].fillna(0.0)
+
+    pd.testing.assert_frame_equal(out, expected)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing.feature_store import FeatureStore
+
+
+def _tables() -> dict[str, pd.DataFrame]:
+    nutrition = pd.DataFrame(
+        {
+            "name": ["c", "a", "d", "b"],
+            "energy_density": [3.0, 1.0, 4.0, 2.0],
+        },
+        index=pd.Index([30, 10, 40, 20], name="id"),
+    )
+    # Ids in another order, one missing and one unknown to nutrition
+    rating = pd.DataFrame(
+        {"n_interactions": [1, 2, 3, 5], "recipe_name": ["a", "b", "c", "e"]},
+        index=pd.Index([10, 20, 30, 50], name="recipe_id"),
+    )
+    # Already in nutrition order
+    complexity = pd.DataFrame(
+        {"name": ["c", "a", "d", "b"], "n_steps": [7, 5, 8, 6]},
+        index=pd.Index([30, 10, 40, 20], name="id"),
+    )
+    return {"nutrition": nutrition, "rating": rating, "complexity": complexity}
+
+
+def test_read_matches_chained_index_merges(tmp_path: Path) -> None:
+    tables = _tables()
+    store = FeatureStore(tmp_path / "store")
+    for group, table in tables.items():
+        store.write(group, table)
+
+    merged = store.read(["nutrition", "rating", "complexity"])
+
+    expected = (
+        tables["nutrition"]
+        .merge(tables["rating"], left_index=True, right_index=True)
+        .merge(
+            tables["complexity"].drop(columns="name"),
+            left_index=True,
+            right_index=True,
+        )
+    )
+    # merge() drops the index name when it reorders; the store keeps the first
+    expected.index.name = "id"
+    pd.testing.assert_frame_equal(merged, expected)
+
+
+def test_read_projects_columns(tmp_path: Path) -> None:
+    store = FeatureStore(tmp_path / "store")
+    for group, table in _tables().items():
+        store.write(group, table)
+
+    out = store.read(["nutrition", "rating"], columns=["n_interactions", "name"])
+
+    assert list(out.columns) == ["name", "n_interactions"]
+    assert out.index.tolist() == [30, 10, 20]
+    assert out["n_interactions"].tolist() == [3, 1, 2]
+    with pytest.raises(ValueError, match="missing_column"):
+        store.read(["nutrition"], columns=["missing_column"])
+    with pytest.raises(FileNotFoundError):
+        store.read(["ingredients"])
+
+
+def test_ensure_rewrites_group_only_when_source_changes(tmp_path: Path) -> None:
+    source = tmp_path / "rating_table.csv"
+    _tables()["rating"].to_csv(source)
+    store = FeatureStore(tmp_path / "store")
+    calls: list[Path] = []
+
+    def reader(path: Path) -> pd.DataFrame:
+        calls.append(path)
+        return pd.read_csv(path, index_col=0)
+
+    store.ensure("rating", source, reader)
+    store.ensure("rating", source, reader)
+    assert len(calls) == 1
+
+    table = _tables()["rating"]
+    table["n_interactions"] = np.arange(10, 14)
+    table.to_csv(source)
+    store.ensure("rating", source, reader)
+
+    assert len(calls) == 2
+    assert store.read(["rating"])["n_interactions"].tolist() == [10, 11, 12, 13]
+
+
+def test_write_rejects_duplicate_recipe_ids(tmp_path: Path) -> None:
+    table = pd.DataFrame({"x": [1, 2]}, index=[1, 1])
+    with pytest.raises(ValueError, match="unique"):
+        FeatureStore(tmp_path).write("dup", table)
+
+
+def test_concurrent_loading_matches_sequential_and_logs_timings(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    sources = {}
+    for group, table in _tables().items():
+        sources[group] = tmp_path / f"{group}_table.csv"
+        table.to_csv(sources[group])
+    groups = list(sources)
+
+    def reader(path: Path) -> pd.DataFrame:
+        return pd.read_csv(path, index_col=0)
+
+    sequential = FeatureStore(tmp_path / "seq", max_workers=1)
+    sequential.ensure_all(sources, reader)
+    concurrent = FeatureStore(tmp_path / "par", max_workers=3)
+    with caplog.at_level("INFO", logger="mangetamain.preprocessing.feature_store"):
+        paths = concurrent.ensure_all(sources, reader)
+        merged = concurrent.read(groups)
+
+    assert list(paths) == groups
+    pd.testing.assert_frame_equal(merged, sequential.read(groups))
+    messages = caplog.messages
+    for group in groups:
+        assert f"Read feature group {group} in" in "\n".join(messages)
+    assert any(m.startswith("Read 3 feature groups in") for m in messages)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from mangetamain.preprocessing import (
+    CSVDataRepository,
+    MemoizedDataRepository,
+    ProcessorFactory,
+    RepositoryPaths,
+)
+
+
+class _CountingRepository(CSVDataRepository):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.reads = 0
+
+    def _read_table(self, path, usecols):
+        self.reads += 1
+        return super()._read_table(path, usecols)
+
+
+def test_memoized_repository_parses_each_table_once(tmp_path: Path) -> None:
+    rp = tmp_path / "r.csv"
+    ip = tmp_path / "i.csv"
+    pd.DataFrame([{"id": 1, "name": "A"}]).to_csv(rp, index=False)
+    pd.DataFrame([{"recipe_id": 1, "rating": 5}]).to_csv(ip, index=False)
+
+    inner = _CountingRepository(
+        paths=RepositoryPaths(recipes_csv=str(rp), interactions_csv=str(ip))
+    )
+    repo = MemoizedDataRepository(inner)
+
+    makers = (
+        ProcessorFactory.create_rating,
+        ProcessorFactory.create_seasonality,
+        ProcessorFactory.create_nutrition,
+        ProcessorFactory.create_steps,
+        ProcessorFactory.create_ingredients,
+    )
+    for maker in makers:
+        maker(repo).run()
+
+    assert inner.reads == 2
+    assert repo.misses == {"recipes": 1, "interactions": 1}
+    assert repo.hits == {"recipes": 4, "interactions": 4}
+
+
+def test_memoized_repository_isolates_column_changes(tmp_path: Path) -> None:
+    rp = tmp_path / "r.csv"
+    pd.DataFrame([{"id": 1, "name": "A"}]).to_csv(rp, index=False)
+    repo = MemoizedDataRepository(
+        CSVDataRepository(paths=RepositoryPaths(recipes_csv=str(rp)))
+    )
+
+    first = repo.load_recipes()
+    first["extra"] = 1
+
+    assert "extra" not in repo.load_recipes().columns
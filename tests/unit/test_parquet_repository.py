@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing import ParquetDataRepository, RepositoryPaths
+from mangetamain.preprocessing.cache import ParquetCache
+from mangetamain.preprocessing.exceptions import DataLoadError
+
+
+def _write_inputs(tmp_path: Path) -> tuple[Path, Path]:
+    recipes = pd.DataFrame(
+        [
+            {"name": "A", "id": 1, "minutes": 10},
+            {"name": "B", "id": 2, "minutes": 25},
+        ]
+    )
+    interactions = pd.DataFrame(
+        [
+            {"user_id": 7, "recipe_id": 1, "date": "2020-01-01", "rating": 5},
+            {"user_id": 8, "recipe_id": 2, "date": "2020-06-01", "rating": 0},
+        ]
+    )
+    rp = tmp_path / "recipes.csv"
+    ip = tmp_path / "interactions.csv"
+    recipes.to_csv(rp, index=False)
+    interactions.to_csv(ip, index=False)
+    return rp, ip
+
+
+def test_parquet_repository_matches_csv_with_projection(tmp_path: Path) -> None:
+    rp, ip = _write_inputs(tmp_path)
+    repo = ParquetDataRepository(
+        paths=RepositoryPaths(recipes_csv=str(rp), interactions_csv=str(ip)),
+        cache_dir=tmp_path / "cache",
+        # Requested order differs from file order on purpose
+        recipe_usecols=["id", "name"],
+        interaction_usecols=["rating", "recipe_id"],
+    )
+
+    recipes = repo.load_recipes()
+    interactions = repo.load_interactions()
+
+    expected_r = pd.read_csv(rp, usecols=["id", "name"])
+    expected_i = pd.read_csv(ip, usecols=["rating", "recipe_id"])
+    pd.testing.assert_frame_equal(recipes, expected_r)
+    pd.testing.assert_frame_equal(interactions, expected_i)
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 2
+
+
+def test_parquet_cache_reuses_entry_until_source_changes(tmp_path: Path) -> None:
+    rp, _ = _write_inputs(tmp_path)
+    cache = ParquetCache(tmp_path / "cache")
+    calls: list[Path] = []
+
+    def reader(path: Path) -> pd.DataFrame:
+        calls.append(path)
+        return pd.read_csv(path)
+
+    cache.read(rp, reader)
+    cache.read(rp, reader)
+    assert len(calls) == 1
+
+    # Touching the file without changing its content keeps the entry valid
+    stat = rp.stat()
+    os.utime(rp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.read(rp, reader)
+    assert len(calls) == 1
+
+    pd.DataFrame([{"name": "C", "id": 3, "minutes": 1}]).to_csv(rp, index=False)
+    out = cache.read(rp, reader)
+    assert len(calls) == 2
+    assert out["id"].tolist() == [3]
+
+
+def test_parquet_repository_unknown_column_raises(tmp_path: Path) -> None:
+    rp, ip = _write_inputs(tmp_path)
+    repo = ParquetDataRepository(
+        paths=RepositoryPaths(recipes_csv=str(rp), interactions_csv=str(ip)),
+        cache_dir=tmp_path / "cache",
+        recipe_usecols=["nope"],
+    )
+    with pytest.raises(DataLoadError):
+        repo.load_recipes()
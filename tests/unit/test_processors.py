@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from mangetamain.preprocessing.interfaces import IDataRepository
+from mangetamain.preprocessing.processors import BasicDataProcessor
+
+
+class _Repo(IDataRepository):
+    def __init__(self) -> None:
+        self.recipes = pd.DataFrame({"id": [1, 2], "name": ["A", "B"]})
+        self.interactions = pd.DataFrame({"recipe_id": [1, 2], "rating": [5, 4]})
+
+    def load_recipes(self) -> pd.DataFrame:
+        return self.recipes
+
+    def load_interactions(self) -> pd.DataFrame:
+        return self.interactions
+
+
+class _InPlaceScaling:
+    mutates_inputs = True
+
+    def preprocess(self, recipes, interactions):
+        interactions["rating"] = interactions["rating"] / 5
+        return recipes, interactions
+
+
+def test_noop_chain_returns_repository_frames_without_copy() -> None:
+    repo = _Repo()
+    pair = BasicDataProcessor(repo).run()
+
+    assert pair.recipes is repo.recipes
+    assert pair.interactions is repo.interactions
+
+
+def test_mutating_strategy_receives_private_copy() -> None:
+    repo = _Repo()
+    pair = BasicDataProcessor(repo, preprocessing=_InPlaceScaling()).run()
+
+    assert pair.interactions["rating"].tolist() == [1.0, 0.8]
+    assert repo.interactions["rating"].tolist() == [5, 4]
+
+
+def test_eager_copy_mode_copies_before_each_strategy() -> None:
+    repo = _Repo()
+    pair = BasicDataProcessor(repo, copy_on_write=False).run()
+
+    assert pair.interactions is not repo.interactions
+    pd.testing.assert_frame_equal(pair.interactions, repo.interactions)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import ast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing import ragged
+from mangetamain.preprocessing.feature.ingredients import IngredientsPreprocessing
+from mangetamain.preprocessing.feature.nutrition import (
+    NutritionAnalyser,
+    NutritionPreprocessing,
+)
+from mangetamain.preprocessing.ragged import (
+    RaggedArray,
+    attach_parsed,
+    parsed_column,
+)
+
+CELLS = [
+    str(["salt", "water"]),
+    str(["a", "o'brien", 'say "hi"', "x, y"]),
+    str([]),
+    str(["salt"]),
+]
+
+
+def test_string_lists_match_literal_eval() -> None:
+    parsed = RaggedArray.from_string_lists(pd.Series(CELLS))
+
+    assert parsed.tolist() == [ast.literal_eval(c) for c in CELLS]
+    assert parsed.lengths.tolist() == [2, 4, 0, 1]
+    assert parsed.vocabulary[0] == "salt"
+    assert parsed.row(3) == ["salt"]
+    assert parsed.row_ids().tolist() == [0, 0, 1, 1, 1, 1, 3]
+
+
+def test_missing_cells_become_empty_rows() -> None:
+    parsed = RaggedArray.from_number_lists(pd.Series(["[1.5, 2]", None, "[ ]"]))
+
+    assert parsed.tolist() == [[1.5, 2.0], [], []]
+    assert parsed.missing.tolist() == [False, True, False]
+
+
+def test_malformed_cell_raises() -> None:
+    with pytest.raises((ValueError, SyntaxError)):
+        RaggedArray.from_string_lists(pd.Series(["salt, water"]))
+
+
+@pytest.mark.parametrize(
+    "cells, expected",
+    [
+        (["[1.0, 2.0, ]"], [[1.0, 2.0]]),
+        (["[1.0, ]", "[2.0, 3.0]"], [[1.0], [2.0, 3.0]]),
+        # Trailing comma closing the first block, the second one parsed whole
+        (
+            ["[3.0]", "[4.0, 5.0]", "[1.0, 2.0, ]", "[6.0]"],
+            [[3.0], [4.0, 5.0], [1.0, 2.0], [6.0]],
+        ),
+    ],
+)
+def test_number_lists_empty_items_fall_back_per_row(
+    monkeypatch, cells, expected
+) -> None:
+    monkeypatch.setattr(ragged, "_NUMBER_BLOCK_ROWS", 3)
+
+    parsed = RaggedArray.from_number_lists(pd.Series(cells))
+
+    assert parsed.tolist() == expected
+    for text in ("[1.0, ]", "[1.0,, 2.0]", "[ , 1.0]"):
+        assert ragged._parse_number_block([text]) is None
+
+
+def test_attached_array_follows_copies_but_not_filters() -> None:
+    recipes = pd.DataFrame({"ingredients": CELLS})
+    parsed = RaggedArray.from_string_lists(recipes["ingredients"])
+    enriched = attach_parsed(recipes, {"ingredients": parsed})
+
+    assert not recipes.attrs
+    assert parsed_column(enriched, "ingredients") is parsed
+    assert parsed_column(enriched.copy(), "ingredients") is parsed
+    assert parsed_column(enriched.assign(n=1), "ingredients") is parsed
+
+    subset = enriched.iloc[1:]
+    reparsed = parsed_column(subset, "ingredients")
+    assert reparsed is not parsed
+    assert reparsed.tolist() == parsed.tolist()[1:]
+
+
+def test_preprocessing_strategies_attach_parsed_columns() -> None:
+    recipes = pd.DataFrame(
+        {
+            "id": [1, 2],
+            "ingredients": CELLS[:2],
+            "nutrition": ["[100.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]", None],
+        }
+    )
+    r1, _ = IngredientsPreprocessing().preprocess(recipes, pd.DataFrame())
+    r2, _ = NutritionPreprocessing().preprocess(r1, pd.DataFrame())
+
+    assert not recipes.attrs
+    assert parsed_column(r2, "ingredients") is parsed_column(r1, "ingredients")
+    np.testing.assert_array_equal(
+        parsed_column(r2, "nutrition", numeric=True).values,
+        [100.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    )
+
+    table = NutritionAnalyser().analyze(r2).table
+    assert table["id"].tolist() == [1]
+    assert table["protein_ratio"].iloc[0] == pytest.approx(4.0 / 101.0)
+
+
+def test_number_lists_parse_blocks_and_fall_back_per_row(monkeypatch) -> None:
+    monkeypatch.setattr(ragged, "_NUMBER_BLOCK_ROWS", 3)
+    cells = [
+        "[1.5, 2.0]",
+        " [ 3 ,4e1 ] ",
+        "[ ]",
+        "[1, 2,]",  # only literal_eval accepts the trailing comma
+        None,
+        "[-0.5]",
+        [7, 8],
+    ]
+    parsed = RaggedArray.from_number_lists(pd.Series(cells))
+
+    assert parsed.tolist() == [
+        [1.5, 2.0],
+        [3.0, 40.0],
+        [],
+        [1.0, 2.0],
+        [],
+        [-0.5],
+        [7.0, 8.0],
+    ]
+    assert parsed.missing.tolist() == [False, False, False, False, True, False, False]
+    assert parsed.values.dtype == np.float64
+
+    with pytest.raises((ValueError, SyntaxError)):
+        RaggedArray.from_number_lists(pd.Series(["[1.0, 2.0]", "[1.0, x]"]))
+
+
+def test_to_matrix_pads_short_rows() -> None:
+    parsed = RaggedArray.from_number_lists(pd.Series(["[1, 2, 3]", None, "[4]"]))
+
+    matrix = parsed.to_matrix(3)
+
+    assert matrix.dtype == np.float32
+    np.testing.assert_array_equal(
+        matrix, [[1, 2, 3], [np.nan] * 3, [4, np.nan, np.nan]]
+    )
+    np.testing.assert_array_equal(
+        RaggedArray.from_number_lists(pd.Series(["[1, 2]"] * 2)).to_matrix(2),
+        [[1, 2], [1, 2]],
+    )
+    with pytest.raises(ValueError, match="more than 2 values"):
+        parsed.to_matrix(2)
+    with pytest.raises(ValueError, match="numeric"):
+        RaggedArray.from_string_lists(pd.Series(CELLS)).to_matrix(4)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing import (
+    CSVDataRepository,
+    ProcessorFactory,
+    RepositoryPaths,
+)
+from mangetamain.preprocessing.feature.ingredients import IngredientsPreprocessing
+from mangetamain.preprocessing.feature.nutrition import NutritionAnalyser
+from mangetamain.preprocessing.feature.rating import RatingAnalyser
+from mangetamain.preprocessing.feature.seasonality import SeasonalityAnalyzer
+from mangetamain.preprocessing.feature.steps import StepsAnalyser
+from mangetamain.preprocessing.ragged import parsed_column
+from mangetamain.preprocessing.schema import (
+    INTERACTIONS_SCHEMA,
+    TableSchema,
+    compact_frame,
+)
+
+
+def _raw_tables(n_recipes: int = 40, n_interactions: int = 600):
+    rng = np.random.default_rng(0)
+    recipes = pd.DataFrame(
+        {
+            "name": [f"recipe {i}" for i in range(n_recipes)],
+            "id": np.arange(n_recipes) + 1000,
+            "minutes": rng.integers(1, 300, n_recipes),
+            "submitted": "2005-01-01",
+            "tags": "['easy', 'dinner']",
+            "nutrition": [
+                str([float(x) for x in rng.integers(0, 100, 7)])
+                for _ in range(n_recipes)
+            ],
+            "n_steps": rng.integers(1, 20, n_recipes),
+            "ingredients": "['salt', 'water']",
+            "n_ingredients": rng.integers(1, 15, n_recipes),
+        }
+    )
+    dates = pd.date_range("2001-01-01", periods=90, freq="D").strftime("%Y-%m-%d")
+    interactions = pd.DataFrame(
+        {
+            "user_id": rng.integers(1, 50, n_interactions),
+            # Recipe 1000 gets enough 5s for its sum to exceed int8
+            "recipe_id": np.r_[
+                np.full(60, 1000),
+                rng.integers(1000, 1000 + n_recipes, n_interactions - 60),
+            ],
+            "date": rng.choice(dates, n_interactions),
+            "rating": np.r_[np.full(60, 5), rng.integers(0, 6, n_interactions - 60)],
+            "review": "ok",
+        }
+    )
+    return recipes, interactions
+
+
+def test_compact_frame_narrows_declared_columns() -> None:
+    _, interactions = _raw_tables()
+
+    compact, report = compact_frame(interactions, INTERACTIONS_SCHEMA)
+
+    assert compact.dtypes.astype(str).to_dict() == {
+        "user_id": "int32",
+        "recipe_id": "int32",
+        "date": "category",
+        "rating": "int8",
+        "review": "string",
+    }
+    assert interactions["user_id"].dtype == np.int64
+    for column in interactions.columns:
+        assert compact[column].astype(object).tolist() == interactions[column].tolist()
+
+    table = report.to_frame()
+    assert table["bytes_saved"].is_monotonic_decreasing
+    assert (table["bytes_saved"] > 0).all()
+    assert report.bytes_saved == table["bytes_saved"].sum()
+
+
+def test_compact_frame_skips_lossy_casts() -> None:
+    df = pd.DataFrame(
+        {
+            "big": [0, 2**40],
+            "holes": [1.0, np.nan],
+            "mixed": ["a", 1],
+            "small": np.array([1, 2], dtype=np.int8),
+        }
+    )
+    schema = TableSchema(
+        "t", {"big": "int32", "holes": "int8", "mixed": "string", "small": "int16"}
+    )
+
+    compact, report = compact_frame(df, schema)
+
+    pd.testing.assert_frame_equal(compact, df)
+    assert report.columns == ()
+
+    # Distinct strings take more room as a categorical
+    unique = pd.DataFrame({"date": [f"2001-01-{d:02d}" for d in range(1, 29)]})
+    compact, report = compact_frame(unique, INTERACTIONS_SCHEMA)
+    assert compact["date"].dtype == object
+    assert report.columns == ()
+
+
+def test_analyser_outputs_unchanged_by_compaction(tmp_path: Path) -> None:
+    recipes, interactions = _raw_tables()
+    paths = RepositoryPaths(
+        recipes_csv=str(tmp_path / "r.csv"), interactions_csv=str(tmp_path / "i.csv")
+    )
+    recipes.to_csv(paths.recipes_csv, index=False)
+    interactions.to_csv(paths.interactions_csv, index=False)
+    plain = CSVDataRepository(paths)
+    compact = CSVDataRepository(paths, compact=True)
+
+    assert compact.load_interactions()["rating"].dtype == np.int8
+    assert compact.compaction_reports["interactions"].bytes_saved > 0
+    assert compact.load_recipes()["name"].dtype == "string"
+
+    stages = (
+        (ProcessorFactory.create_rating, RatingAnalyser),
+        (ProcessorFactory.create_seasonality, SeasonalityAnalyzer),
+        (ProcessorFactory.create_nutrition, NutritionAnalyser),
+        (ProcessorFactory.create_steps, StepsAnalyser),
+    )
+    for make_processor, make_analyser in stages:
+        results = []
+        for repository in (plain, compact):
+            pair = make_processor(repository).run()
+            results.append(make_analyser().analyze(pair.recipes, pair.interactions))
+        expected, actual = results
+        pd.testing.assert_frame_equal(
+            actual.table.astype({c: object for c in ("name",) if c in actual.table}),
+            expected.table,
+            check_dtype=False,
+        )
+        assert actual.summary == pytest.approx(expected.summary, nan_ok=True)
+
+    first, _ = IngredientsPreprocessing().preprocess(
+        compact.load_recipes(), pd.DataFrame()
+    )
+    assert parsed_column(first, "ingredients").tolist()[0] == ["salt", "water"]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.clustering import (
+    REQUIRED_FEATURES,
+    ClusteringPaths,
+    RecipeClusteringPipeline,
+    RecipeSimilarityIndex,
+)
+
+
+def _recipes(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.normal(size=(n, len(REQUIRED_FEATURES))),
+        columns=REQUIRED_FEATURES,
+        index=pd.Index(np.arange(n) * 10 + 7, name="id"),
+    )
+    return df.assign(name=[f"recipe {i}" for i in range(n)])
+
+
+def test_most_similar_matches_brute_force() -> None:
+    recipes = _recipes(400)
+    pipeline = RecipeClusteringPipeline(n_pcs_for_similarity=8)
+    result = pipeline.cluster(recipes)
+    pcs = pipeline.model.transform(recipes)[:, :8]
+
+    neighbours = pipeline.most_similar(57, k=5)
+
+    row = recipes.index.get_loc(57)
+    distances = np.linalg.norm(pcs - pcs[row], axis=1)
+    distances[row] = np.inf
+    expected = np.argsort(distances)[:5]
+    assert neighbours.index.tolist() == recipes.index[expected].tolist()
+    np.testing.assert_allclose(neighbours["distance"], distances[expected])
+    assert list(neighbours.columns) == ["name", "distance", "cluster"]
+    assert neighbours["name"].tolist() == recipes["name"].iloc[expected].tolist()
+    assert neighbours["cluster"].tolist() == result["cluster"].iloc[expected].tolist()
+
+    # New recipes are queried through their projection
+    (new,) = pipeline.similarity_index.query(pcs[row], k=3)
+    assert new.index[0] == 57
+    assert new["distance"].iloc[0] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_index_round_trip_and_errors(tmp_path: Path) -> None:
+    index = RecipeSimilarityIndex(
+        [1, 2, 3, 4], np.array([[0.0], [1.0], [3.0], [3.0]]), clusters=[0, 0, 1, 1]
+    )
+    loaded = RecipeSimilarityIndex.load(index.save(tmp_path / "index.joblib"))
+
+    pd.testing.assert_frame_equal(loaded.most_similar(2, k=2), index.most_similar(2, 2))
+    # Exact duplicates are neighbours, the queried recipe is not
+    assert loaded.most_similar(3, k=1).index.tolist() == [4]
+    assert len(loaded.most_similar(1, k=10)) == 3
+
+    with pytest.raises(KeyError):
+        loaded.most_similar(99)
+    for k in (0, -1):
+        with pytest.raises(ValueError, match="k must be positive"):
+            loaded.most_similar(2, k=k)
+        with pytest.raises(ValueError, match="k must be positive"):
+            loaded.query(np.array([[1.0]]), k=k)
+    with pytest.raises(ValueError, match="unique"):
+        RecipeSimilarityIndex([1, 1], np.zeros((2, 2)))
+    with pytest.raises(FileNotFoundError):
+        RecipeSimilarityIndex.load(tmp_path / "absent.joblib")
+
+
+def test_run_persists_index_next_to_clustering_csv(tmp_path: Path) -> None:
+    paths = ClusteringPaths(base=tmp_path, out_dir=tmp_path)
+    fitted = RecipeClusteringPipeline(paths=paths, mode="minibatch", batch_size=100)
+    fitted.cluster(_recipes(300))
+    fitted.similarity_index.save(paths.similarity_index_path())
+
+    reloaded = RecipeClusteringPipeline(paths=paths)
+    pd.testing.assert_frame_equal(
+        reloaded.most_similar(17, k=4), fitted.most_similar(17, k=4)
+    )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mangetamain.preprocessing import (
+    CSVDataRepository,
+    ParquetDataRepository,
+    RepositoryPaths,
+)
+from mangetamain.preprocessing.factories import ProcessorFactory
+from mangetamain.preprocessing.feature.rating import RatingAnalyser
+from mangetamain.preprocessing.feature.seasonality import SeasonalityAnalyzer
+from mangetamain.preprocessing.repositories import MemoizedDataRepository
+
+
+def _paths(tmp_path: Path, n: int = 1_000) -> RepositoryPaths:
+    rng = np.random.default_rng(0)
+    days = pd.Timestamp("2005-01-01") + pd.to_timedelta(
+        rng.integers(0, 3_000, size=n), unit="D"
+    )
+    interactions = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 50, size=n),
+            "recipe_id": rng.integers(0, 80, size=n),
+            "date": days.strftime("%Y-%m-%d"),
+            "rating": rng.integers(0, 6, size=n),
+            "review": ["long free text " * 5] * n,
+        }
+    )
+    recipes = pd.DataFrame({"name": [f"r{i}" for i in range(80)], "id": range(80)})
+    paths = RepositoryPaths(
+        recipes_csv=str(tmp_path / "recipes.csv"),
+        interactions_csv=str(tmp_path / "interactions.csv"),
+    )
+    recipes.to_csv(paths.recipes_csv, index=False)
+    interactions.to_csv(paths.interactions_csv, index=False)
+    return paths
+
+
+@pytest.mark.parametrize("warm_cache", [False, True])
+def test_chunks_concatenate_to_projected_table(
+    tmp_path: Path, warm_cache: bool
+) -> None:
+    paths = _paths(tmp_path)
+    repo = ParquetDataRepository(paths=paths, cache_dir=tmp_path / "cache")
+    if warm_cache:
+        repo.load_interactions()
+
+    chunks = list(repo.iter_interactions(300, columns=["recipe_id", "rating"]))
+
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    # Without a fresh cache the CSV is streamed and no cache is built
+    assert any((tmp_path / "cache").glob("*.parquet")) is warm_cache
+    expected = pd.read_csv(paths.interactions_csv, usecols=["recipe_id", "rating"])
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), expected, check_dtype=False
+    )
+
+
+def test_memoized_repository_streams_without_memoizing(tmp_path: Path) -> None:
+    repo = MemoizedDataRepository(CSVDataRepository(paths=_paths(tmp_path)))
+
+    sizes = [len(c) for c in repo.iter_interactions(400, columns=["date"])]
+
+    assert sizes == [400, 400, 200]
+    assert repo.misses == {"recipes": 0, "interactions": 0}
+
+
+def test_prepare_interactions_builds_cache_without_memoizing(tmp_path: Path) -> None:
+    paths = _paths(tmp_path)
+    repo = MemoizedDataRepository(
+        ParquetDataRepository(paths=paths, cache_dir=tmp_path / "cache")
+    )
+
+    repo.prepare_interactions()
+
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+    repo.prepare_recipes()
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 2
+    assert repo.misses == {"recipes": 0, "interactions": 0}
+    sizes = [len(c) for c in repo.iter_interactions(400, columns=["rating"])]
+    assert sizes == [400, 400, 200]
+
+
+@pytest.mark.parametrize(
+    "factory, analyser",
+    [("create_rating", RatingAnalyser), ("create_seasonality", SeasonalityAnalyzer)],
+)
+def test_analyze_chunks_matches_analyze(
+    tmp_path: Path, factory: str, analyser: type
+) -> None:
+    repo = CSVDataRepository(paths=_paths(tmp_path))
+    processor = getattr(ProcessorFactory, factory)(repo)
+    pair = processor.run()
+    expected = analyser().analyze(pair.recipes, pair.interactions)
+
+    pairs = processor.iter_chunks(250, columns=analyser.INTERACTION_COLUMNS)
+    result = analyser().analyze_chunks(pair.recipes, (p.interactions for p in pairs))
+
+    pd.testing.assert_frame_equal(
+        result.table, expected.table, check_dtype=False, rtol=1e-12
+    )
+    assert result.summary == pytest.approx(expected.summary)
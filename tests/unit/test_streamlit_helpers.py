@@ -54,6 +54,13 @@ def test_get_tag_cloud_tfidf_and_counts() -> None:
     assert cloud2 is not None
 
 
+def test_get_tag_cloud_skips_missing_tags() -> None:
+    df = pd.DataFrame({"tags": [str(["spicy", "mild"]), None]})
+    cloud = st_mod.get_tag_cloud(df, "tags", use_tfidf=False)
+    assert set(cloud.words_) == {"spicy", "mild"}
+    assert df["parsed_tags"].tolist() == [["spicy", "mild"], []]
+
+
 def test_get_cluster_names_and_summary() -> None:
     mapping = st_mod.get_cluster_names()
     assert 0 in mapping